@@ -5,6 +5,9 @@ from .health_routes import router as health_router
 from .metrics_routes import router as metrics_router
 from .experiment_routes import router as experiment_router
 from .api_keys_routes import router as api_keys_router
+from .dataset_routes import router as dataset_router
+from .monitoring_routes import router as monitoring_router
+from .admin_routes import router as admin_router
 
 # Create main API router
 api_router = APIRouter()
@@ -14,4 +17,7 @@ api_router.include_router(llm_router)
 api_router.include_router(health_router)
 api_router.include_router(metrics_router)
 api_router.include_router(experiment_router)
-api_router.include_router(api_keys_router)
\ No newline at end of file
+api_router.include_router(api_keys_router)
+api_router.include_router(dataset_router)
+api_router.include_router(monitoring_router)
+api_router.include_router(admin_router)
\ No newline at end of file
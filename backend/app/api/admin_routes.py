@@ -0,0 +1,51 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from ..config import Config
+from ..core.profiling import PROFILE_FORMATS, profiler
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Admin endpoints need profiling enabled and the configured admin token"""
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled: no ADMIN_TOKEN is configured")
+    if x_admin_token != Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+# Create router for admin endpoints
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+async def list_profiles(target: Optional[str] = None):
+    """Captured profiles, newest first (optionally only those of one target, e.g. experiment:<id>)"""
+    profiles = profiler.store.list()
+    if target is not None:
+        profiles = [profile for profile in profiles if profile.get("target") == target]
+    return {"profiles": profiles}
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, format: Optional[str] = None):
+    """
+    Download a captured profile: sampling profiles as speedscope JSON, cprofile
+    profiles as pstats (the default format is the one the profile was captured in)
+    """
+    meta = profiler.store.get(profile_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    profile_format = format or meta["format"]
+    if profile_format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {profile_format}, expected one of: {', '.join(PROFILE_FORMATS)}")
+    path = profiler.store.path(profile_id, profile_format)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} was captured as {meta['format']}, not {profile_format}")
+    media_type = "application/json" if profile_format == "speedscope" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=profile_id + PROFILE_FORMATS[profile_format])
+
+@router.delete("/profiles/{profile_id}")
+async def delete_profile(profile_id: str):
+    """Delete a captured profile"""
+    if profiler.store.get(profile_id) is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    profiler.store.delete(profile_id)
+    return {"message": f"Profile {profile_id} deleted"}
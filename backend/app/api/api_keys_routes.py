@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from cryptography.fernet import Fernet
 import base64
 import os
 
@@ -11,6 +10,7 @@ def get_encryption_key():
     key = os.getenv("ENCRYPTION_KEY")
     if not key:
         # Generate a new key if none exists (for development)
+        from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         print(f"Generated encryption key: {key.decode()}")
         print("Please set ENCRYPTION_KEY environment variable for production")
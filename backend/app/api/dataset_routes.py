@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.services.datasets import save_dataset, DatasetError
+
+router = APIRouter(prefix="/datasets", tags=["datasets"])
+
+@router.post("/")
+async def upload_dataset(request: Request):
+    """
+    Upload a JSONL prompt dataset as the raw request body (one {"prompt": ...} object per line).
+    The body is streamed to disk, so large files are never held in memory.
+    """
+    try:
+        result = await save_dataset(request.stream())
+        return result
+    except DatasetError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,14 +1,20 @@
 from fastapi import APIRouter, HTTPException
-from ..validations.llm_requests import LLMRequest, LLMResponse
+from ..validations.llm_requests import LLMRequest, LLMResponse, DatasetExperimentRequest, ExtendExperimentRequest
 from ..services.llm_service import LLMService
 from ..services.background_tasks import background_task_service
-from ..services.experiment_service import get_experiment_status as gets_experiment_status
+from ..services.datasets import get_prompt_count, DatasetError
+from ..services.experiment_service import (
+    get_experiment_status as gets_experiment_status,
+    get_experiment_sweep,
+    get_experiment_trace,
+    extend_experiment,
+    ExperimentConflictError,
+)
 from ..llm_providers.factory import LLMProviderFactory
 from ..consts import SUPPORTED_MODELS, ExperimentStatus
 from ..db.session import AsyncSessionLocal
 from ..repositories.experiments import save_experiment
 import uuid
-import requests
 
 
 # Create router for LLM endpoints
@@ -54,6 +60,47 @@ async def generate_llm_response(request: LLMRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/generate/dataset")
+async def generate_dataset_responses(request: DatasetExperimentRequest):
+    """
+    Run an uploaded prompt dataset crossed with models and parameter grids (Background processing)
+    
+    Every (prompt, model, temperature, top_p) cell is executed; responses are stored
+    incrementally with the index of their prompt in the dataset.
+    
+    Args:
+        request: DatasetExperimentRequest with the dataset id, models and parameter grids
+        
+    Returns:
+        Experiment ID, number of cells and status for polling
+    """
+    try:
+        prompts = await get_prompt_count(request.dataset_id)
+    except DatasetError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    try:
+        cells = prompts * len(request.models) * len(request.temperatures) * len(request.top_ps)
+        async with AsyncSessionLocal() as session:
+            experiment = await save_experiment(
+                session, 
+                name=f"Dataset Experiment - {prompts} prompts x {len(request.models)} models",
+                original_message=f"dataset:{request.dataset_id}"
+            )
+            experiment_id = str(experiment.id)
+        
+        await background_task_service.start_dataset_experiment(experiment_id, request)
+        
+        return {
+            "experiment_id": experiment_id,
+            "cells": cells,
+            "status": ExperimentStatus.PENDING,
+            "message": "Experiment started in background. Use the experiment_id to check status."
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.get("/experiment/{experiment_id}/status")
 async def get_experiment_status(experiment_id: str):
     """
@@ -78,6 +125,85 @@ async def get_experiment_status(experiment_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/experiment/{experiment_id}/extend")
+async def extend_experiment_sweep(experiment_id: str, request: ExtendExperimentRequest):
+    """
+    Extend a completed experiment with new axes (Background processing)
+    
+    Only the (model, temperature, top_p) cells the experiment does not already have
+    are run; results and metrics are combined with the stored ones.
+    
+    Args:
+        experiment_id: ID of the experiment to extend
+        request: ExtendExperimentRequest with the extended grid
+        
+    Returns:
+        Number of new and reused cells, and status for polling
+    """
+    try:
+        result = await extend_experiment(experiment_id, request)
+        
+        if not result:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except ExperimentConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/experiment/{experiment_id}/sweep")
+async def get_experiment_sweep_report(experiment_id: str):
+    """
+    Get the adaptive sweep report of an experiment
+    
+    Args:
+        experiment_id: ID of the experiment
+        
+    Returns:
+        Strategy, call budget, every round's cells and objective scores, and the best cell
+    """
+    try:
+        report = await get_experiment_sweep(experiment_id)
+        
+        if not report:
+            raise HTTPException(status_code=404, detail="No adaptive sweep found for experiment")
+        
+        return report
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/experiment/{experiment_id}/trace")
+async def get_experiment_trace_timeline(experiment_id: str):
+    """
+    Get the trace timeline of an experiment
+    
+    Args:
+        experiment_id: ID of the experiment
+        
+    Returns:
+        Spans ordered by start (offset, duration, depth, attributes) and time totals
+        per span name, showing where the experiment's time went
+    """
+    try:
+        trace = await get_experiment_trace(experiment_id)
+        
+        if not trace:
+            raise HTTPException(status_code=404, detail="No trace found for experiment")
+        
+        return trace
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.post("/experiment/{experiment_id}/cancel")
 async def cancel_experiment(experiment_id: str):
     """
@@ -103,6 +229,7 @@ async def cancel_experiment(experiment_id: str):
 @router.get("/providers")
 async def get_supported_providers():
     """Get list of supported LLM providers"""
+    import requests
     try:
         ollama_response = requests.get("http://localhost:11434/api/tags")
         ollama_data = ollama_response.json()
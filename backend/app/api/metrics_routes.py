@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException
-from app.services.metrics import get_experiment_metrics
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -9,7 +8,34 @@ async def get_experiment_quality_metrics(
 ):
     """Get average quality metrics for all responses in an experiment."""
     try:
+        from app.services.metrics import get_experiment_metrics
         result = await get_experiment_metrics(experiment_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/experiments/{experiment_id}/heatmaps")
+async def get_experiment_metric_heatmaps(
+    experiment_id: str,
+):
+    """Get temperature x top_p heatmaps (with marginals) of every quality metric in an experiment."""
+    try:
+        from app.services.metrics import get_experiment_heatmaps
+        result = await get_experiment_heatmaps(experiment_id)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/experiments/{experiment_id}/similarity")
+async def get_experiment_similarity_matrix(
+    experiment_id: str,
+):
+    """Get pairwise Jaccard and cosine similarity between all responses in an experiment."""
+    try:
+        from app.services.metrics import get_experiment_similarity
+        result = await get_experiment_similarity(experiment_id)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
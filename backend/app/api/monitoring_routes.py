@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..core import prometheus
+
+# Create router for monitoring endpoints
+router = APIRouter(tags=["Monitoring"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Runtime metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(prometheus.render(), media_type=prometheus.CONTENT_TYPE)
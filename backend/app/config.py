@@ -1,11 +1,19 @@
 import os
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-import requests
-from .consts import MODEL_PROVIDER_MAP, PROVIDER_CONFIG
+from .consts import MODEL_PROVIDER_MAP, PROVIDER_CONFIG, ProfileMode
 # Load environment variables
 load_dotenv()
 
+def _profile_mode(value: str) -> ProfileMode:
+    """Parse PROFILING_DEFAULT_MODE once at startup, so a typo fails the boot, not every profiled request"""
+    try:
+        return ProfileMode(value.strip().lower())
+    except ValueError:
+        raise ValueError(
+            f"PROFILING_DEFAULT_MODE must be one of {', '.join(mode.value for mode in ProfileMode)}, got {value!r}"
+        ) from None
+
 class Config:
     """Configuration class for API keys and base URLs"""
     
@@ -23,17 +31,105 @@ class Config:
     OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     LLAMA_CPP_BASE_URL = os.getenv("LLAMA_CPP_BASE_URL", "http://localhost:8080")
     
+    # Mock provider: RNG seed (unset draws fresh randomness), time-to-first-token
+    # distribution and a multiplier on it (0 answers instantly), streaming rate in
+    # tokens/second (0 = no streaming time), concurrent calls served per model (0 =
+    # unlimited), 429 responses ("probability,retry-after seconds") and failure classes
+    # ("class=p,...")
+    MOCK_SEED = int(os.getenv("MOCK_SEED")) if os.getenv("MOCK_SEED") else None
+    MOCK_LATENCY = os.getenv("MOCK_LATENCY", "uniform:0.5,2.0")
+    MOCK_LATENCY_SCALE = float(os.getenv("MOCK_LATENCY_SCALE", 1.0))
+    MOCK_TOKEN_RATE = float(os.getenv("MOCK_TOKEN_RATE", 0))
+    MOCK_CAPACITY = int(os.getenv("MOCK_CAPACITY", 0))
+    MOCK_RATE_LIMIT = os.getenv("MOCK_RATE_LIMIT", "0,0")
+    MOCK_FAILURES = os.getenv("MOCK_FAILURES", "error=0.05")
+    
+    # Record / replay: trace file every provider call is appended to, whether recorded
+    # calls keep the prompt text (off: only a hash, but the traffic cannot be re-driven),
+    # trace file every provider call is answered from instead (no API calls or keys), and
+    # the replayed time scale (latencies and, in benchmarks.replay_traffic, arrivals)
+    LLM_RECORD_TRACE = os.getenv("LLM_RECORD_TRACE")
+    LLM_RECORD_PROMPTS = os.getenv("LLM_RECORD_PROMPTS", "false").lower() == "true"
+    LLM_REPLAY_TRACE = os.getenv("LLM_REPLAY_TRACE")
+    LLM_REPLAY_TIME_SCALE = float(os.getenv("LLM_REPLAY_TIME_SCALE", 1.0))
+    
     # Concurrency
     LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 4))
     LLM_RETRIES = int(os.getenv("LLM_RETRIES", 2))
     LLM_BACKOFF_FACTOR = float(os.getenv("LLM_BACKOFF_FACTOR", 0.5))
     LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60.0))
+    
+    # Adaptive sweeps: share of the full grid spent when the request sets no max_calls
+    ADAPTIVE_SWEEP_BUDGET_FRACTION = float(os.getenv("ADAPTIVE_SWEEP_BUDGET_FRACTION", 0.3))
+    ADAPTIVE_SWEEP_ETA = int(os.getenv("ADAPTIVE_SWEEP_ETA", 2))
+    
+    # Repeated sampling: upper bound on samples_per_cell
+    MAX_SAMPLES_PER_CELL = int(os.getenv("MAX_SAMPLES_PER_CELL", 50))
+    
+    # Early-stopping sweeps: output similarity at which a grid region counts as converged
+    CONVERGENCE_THRESHOLD = float(os.getenv("CONVERGENCE_THRESHOLD", 0.9))
+    
+    # Dataset experiments: where uploaded JSONL prompt files live, the upload size limit,
+    # and how many responses are buffered before each incremental save
+    DATASETS_DIR = os.getenv("DATASETS_DIR", "./data/datasets")
+    DATASET_MAX_BYTES = int(os.getenv("DATASET_MAX_BYTES", 512 * 1024 * 1024))
+    DATASET_PERSIST_BATCH = int(os.getenv("DATASET_PERSIST_BATCH", 200))
+    
+    # Logging: default level, per-module overrides ("module.prefix=LEVEL,..."), output
+    # format (json or text), log directory, and the 1-in-N sampling of hot-path messages
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_DIR = os.getenv("LOG_DIR", "logs")
+    LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 20))
+    
+    # Access logs: 1-in-N sampling of successful requests (errors and requests slower
+    # than ACCESS_LOG_SLOW_SECONDS are always logged)
+    ACCESS_LOG_SAMPLE_EVERY = int(os.getenv("ACCESS_LOG_SAMPLE_EVERY", 20))
+    ACCESS_LOG_SLOW_SECONDS = float(os.getenv("ACCESS_LOG_SLOW_SECONDS", 1.0))
+    
+    # Tracing: exporters for finished spans (comma-separated: console, file, none), the
+    # OTLP/JSON file the file exporter appends to, and how much is kept in memory for
+    # the experiment trace endpoint
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACING_EXPORTERS = os.getenv("TRACING_EXPORTERS", "none")
+    TRACING_FILE = os.getenv("TRACING_FILE", "./logs/traces.jsonl")
+    TRACING_MAX_TRACES = int(os.getenv("TRACING_MAX_TRACES", 100))
+    TRACING_MAX_SPANS_PER_TRACE = int(os.getenv("TRACING_MAX_SPANS_PER_TRACE", 10000))
+    
+    # Event loop monitor: heartbeat period (lag resolution), the lag in seconds at which
+    # the loop counts as blocked and the blocking stack is logged, and asyncio debug mode
+    # (slow-callback logging at the same threshold; development only)
+    LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", 0.1))
+    LOOP_BLOCKED_THRESHOLD = float(os.getenv("LOOP_BLOCKED_THRESHOLD", 0.25))
+    LOOP_DEBUG = os.getenv("LOOP_DEBUG", "false").lower() == "true"
+    
+    # On-demand profiling: off unless enabled; where captured profiles are kept (a ring of
+    # PROFILING_MAX_PROFILES), the sampling interval in seconds, the mode used for a bare
+    # X-Profile: 1 flag, and the token the admin endpoints require (X-Admin-Token; without
+    # one they refuse every request)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_DIR = os.getenv("PROFILING_DIR", "./logs/profiles")
+    PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", 20))
+    PROFILING_SAMPLE_INTERVAL = float(os.getenv("PROFILING_SAMPLE_INTERVAL", 0.005))
+    PROFILING_DEFAULT_MODE = _profile_mode(os.getenv("PROFILING_DEFAULT_MODE", "sampling"))
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+    
+    # Metrics computation (process pool)
+    METRICS_WORKERS = int(os.getenv("METRICS_WORKERS", 2))
+    METRICS_CHUNK_SIZE = int(os.getenv("METRICS_CHUNK_SIZE", 32))
+    METRICS_MAX_PENDING_CHUNKS = int(os.getenv("METRICS_MAX_PENDING_CHUNKS", 8))
+    METRICS_WARMUP = os.getenv("METRICS_WARMUP", "true").lower() == "true"
+    # Precompiled {word: syllables} dictionary; set to an empty string to disable
+    SYLLABLE_CACHE_PATH = os.getenv("SYLLABLE_CACHE_PATH", "./data/cmudict_syllables.pickle")
     # Model to provider mapping (imported from consts)
     MODEL_PROVIDER_MAP = MODEL_PROVIDER_MAP
     
     @classmethod
     def get_ollama_models(cls) -> list[dict[str, str]]:
         """Get list of Ollama models"""
+        import requests
         try:
             response = requests.get(cls.OLLAMA_BASE_URL + "/api/tags")
             data = response.json()
@@ -12,6 +12,17 @@ class ExperimentStatus(str, Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+# Parameter sweep modes (single LLM)
+class SweepMode(str, Enum):
+    GRID = "grid"
+    SUCCESSIVE_HALVING = "successive_halving"
+    BAYESIAN = "bayesian"
+
+# On-demand profiling modes
+class ProfileMode(str, Enum):
+    CPROFILE = "cprofile"
+    SAMPLING = "sampling"
+
 # Supported provider types
 SUPPORTED_PROVIDERS = {
     "openai": "OpenAI",
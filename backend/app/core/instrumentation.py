@@ -0,0 +1,135 @@
+"""
+Pure ASGI request instrumentation.
+
+Replaces the `@app.middleware("http")` request logger. Starlette's BaseHTTPMiddleware
+runs every request through an extra task and wraps the response body in a stream;
+this middleware only wraps `send`:
+
+- Request durations go into the `llm_lab_http_request_duration_seconds` histogram,
+  labelled by route template (not the raw path, so status polls of many experiments
+  share one series).
+- Responses carry a `Server-Timing` header: `app` (time until the response started)
+  and the time spent in traced DB calls (`db`) during the request.
+- Access logs are sampled: errors (5xx or an unhandled exception) and requests slower
+  than ACCESS_LOG_SLOW_SECONDS are always logged, other requests 1 in
+  ACCESS_LOG_SAMPLE_EVERY. Messages are formatted lazily from the ASGI scope.
+"""
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+from ..config import Config
+from .logger import Logger
+from .prometheus import HTTP_REQUEST_DURATION
+from .tracing import server_timings
+
+
+logger = Logger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def _server_timing_header(app_seconds: float, timings: Dict[str, float]) -> bytes:
+    entries = [f"app;dur={app_seconds * 1000:.2f}"]
+    entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items())
+    return ", ".join(entries).encode("latin-1")
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Usage example:
+        app.add_middleware(RequestInstrumentationMiddleware)
+
+    Parameters:
+    - sample_every: log 1 in N successful, fast requests
+    - slow_seconds: requests at least this slow are always logged (as warnings)
+    """
+
+    def __init__(self, app: ASGIApp, sample_every: int = Config.ACCESS_LOG_SAMPLE_EVERY, slow_seconds: float = Config.ACCESS_LOG_SLOW_SECONDS):
+        self.app = app
+        self.sample_every = sample_every
+        self.slow_seconds = slow_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        token = server_timings.set(timings)
+        status = 500
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing_header(time.perf_counter() - start, timings)))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.exception(
+                "Request failed: %s %s - Error: %s",
+                scope["method"],
+                scope["path"],
+                e,
+                process_time=round(time.perf_counter() - start, 4),
+                client_ip=_client_ip(scope),
+            )
+            if response_started:
+                raise
+            body = json.dumps({"error": "Internal server error", "detail": str(e)}).encode()
+            await send_wrapper({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+            failed = True
+        else:
+            failed = False
+        finally:
+            server_timings.reset(token)
+            duration = time.perf_counter() - start
+            HTTP_REQUEST_DURATION.labels(scope["method"], _route_template(scope), status).observe(duration)
+
+        if failed:
+            return
+        if status >= 500:
+            logger.error(
+                "Request completed: %s %s - Status: %d",
+                scope["method"], scope["path"], status,
+                status_code=status, process_time=round(duration, 4), client_ip=_client_ip(scope),
+            )
+        elif duration >= self.slow_seconds:
+            logger.warning(
+                "Slow request: %s %s - Status: %d",
+                scope["method"], scope["path"], status,
+                status_code=status, process_time=round(duration, 4), client_ip=_client_ip(scope),
+            )
+        else:
+            logger.info(
+                "Request completed: %s %s - Status: %d",
+                scope["method"], scope["path"], status,
+                status_code=status, process_time=round(duration, 4), sample_every=self.sample_every,
+            )
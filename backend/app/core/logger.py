@@ -1,70 +1,191 @@
+"""
+Non-blocking structured logging for the LLM Lab API.
+
+Every `Logger` feeds one shared `QueueHandler`; a `QueueListener` thread owns the
+console and file handlers, so formatting and disk I/O never run on the event loop.
+
+- Lazy formatting: messages take %-style args (`logger.info("idx=%d", idx)`) that are
+  only merged into the message by the listener thread, and nothing at all is built
+  for levels that are disabled.
+- Structured fields: keyword arguments are emitted as JSON fields (LOG_FORMAT=json,
+  the default) or appended as key=value pairs (LOG_FORMAT=text), together with the
+  trace/span ids of the current trace span.
+- Per-module levels: LOG_LEVELS="app.services.concurrency_runner=WARNING,app.repositories=DEBUG"
+  overrides LOG_LEVEL for the longest matching logger name prefix.
+- Sampling: hot-path messages can pass `sample_every=N` to emit only the first and
+  then every Nth occurrence of that message template (warnings and errors should not
+  be sampled).
+"""
+import atexit
+import json
 import logging
-import sys
-from datetime import datetime
-from typing import Optional
+import logging.handlers
 import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from ..config import Config
+from .tracing import _current_span
+
+
+_LEVELS = {
+    name.strip(): level.strip().upper()
+    for name, _, level in (entry.partition("=") for entry in Config.LOG_LEVELS.split(","))
+    if name.strip() and level.strip()
+}
+
+
+def _level_for(name: str, default: str) -> str:
+    """Configured level of the longest LOG_LEVELS prefix matching a logger name."""
+    matches = [prefix for prefix in _LEVELS if name == prefix or name.startswith(prefix + ".")]
+    return _LEVELS[max(matches, key=len)] if matches else default
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message and structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            payload.setdefault(key, value)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic single-line format with structured fields appended as key=value pairs."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records as they are. The stock handler formats each
+    record on the calling thread to make it picklable; the queue here never leaves
+    the process, so formatting is left to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _DeferredFileHandler(logging.FileHandler):
+    """
+    FileHandler that opens its file, creating the log directory, on the first record
+    it writes (in the listener thread) instead of when the module is imported.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _build_pipeline():
+    formatter = JsonFormatter() if Config.LOG_FORMAT == "json" else TextFormatter()
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+
+    file_handler = _DeferredFileHandler(
+        os.path.join(Config.LOG_DIR, f"llm_lab_{datetime.now().strftime('%Y%m%d')}.log"),
+    )
+    file_handler.setFormatter(formatter)
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return _DeferredQueueHandler(records), listener
+
+
+_queue_handler, _listener = _build_pipeline()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        atexit.unregister(_listener.stop)
+        _listener = None
+
 
 class Logger:
     """Centralized logging configuration for the LLM Lab API"""
-    
-    def __init__(self, name: str = "llm_lab", level: str = "INFO"):
+
+    def __init__(self, name: str = "llm_lab", level: Optional[str] = None):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, level.upper()))
-        
+        self.logger.setLevel(getattr(logging, _level_for(name, level or Config.LOG_LEVEL).upper()))
+        # Records only go through the queue pipeline
+        self.logger.propagate = False
+        self._sample_counts: Dict[str, int] = {}
+
         # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers()
-    
-    def _setup_handlers(self):
-        """Setup console and file handlers"""
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        
-        # File handler (create logs directory if it doesn't exist)
-        os.makedirs("logs", exist_ok=True)
-        file_handler = logging.FileHandler(f"logs/llm_lab_{datetime.now().strftime('%Y%m%d')}.log")
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
-        
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-    
-    def info(self, message: str, **kwargs):
+        if _queue_handler not in self.logger.handlers:
+            self.logger.addHandler(_queue_handler)
+
+    def _log(self, level: int, message: str, args: tuple, kwargs: Dict[str, Any], exc_info: bool = False) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        sample_every = kwargs.pop("sample_every", None)
+        if sample_every and sample_every > 1:
+            count = self._sample_counts.get(message, 0)
+            self._sample_counts[message] = count + 1
+            if count % sample_every:
+                return
+            kwargs["sampled_every"] = sample_every
+        span = _current_span.get()
+        if span is not None:
+            kwargs.setdefault("trace_id", span.trace_id)
+            kwargs.setdefault("span_id", span.span_id)
+        self.logger.log(level, message, *args, exc_info=exc_info, extra={"fields": kwargs}, stacklevel=3)
+
+    def info(self, message: str, *args, **kwargs):
         """Log info message"""
-        self.logger.info(message, extra=kwargs)
-    
-    def error(self, message: str, **kwargs):
+        self._log(logging.INFO, message, args, kwargs)
+
+    def error(self, message: str, *args, **kwargs):
         """Log error message"""
-        self.logger.error(message, extra=kwargs)
-    
-    def warning(self, message: str, **kwargs):
+        self._log(logging.ERROR, message, args, kwargs)
+
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message"""
-        self.logger.warning(message, extra=kwargs)
-    
-    def debug(self, message: str, **kwargs):
+        self._log(logging.WARNING, message, args, kwargs)
+
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
-        self.logger.debug(message, extra=kwargs)
-    
-    def critical(self, message: str, **kwargs):
+        self._log(logging.DEBUG, message, args, kwargs)
+
+    def critical(self, message: str, *args, **kwargs):
         """Log critical message"""
-        self.logger.critical(message, extra=kwargs)
-    
-    def exception(self, message: str, **kwargs):
+        self._log(logging.CRITICAL, message, args, kwargs)
+
+    def exception(self, message: str, *args, **kwargs):
         """Log exception with traceback"""
-        self.logger.exception(message, extra=kwargs)
-    
-    def fatal(self, message: str, **kwargs):
+        self._log(logging.ERROR, message, args, kwargs, exc_info=True)
+
+    def fatal(self, message: str, *args, **kwargs):
         """Log fatal message (alias for critical)"""
-        self.logger.critical(message, extra=kwargs)
+        self._log(logging.CRITICAL, message, args, kwargs)
 
 # Create global logger instance
 logger = Logger()
@@ -90,4 +211,3 @@ def log_exception(message: str, **kwargs):
 
 def log_fatal(message: str, **kwargs):
     logger.fatal(message, **kwargs)
-    
\ No newline at end of file
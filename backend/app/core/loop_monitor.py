@@ -0,0 +1,123 @@
+"""
+Event loop lag monitor and blocking-call detector.
+
+- A heartbeat task sleeps LOOP_MONITOR_INTERVAL seconds at a time and records how
+  late each wake-up was (`llm_lab_event_loop_lag_seconds`). Lag is time during which
+  no other coroutine could run: synchronous I/O, CPU-heavy code or a long chain of
+  ready callbacks.
+- A watchdog thread checks the heartbeat. When the loop has not come back for
+  LOOP_BLOCKED_THRESHOLD seconds, the stack of the event loop thread is captured
+  *while it is still blocked* and logged as a warning, so the log names the blocking
+  call instead of whatever ran after it.
+- LOOP_DEBUG turns on asyncio debug mode with `slow_callback_duration` set to the
+  threshold: asyncio then logs every slow callback/task step (and never-awaited
+  coroutines). Debug mode slows the loop down; use it in development and tests.
+
+Usage example:
+    loop_monitor.start()      # on startup, from the event loop
+    await loop_monitor.stop() # on shutdown
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from ..config import Config
+from .logger import Logger
+from .prometheus import LOOP_BLOCKED, LOOP_LAG
+
+
+logger = Logger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Parameters:
+    - interval: heartbeat period in seconds (also the lag resolution)
+    - threshold: lag at which the loop counts as blocked and its stack is logged
+    - debug: enable asyncio debug mode / slow-callback logging on the running loop
+    """
+
+    def __init__(self, interval: float, threshold: float, debug: bool = False):
+        self.interval = interval
+        self.threshold = threshold
+        self.debug = debug
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # monotonic time the heartbeat last ran; written by the loop, read by the watchdog
+        self._last_beat = 0.0
+
+    def start(self) -> None:
+        """Start the heartbeat task and the watchdog thread (must run on the event loop)."""
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+            # asyncio reports slow callbacks on its own logger; route it through ours
+            Logger("asyncio", level="WARNING")
+            logger.info("Asyncio debug mode on", slow_callback_duration=self.threshold)
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._watchdog.join()
+        self._task = None
+        self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._last_beat = time.monotonic()
+            LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                LOOP_BLOCKED.inc()
+
+    def _watch(self) -> None:
+        reported_beat = None
+        # Poll a few times per threshold so a stall is caught while it is still going on
+        while not self._stopped.wait(min(self.interval, self.threshold) / 2):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+            if stalled < self.threshold or last_beat == reported_beat:
+                continue
+            # One report per stall: the same heartbeat is never reported twice
+            reported_beat = last_beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                return
+            logger.warning(
+                "Event loop blocked for %.3fs so far, stack of the blocking code:\n%s",
+                stalled,
+                "".join(traceback.format_stack(frame)),
+                blocked_seconds=round(stalled, 4),
+            )
+
+
+# Global loop monitor instance
+loop_monitor = LoopLagMonitor(
+    interval=Config.LOOP_MONITOR_INTERVAL,
+    threshold=Config.LOOP_BLOCKED_THRESHOLD,
+    debug=Config.LOOP_DEBUG,
+)
@@ -0,0 +1,334 @@
+"""
+On-demand CPU profiling of live requests and experiment runs.
+
+Profiling is opt-in per request or per experiment (and only when PROFILING_ENABLED
+is set); nothing is installed on the hot path otherwise.
+
+- Requests: send `X-Profile: cprofile|sampling` (or `?profile=cprofile|sampling`) and
+  the response carries an `X-Profile-Id` header naming the stored profile.
+- Experiments: set `"profile": "cprofile"|"sampling"` in the LLM request body to profile
+  the whole background run.
+
+Two modes:
+- cprofile: deterministic `cProfile` of the event loop thread, stored as a pstats file
+  (`python -m pstats`, snakeviz, ...).
+- sampling: a thread that samples the event loop thread's stack every
+  PROFILING_SAMPLE_INTERVAL seconds, stored as a speedscope file
+  (https://www.speedscope.app). Much cheaper than cprofile for long experiment runs.
+
+Both modes see the whole event loop thread, so anything else running concurrently
+shows up in the profile too; only one profile is captured at a time, a flag arriving
+while another profile is running is ignored. Profiles are kept in a bounded on-disk
+ring (PROFILING_DIR, the oldest is deleted past PROFILING_MAX_PROFILES) and served by
+the admin endpoints in `app.api.admin_routes`.
+"""
+import asyncio
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from ..config import Config
+from ..consts import ProfileMode
+from .logger import Logger
+
+
+logger = Logger(__name__)
+
+# File suffix of each download format
+PROFILE_FORMATS = {"pstats": ".pstats", "speedscope": ".speedscope.json"}
+# Download format written by each profiling mode
+MODE_FORMATS = {ProfileMode.CPROFILE: "pstats", ProfileMode.SAMPLING: "speedscope"}
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread from a background thread.
+
+    Usage example:
+        sampler = SamplingProfiler(threading.get_ident(), interval=0.005)
+        sampler.start()
+        ...
+        sampler.stop()
+        sampler.to_speedscope("GET /llms/experiment/...")
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self._frames: Dict[Tuple[str, str, int], int] = {}
+        self._stacks: Dict[Tuple[int, ...], float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _frame_index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frames.get(key)
+        if index is None:
+            index = self._frames[key] = len(self._frames)
+        return index
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_index(frame.f_code))
+                frame = frame.f_back
+            # Identical stacks are merged; the weight is the wall time they covered
+            key = tuple(reversed(stack))
+            self._stacks[key] = self._stacks.get(key, 0.0) + (now - last)
+            last = now
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """The samples as a speedscope "sampled" profile (file format schema 0.0.1)."""
+        frames = [{"name": n, "file": f, "line": line} for n, f, line in self._frames]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(self._stacks.values()),
+                "samples": [list(stack) for stack in self._stacks],
+                "weights": list(self._stacks.values()),
+            }],
+            "name": name,
+            "exporter": "llm-lab",
+        }
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring of captured profiles.
+
+    Each profile is a data file (`<id>.pstats` or `<id>.speedscope.json`) plus a
+    `<id>.meta.json` file with its name, mode and timings; saving past `max_profiles`
+    deletes the oldest. All methods do blocking file I/O.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _meta_path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.meta.json")
+
+    def path(self, profile_id: str, profile_format: str) -> Optional[str]:
+        """Path of a stored profile file, or None if there is no such profile/format."""
+        if profile_format not in PROFILE_FORMATS or not _is_profile_id(profile_id):
+            return None
+        path = os.path.join(self.directory, profile_id + PROFILE_FORMATS[profile_format])
+        return path if os.path.exists(path) else None
+
+    def save(self, meta: Dict[str, Any], write) -> None:
+        """
+        Store a profile and evict the oldest ones past the ring size
+
+        Args:
+            meta: profile metadata (must contain id and format)
+            write: callable writing the profile data to the path it is given
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        write(os.path.join(self.directory, meta["id"] + PROFILE_FORMATS[meta["format"]]))
+        with open(self._meta_path(meta["id"]), "w") as f:
+            json.dump(meta, f)
+        for stale in self.list()[self.max_profiles:]:
+            self.delete(stale["id"])
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not _is_profile_id(profile_id):
+            return None
+        try:
+            with open(self._meta_path(profile_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of the stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".meta.json"):
+                meta = self.get(filename[: -len(".meta.json")])
+                if meta is not None:
+                    profiles.append(meta)
+        return sorted(profiles, key=lambda meta: meta["created_at"], reverse=True)
+
+    def delete(self, profile_id: str) -> None:
+        for path in [self._meta_path(profile_id)] + [
+            os.path.join(self.directory, profile_id + suffix) for suffix in PROFILE_FORMATS.values()
+        ]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _is_profile_id(value: str) -> bool:
+    try:
+        return uuid.UUID(value).hex == value
+    except ValueError:
+        return False
+
+
+class Profiler:
+    """
+    Captures one profile at a time into a ProfileStore.
+
+    Usage example:
+        async with profiler.profile("experiment 1234", ProfileMode.SAMPLING, target="experiment:1234") as profile_id:
+            await run_experiment()
+        # profile_id is None when profiling is disabled or another profile is running
+
+    The captured profile is written to the store in a worker thread, off the event loop.
+    """
+
+    def __init__(self, enabled: bool, store: ProfileStore, sample_interval: float):
+        self.enabled = enabled
+        self.store = store
+        self.sample_interval = sample_interval
+        self._busy = threading.Lock()
+
+    @asynccontextmanager
+    async def profile(self, name: str, mode: ProfileMode, **attributes: Any) -> AsyncIterator[Optional[str]]:
+        """
+        Profile the enclosed block on the current thread
+
+        Args:
+            name: human readable profile name
+            mode: cprofile or sampling
+            attributes: extra metadata stored with the profile (e.g. target)
+
+        Yields:
+            ID of the profile being captured, or None if nothing is captured
+        """
+        if not self.enabled or not self._busy.acquire(blocking=False):
+            if self.enabled:
+                logger.warning("Profile %s skipped: another profile is running", name)
+            yield None
+            return
+
+        mode = ProfileMode(mode)
+        profile_id = uuid.uuid4().hex
+        created_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        if mode == ProfileMode.CPROFILE:
+            session = cProfile.Profile()
+            session.enable()
+        else:
+            session = SamplingProfiler(threading.get_ident(), self.sample_interval)
+            session.start()
+        start = time.perf_counter()
+        try:
+            yield profile_id
+        finally:
+            try:
+                if mode == ProfileMode.CPROFILE:
+                    session.disable()
+                    write = session.dump_stats
+                else:
+                    session.stop()
+                    data = session.to_speedscope(name)
+                    write = lambda path: _write_json(path, data)
+                duration = time.perf_counter() - start
+                await asyncio.to_thread(self.store.save, {
+                    "id": profile_id,
+                    "name": name,
+                    "mode": mode.value,
+                    "format": MODE_FORMATS[mode],
+                    "created_at": created_at,
+                    "duration": round(duration, 4),
+                    **attributes,
+                }, write)
+                logger.info("Captured %s profile %s: %s", mode.value, profile_id, name, duration=round(duration, 4))
+            except Exception as e:
+                logger.error(f"Failed to store profile {name}: {str(e)}")
+            finally:
+                self._busy.release()
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def _requested_mode(scope) -> Optional[ProfileMode]:
+    """Profiling mode asked for by the X-Profile header or the profile query parameter."""
+    value = None
+    for key, header in scope.get("headers", ()):
+        if key == b"x-profile":
+            value = header.decode("latin-1")
+            break
+    if value is None and b"profile=" in scope.get("query_string", b""):
+        value = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+    if not value:
+        return None
+    value = value.strip().lower()
+    # A bare flag (X-Profile: 1 / ?profile=true) means the default mode
+    if value in ("1", "true", "yes"):
+        return Config.PROFILING_DEFAULT_MODE
+    try:
+        return ProfileMode(value)
+    except ValueError:
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Usage example:
+        app.add_middleware(ProfilingMiddleware)
+
+    Profiles requests that carry the X-Profile header or the profile query parameter
+    and adds the captured profile's id as the X-Profile-Id response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = _requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope['method']} {scope['path']}"
+        async with profiler.profile(name, mode, target=name) as profile_id:
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start" and profile_id is not None:
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+# Global profiler instance
+profiler = Profiler(
+    enabled=Config.PROFILING_ENABLED,
+    store=ProfileStore(Config.PROFILING_DIR, Config.PROFILING_MAX_PROFILES),
+    sample_interval=Config.PROFILING_SAMPLE_INTERVAL,
+)
@@ -0,0 +1,353 @@
+"""
+In-process Prometheus metrics.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format (version 0.0.4) by `render()` and served at `GET /metrics`, so
+the runtime can be scraped without running an external agent.
+
+Instrumentation is meant to stay on in the hot path:
+- `metric.labels(...)` is one dict lookup on a tuple of label values; children are
+  created on first use and kept for the life of the process.
+- A histogram observation is one `bisect` into the bucket bounds plus two additions;
+  cumulative bucket counts are only computed when rendering.
+- Metrics are updated from the event loop thread only, so there is no locking.
+
+Usage example:
+    PROVIDER_LATENCY.labels("openai", "gpt-4o", "success").observe(1.23)
+    with DB_WRITE_DURATION.labels("responses").time():
+        await session.commit()
+"""
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default buckets (seconds) for provider call latencies
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+# Buckets (seconds) for fast local operations such as queue waits and DB writes
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets (seconds) for the phases of provider HTTP requests, from a pooled connect to a slow model
+HTTP_PHASE_BUCKETS = FAST_BUCKETS + (20.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Timer:
+    """Context manager observing the elapsed wall time into a histogram child."""
+
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: "_HistogramChild"):
+        self._child = child
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "_function")
+
+    def __init__(self):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from `function` at scrape time instead of tracking it."""
+        self._function = function
+
+    def get(self) -> float:
+        return float(self._function()) if self._function is not None else self.value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # counts[i] is the number of observations in (bounds[i-1], bounds[i]]; the last slot is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+class _Metric:
+    """A named metric family: one child per distinct combination of label values."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: object):
+        """Child for the given label values (positional, in `labelnames` order)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labelnames, labelvalues, value in self._samples():
+            lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (name should end in `_total`)."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _samples(self):
+        return [(self.name, self.labelnames, key, child.value) for key, child in list(self._children.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback at scrape time."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._children[()].set_function(function)
+
+    def _samples(self):
+        return [(self.name, self.labelnames, key, child.get()) for key, child in list(self._children.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets (plus their sum and count)."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Optional["Registry"] = None,
+    ):
+        self.bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        if not self.bounds:
+            raise ValueError("Histograms need at least one finite bucket")
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def time(self) -> _Timer:
+        return self._children[()].time()
+
+    def _samples(self):
+        samples = []
+        bucket_labels = self.labelnames + ("le",)
+        les = [_format_value(b) for b in self.bounds] + ["+Inf"]
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for le, count in zip(les, child.counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", bucket_labels, key + (le,), cumulative))
+            samples.append((f"{self.name}_sum", self.labelnames, key, child.sum))
+            samples.append((f"{self.name}_count", self.labelnames, key, cumulative))
+        return samples
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+REGISTRY = Registry()
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    return REGISTRY.render()
+
+
+# --- Application metrics ---------------------------------------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "llm_lab_http_request_duration_seconds",
+    "Duration of HTTP requests until the response body was sent, by route template.",
+    ("method", "route", "status"),
+    buckets=FAST_BUCKETS,
+)
+PROVIDER_LATENCY = Histogram(
+    "llm_lab_provider_request_duration_seconds",
+    "Duration of LLM provider calls, by outcome (success, error, timeout).",
+    ("provider", "model", "outcome"),
+)
+TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_lab_time_to_first_token_seconds",
+    "Time from sending a provider request until the first byte of its response arrived.",
+    ("provider", "model"),
+)
+PROVIDER_HTTP_PHASE = Histogram(
+    "llm_lab_provider_http_phase_seconds",
+    "Phases of provider HTTP requests: connect (incl. DNS), tls, first_byte (request sent until response headers) and transfer (response body).",
+    ("provider", "model", "phase"),
+    buckets=HTTP_PHASE_BUCKETS,
+)
+QUEUE_WAIT = Histogram(
+    "llm_lab_queue_wait_seconds",
+    "Time jobs waited for a concurrency slot before starting.",
+    ("queue",),
+    buckets=FAST_BUCKETS,
+)
+DB_WRITE_DURATION = Histogram(
+    "llm_lab_db_write_duration_seconds",
+    "Duration of database write transactions, by operation.",
+    ("operation",),
+    buckets=FAST_BUCKETS,
+)
+PROVIDER_RETRIES = Counter(
+    "llm_lab_provider_retries_total",
+    "Provider calls that were retries of a failed attempt.",
+    ("provider", "model"),
+)
+PROVIDER_TIMEOUTS = Counter(
+    "llm_lab_provider_timeouts_total",
+    "Provider calls that hit the per-call timeout.",
+    ("provider", "model"),
+)
+TOKENS = Counter(
+    "llm_lab_tokens_total",
+    "Tokens reported by providers for successful calls.",
+    ("provider", "model"),
+)
+CACHE_HITS = Counter(
+    "llm_lab_cache_hits_total",
+    "Lookups served from a cache, by cache.",
+    ("cache",),
+)
+CACHE_MISSES = Counter(
+    "llm_lab_cache_misses_total",
+    "Lookups that missed a cache and were recomputed, by cache.",
+    ("cache",),
+)
+INFLIGHT_CALLS = Gauge(
+    "llm_lab_inflight_provider_calls",
+    "Provider calls currently awaiting a response.",
+    ("provider", "model"),
+)
+LOOP_LAG = Histogram(
+    "llm_lab_event_loop_lag_seconds",
+    "How late the event loop monitor's heartbeat woke up (time the loop was busy or blocked).",
+    buckets=FAST_BUCKETS,
+)
+LOOP_BLOCKED = Counter(
+    "llm_lab_event_loop_blocked_total",
+    "Heartbeats delayed past LOOP_BLOCKED_THRESHOLD.",
+)
+RUNNING_EXPERIMENTS = Gauge(
+    "llm_lab_running_experiments",
+    "Experiments currently processing in the background.",
+)
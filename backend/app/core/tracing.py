@@ -0,0 +1,425 @@
+"""
+Span-based tracing of experiment processing.
+
+Spans follow the OpenTelemetry data model (16-byte trace ids, 8-byte span ids,
+parent links, attributes, events, status) and are propagated through asyncio tasks
+with a context variable, so a span opened around `process_llm_request` becomes
+the parent of every runner attempt, provider call and DB operation it awaits.
+
+Each experiment is one trace whose id is the experiment's UUID. Finished spans are:
+- kept in memory per trace (bounded) for the experiment trace timeline endpoint,
+- optionally exported: `console` prints one line per span, `file` appends OTLP/JSON
+  (`ExportTraceServiceRequest` per line, readable by the OpenTelemetry Collector's
+  `otlpjsonfile` receiver).
+
+Spans are only recorded inside a trace: `start_span` outside of one (e.g. a DB read
+served to an API request) returns a no-op span, so untraced paths pay one context
+variable lookup.
+
+Usage example:
+    with tracer.start_trace("experiment", trace_id=experiment_uuid.hex):
+        with tracer.start_span("provider.call", {"llm.model": model}) as span:
+            ...
+            span.set_attribute("llm.tokens", tokens)
+
+    @traced("db.save_responses")
+    async def save_responses(...): ...
+"""
+import functools
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import Config
+
+
+# Instrumentation scope and resource reported in exported spans
+SERVICE_NAME = "llm-lab-api"
+SCOPE_NAME = "llm_lab"
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Spans buffered by the file exporter before a write (a finished root span always flushes)
+FILE_EXPORT_BATCH = 256
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "attributes", "events",
+        "start_ns", "end_ns", "status", "status_message", "_tracer", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", trace_id: str, parent_span_id: Optional[str], name: str, attributes: Optional[Dict[str, Any]]):
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def is_recording(self) -> bool:
+        return True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, status: int, message: str = "") -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.add_event("exception", {"exception.type": type(exc).__name__, "exception.message": str(exc)})
+        self.set_status(STATUS_ERROR, str(exc))
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._tracer._on_end(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {STATUS_UNSET: "unset", STATUS_OK: "ok", STATUS_ERROR: "error"}[self.status],
+            "status_message": self.status_message,
+        }
+
+
+class _NoOpSpan:
+    """Span returned outside of a trace: accepts every call and records nothing."""
+
+    __slots__ = ()
+
+    is_recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def set_status(self, status: int, message: str = "") -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoOpSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# Per-request {name: seconds} totals reported in the Server-Timing header (None outside a request)
+server_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("server_timings", default=None)
+
+
+def current_span():
+    """The innermost active span of the current task (a no-op span outside of a trace)."""
+    return _current_span.get() or NOOP_SPAN
+
+
+# --- Exporters -------------------------------------------------------------
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value if math.isfinite(value) else str(value)}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """Spans as an OTLP/JSON `ExportTraceServiceRequest`."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        **({"parentSpanId": span.parent_span_id} if span.parent_span_id else {}),
+                        "name": span.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": _otlp_attributes(span.attributes),
+                        "events": [
+                            {"timeUnixNano": str(e["time_ns"]), "name": e["name"], "attributes": _otlp_attributes(e["attributes"])}
+                            for e in span.events
+                        ],
+                        "status": {"code": span.status, **({"message": span.status_message} if span.status_message else {})},
+                    }
+                    for span in spans
+                ],
+            }],
+        }]
+    }
+
+
+class ConsoleSpanExporter:
+    """Print one line per finished span to stdout."""
+
+    def export(self, span: Span) -> None:
+        duration_ms = (span.end_ns - span.start_ns) / 1e6
+        sys.stdout.write(
+            f"[trace] {span.name} {duration_ms:.2f}ms trace={span.trace_id} span={span.span_id} "
+            f"parent={span.parent_span_id or '-'} {json.dumps(span.attributes, default=str)}\n"
+        )
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+
+class FileSpanExporter:
+    """Append finished spans to a file as OTLP/JSON lines, in batches."""
+
+    def __init__(self, path: str, batch_size: int = FILE_EXPORT_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(span)
+        if len(self._buffer) >= self.batch_size or span.parent_span_id is None:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(to_otlp(spans), default=str) + "\n")
+
+
+# --- Tracer ----------------------------------------------------------------
+
+class Tracer:
+    """
+    Creates spans and collects finished ones.
+
+    Parameters:
+    - enabled: when False every span is a no-op
+    - exporters: objects with `export(span)` / `flush()`, called for every finished span
+    - max_traces: traces kept in memory (least recently updated are evicted)
+    - max_spans_per_trace: finished spans kept per trace; further spans are only counted
+    """
+
+    def __init__(self, enabled: bool = True, exporters: Optional[List[Any]] = None, max_traces: int = 100, max_spans_per_trace: int = 10000):
+        self.enabled = enabled
+        self.exporters = list(exporters or [])
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        # trace_id -> {"spans": [...], "dropped": int}
+        self._traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def start_trace(self, name: str, trace_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        """Root span of a new trace (or of another run within an existing trace id)."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, trace_id or _new_trace_id(), None, name, attributes)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Child of the current span; a no-op span outside of a trace."""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, parent.trace_id, parent.span_id, name, attributes)
+
+    def _on_end(self, span: Span) -> None:
+        trace = self._traces.get(span.trace_id)
+        if trace is None:
+            trace = self._traces[span.trace_id] = {"spans": [], "dropped": 0}
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        else:
+            self._traces.move_to_end(span.trace_id)
+        if len(trace["spans"]) < self.max_spans_per_trace:
+            trace["spans"].append(span)
+        else:
+            trace["dropped"] += 1
+
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                sys.stderr.write(f"[trace] exporter {type(exporter).__name__} failed: {e}\n")
+
+    def get_trace(self, trace_id: str) -> Dict[str, Any]:
+        """Finished spans of a trace held in memory, as dicts, plus the dropped span count."""
+        trace = self._traces.get(trace_id)
+        if trace is None:
+            return {"spans": [], "dropped": 0}
+        return {"spans": [span.to_dict() for span in trace["spans"]], "dropped": trace["dropped"]}
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.flush()
+
+
+def traced(name: str):
+    """
+    Decorator running an async function inside a child span named `name`.
+
+    Inside an HTTP request, the call's duration is also added to the request's
+    Server-Timing entry named after the span's namespace (`db` for `db.*` spans).
+    """
+    timing = name.split(".", 1)[0] if "." in name else None
+
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            timings = server_timings.get() if timing else None
+            if timings is None:
+                with tracer.start_span(name):
+                    return await func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                with tracer.start_span(name):
+                    return await func(*args, **kwargs)
+            finally:
+                timings[timing] = timings.get(timing, 0.0) + time.perf_counter() - start
+        return wrapper
+    return decorator
+
+
+def build_timeline(spans: List[Dict[str, Any]], dropped: int = 0) -> Dict[str, Any]:
+    """
+    Shape finished spans (dicts) into a timeline: spans ordered by start with offsets
+    from the earliest span, their depth in the span tree, and time totals per span name.
+    """
+    spans = sorted(spans, key=lambda s: (s["start_ns"], s["end_ns"]))
+    if not spans:
+        return {"duration_ms": 0, "span_count": 0, "dropped_spans": dropped, "summary": [], "spans": []}
+
+    origin = spans[0]["start_ns"]
+    parents = {s["span_id"]: s["parent_span_id"] for s in spans}
+    depths: Dict[str, int] = {}
+
+    def depth(span_id: str) -> int:
+        if span_id not in depths:
+            parent = parents.get(span_id)
+            depths[span_id] = 0 if parent is None or parent not in parents else depth(parent) + 1
+        return depths[span_id]
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    timeline = []
+    for s in spans:
+        duration_ms = (s["end_ns"] - s["start_ns"]) / 1e6
+        entry = summary.setdefault(s["name"], {"name": s["name"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["errors"] += s["status"] == "error"
+        timeline.append({
+            "span_id": s["span_id"],
+            "parent_span_id": s["parent_span_id"],
+            "name": s["name"],
+            "depth": depth(s["span_id"]),
+            "start_offset_ms": round((s["start_ns"] - origin) / 1e6, 3),
+            "duration_ms": round(duration_ms, 3),
+            "status": s["status"],
+            "attributes": s["attributes"],
+            "events": [
+                {"name": e["name"], "offset_ms": round((e["time_ns"] - origin) / 1e6, 3), "attributes": e["attributes"]}
+                for e in s["events"]
+            ],
+        })
+
+    for entry in summary.values():
+        entry["total_ms"] = round(entry["total_ms"], 3)
+        entry["max_ms"] = round(entry["max_ms"], 3)
+
+    return {
+        "duration_ms": round((max(s["end_ns"] for s in spans) - origin) / 1e6, 3),
+        "span_count": len(spans),
+        "dropped_spans": dropped,
+        "summary": sorted(summary.values(), key=lambda e: -e["total_ms"]),
+        "spans": timeline,
+    }
+
+
+def _exporters_from_config() -> List[Any]:
+    exporters = []
+    for name in filter(None, (n.strip() for n in Config.TRACING_EXPORTERS.split(","))):
+        if name == "console":
+            exporters.append(ConsoleSpanExporter())
+        elif name == "file":
+            exporters.append(FileSpanExporter(Config.TRACING_FILE))
+        elif name != "none":
+            raise ValueError(f"Unknown tracing exporter: {name}")
+    return exporters
+
+
+# Global tracer instance
+tracer = Tracer(
+    enabled=Config.TRACING_ENABLED,
+    exporters=_exporters_from_config(),
+    max_traces=Config.TRACING_MAX_TRACES,
+    max_spans_per_trace=Config.TRACING_MAX_SPANS_PER_TRACE,
+)
@@ -0,0 +1,39 @@
+"""
+Backfill stored quality metrics for experiments created before metrics were materialized.
+
+Usage (from the backend directory):
+    python -m app.db.backfill_metrics                      # every experiment missing metrics
+    python -m app.db.backfill_metrics --experiment-id <id>  # a single experiment
+"""
+import argparse
+import asyncio
+from app.db.init_db import init_db
+from app.db.session import AsyncSessionLocal
+from app.repositories.response_metrics import get_experiment_ids_missing_metrics
+from app.services.metric_registry import METRIC_REGISTRY
+from app.services.metrics import materialize_experiment_metrics
+
+
+async def backfill(experiment_id: str | None = None) -> None:
+    await init_db()
+
+    if experiment_id:
+        experiment_ids = [experiment_id]
+    else:
+        async with AsyncSessionLocal() as session:
+            experiment_ids = [str(e) for e in await get_experiment_ids_missing_metrics(session, list(METRIC_REGISTRY))]
+
+    print(f"Backfilling metrics for {len(experiment_ids)} experiment(s)...")
+    total = 0
+    for exp_id in experiment_ids:
+        created = await materialize_experiment_metrics(exp_id)
+        print(f"  {exp_id}: {created} metric rows")
+        total += created
+    print(f"Done. {total} metric rows written.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill stored quality metrics")
+    parser.add_argument("--experiment-id", help="Only backfill this experiment")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.experiment_id))
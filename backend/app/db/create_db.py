@@ -3,6 +3,8 @@ from sqlmodel import SQLModel
 from app.db.session import sync_engine
 from app.models.experiments import Experiment
 from app.models.llm_response import LLMResponse
+from app.models.response_metrics import ResponseMetric
+from app.models.experiment_artifacts import ExperimentArtifact
 
 # Ensure data directory exists
 os.makedirs("./data", exist_ok=True)
@@ -0,0 +1,66 @@
+from sqlalchemy import UniqueConstraint, inspect
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel
+from app.db.session import async_engine
+from app.models.experiments import Experiment
+from app.models.llm_response import LLMResponse
+from app.models.response_metrics import ResponseMetric
+from app.models.experiment_artifacts import ExperimentArtifact
+
+
+def _add_missing_columns(sync_conn) -> None:
+    """
+    Add columns declared on the models but missing from existing tables (and their
+    indexes). Only nullable columns are added, so existing rows stay valid.
+    """
+    inspector = inspect(sync_conn)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            ddl = CreateColumn(column).compile(dialect=sync_conn.dialect)
+            sync_conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            for index in table.indexes:
+                if column.name in index.columns:
+                    index.create(sync_conn, checkfirst=True)
+
+
+def _add_missing_unique_constraints(sync_conn) -> None:
+    """
+    Add unique constraints declared on the models but missing from existing tables,
+    as unique indexes (SQLite cannot add constraints to a table). Duplicate rows
+    written before the constraint existed are removed first, keeping the oldest.
+    """
+    inspector = inspect(sync_conn)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = [set(c["column_names"]) for c in inspector.get_unique_constraints(table.name)]
+        existing += [set(i["column_names"]) for i in inspector.get_indexes(table.name) if i["unique"]]
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            columns = [column.name for column in constraint.columns]
+            if set(columns) in existing:
+                continue
+            column_list = ", ".join(columns)
+            sync_conn.exec_driver_sql(
+                f"DELETE FROM {table.name} WHERE rowid NOT IN "
+                f"(SELECT MIN(rowid) FROM {table.name} GROUP BY {column_list})"
+            )
+            sync_conn.exec_driver_sql(f"CREATE UNIQUE INDEX {constraint.name} ON {table.name} ({column_list})")
+
+
+async def init_db() -> None:
+    """
+    Create any tables missing from the database, add new nullable columns to
+    existing ones and add missing unique constraints (only duplicate rows they
+    forbid are removed).
+    """
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_add_missing_unique_constraints)
@@ -5,6 +5,8 @@ from .base import BaseLLMProvider
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude API provider"""
     
+    name = "anthropic"
+    
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         super().__init__(api_key, base_url)
         self.base_url = base_url or "https://api.anthropic.com/v1"
@@ -20,10 +22,10 @@ class AnthropicProvider(BaseLLMProvider):
     ) -> Dict[str, Any]:
         """Generate response using Anthropic Claude API"""
         import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._http_client(model) as client:
                 headers = {
                     "x-api-key": self.api_key,
                     "Content-Type": "application/json",
@@ -1,10 +1,79 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+import asyncio
 import time
+from ..core.prometheus import PROVIDER_HTTP_PHASE, TIME_TO_FIRST_TOKEN
+from ..core.tracing import current_span
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# Phases of one HTTP request, as (phase, httpcore trace event starting it, event ending it).
+# Events are matched by suffix, so HTTP/1.1 ("http11.") and HTTP/2 ("http2.") both count.
+HTTP_PHASES = (
+    ("connect", "connection.connect_tcp.started", "connection.connect_tcp.complete"),
+    ("tls", "connection.start_tls.started", "connection.start_tls.complete"),
+    ("first_byte", "send_request_body.complete", "receive_response_headers.complete"),
+    ("transfer", "receive_response_body.started", "receive_response_body.complete"),
+)
+
+
+class HttpTimings:
+    """
+    Latency breakdown of one provider HTTP request, in seconds (time.perf_counter)
+
+    connect includes DNS resolution and is 0 when a pooled connection was reused,
+    tls is the handshake, first_byte runs from the request being sent until the
+    response headers arrived (server processing plus a round trip) and transfer
+    is reading the response body.
+    """
+    
+    __slots__ = ("phases", "_started")
+    
+    def __init__(self):
+        self.phases: Dict[str, float] = {phase: 0.0 for phase, _, _ in HTTP_PHASES}
+        self._started: Dict[str, float] = {}
+    
+    def event(self, name: str, at: float) -> Optional[Tuple[str, float]]:
+        """Record a trace event; returns the phase it completed and its duration, if any"""
+        for phase, start, end in HTTP_PHASES:
+            if name.endswith(start):
+                self._started[phase] = at
+            elif name.endswith(end) and phase in self._started:
+                seconds = at - self._started.pop(phase)
+                self.phases[phase] += seconds
+                return phase, seconds
+        return None
+    
+    def as_result(self) -> Dict[str, float]:
+        """The breakdown as the `*_time` fields stored with a response"""
+        return {f"{phase}_time": round(seconds, 6) for phase, seconds in self.phases.items()}
+    
+    @classmethod
+    def total(cls, timings: List["HttpTimings"]) -> "HttpTimings":
+        """Sum of the breakdowns of requests made one after another for one call"""
+        merged = cls()
+        for item in timings:
+            for phase, seconds in item.phases.items():
+                merged.phases[phase] += seconds
+        return merged
+
+
+# HTTP requests made by the provider call in progress, one HttpTimings per client
+# created through BaseLLMProvider._http_client (None outside of a recorded call)
+http_timings: ContextVar[Optional[List[HttpTimings]]] = ContextVar("http_timings", default=None)
 
 class BaseLLMProvider(ABC):
     """Base class for all LLM providers"""
     
+    # Provider type, as registered in LLMProviderFactory (used as the metrics label)
+    name = "base"
+    
+    # Whether generate_samples returns n completions from a single API call
+    supports_native_samples = False
+    
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key
         self.base_url = base_url
@@ -33,6 +102,68 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def generate_samples(
+        self, 
+        prompt: str, 
+        n: int,
+        temperature: float = 0.7, 
+        top_p: float = 0.9,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate n independent completions for the same prompt and parameters
+        
+        Providers whose API accepts a sample count override this to make a single
+        call; the default issues the n calls concurrently.
+        
+        Returns:
+            One dictionary per sample, shaped like generate_response's result
+        """
+        return list(await asyncio.gather(*(
+            self.generate_response(prompt, temperature=temperature, top_p=top_p, max_tokens=max_tokens, **kwargs)
+            for _ in range(n)
+        )))
+    
+    def _http_client(self, model: str, **kwargs) -> "httpx.AsyncClient":
+        """
+        HTTP client for one API call
+        
+        Records the time from sending the request until its response headers arrive
+        as the call's time to first token (the providers do not stream, so the first
+        byte of the response is the first token we can observe), and marks both
+        moments as events on the current trace span.
+        
+        The request's connect/TLS/first byte/transfer phases are taken from httpcore's
+        trace events, observed in PROVIDER_HTTP_PHASE and, inside a recorded call
+        (see `http_timings`), appended to that call's breakdowns.
+        """
+        import httpx
+        
+        sent_at = 0.0
+        timings = HttpTimings()
+        recorded = http_timings.get()
+        if recorded is not None:
+            recorded.append(timings)
+        
+        async def on_trace(name: str, info: Dict[str, Any]) -> None:
+            completed = timings.event(name, time.perf_counter())
+            if completed is not None:
+                PROVIDER_HTTP_PHASE.labels(self.name, model, completed[0]).observe(completed[1])
+        
+        async def on_request(request: "httpx.Request") -> None:
+            nonlocal sent_at
+            sent_at = time.perf_counter()
+            request.extensions["trace"] = on_trace
+            current_span().add_event("http.request_sent", {"http.method": request.method, "http.url": str(request.url)})
+        
+        async def on_response(response: "httpx.Response") -> None:
+            first_byte = time.perf_counter() - sent_at
+            TIME_TO_FIRST_TOKEN.labels(self.name, model).observe(first_byte)
+            current_span().add_event("http.response_headers", {"http.status_code": response.status_code, "http.first_byte_seconds": round(first_byte, 6)})
+        
+        return httpx.AsyncClient(event_hooks={"request": [on_request], "response": [on_response]}, **kwargs)
+    
     def _calculate_execution_time(self, start_time: float) -> float:
-        """Calculate execution time in seconds"""
-        return time.time() - start_time
+        """Calculate execution time in seconds from a time.perf_counter() start"""
+        return time.perf_counter() - start_time
@@ -1,26 +1,60 @@
-from typing import Dict, Any, Optional
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict, Any, Optional, Type
 from .base import BaseLLMProvider
-from .openai_provider import OpenAIProvider
-from .anthropic_provider import AnthropicProvider
-from .google_provider import GoogleProvider
-from .ollama_provider import OllamaProvider
-from .llama_cpp_provider import LlamaCppProvider
-from .openrouter_provider import OpenRouterProvider
-from .mock_provider import MockProvider
+from ..config import Config
 from ..consts import SUPPORTED_PROVIDERS, MODEL_PROVIDER_MAP
 
+if TYPE_CHECKING:
+    from .replay_provider import ReplayProvider, TraceWriter
+
 class LLMProviderFactory:
     """Factory class for creating LLM providers"""
     
+    # Provider type -> "module:class"; a provider module (and its HTTP client
+    # dependencies) is only imported when that provider is first created
     _providers = {
-        "openai": OpenAIProvider,
-        "anthropic": AnthropicProvider,
-        "google": GoogleProvider,
-        "ollama": OllamaProvider,
-        "llama_cpp": LlamaCppProvider,
-        "openrouter": OpenRouterProvider,
-        "mock": MockProvider,
+        "openai": "openai_provider:OpenAIProvider",
+        "anthropic": "anthropic_provider:AnthropicProvider",
+        "google": "google_provider:GoogleProvider",
+        "ollama": "ollama_provider:OllamaProvider",
+        "llama_cpp": "llama_cpp_provider:LlamaCppProvider",
+        "openrouter": "openrouter_provider:OpenRouterProvider",
+        "mock": "mock_provider:MockProvider",
     }
+    _classes: Dict[str, Type[BaseLLMProvider]] = {}
+    
+    # Shared by all providers while LLM_REPLAY_TRACE / LLM_RECORD_TRACE are set
+    _replay: Optional["ReplayProvider"] = None
+    _trace_writer: Optional["TraceWriter"] = None
+    
+    @classmethod
+    def get_provider_class(cls, provider_type: str) -> Type[BaseLLMProvider]:
+        """
+        Get the provider class registered for a provider type, importing it on first use
+        
+        Args:
+            provider_type: Type of provider (openai, anthropic, ollama, llama_cpp, ...)
+            
+        Returns:
+            The provider class
+        """
+        if provider_type not in cls._providers:
+            raise ValueError(f"Unsupported provider type: {provider_type}")
+        if provider_type not in cls._classes:
+            module_name, _, class_name = cls._providers[provider_type].partition(":")
+            module = import_module(f".{module_name}", __package__)
+            cls._classes[provider_type] = getattr(module, class_name)
+        return cls._classes[provider_type]
+    
+    @classmethod
+    def requires_api_key(cls, provider_type: str) -> bool:
+        """
+        Whether creating a provider of this type needs an API key
+        
+        Local providers never do, and while LLM_REPLAY_TRACE is set no provider does:
+        every call is answered from the trace.
+        """
+        return provider_type not in ["mock", "ollama"] and not Config.LLM_REPLAY_TRACE
     
     @classmethod
     def create_provider(
@@ -40,13 +74,33 @@ class LLMProviderFactory:
             **kwargs: Additional provider-specific parameters
             
         Returns:
-            LLM provider instance
+            LLM provider instance (the replay provider for every type while
+            LLM_REPLAY_TRACE is set, wrapped for recording while LLM_RECORD_TRACE is set)
         """
         if provider_type not in self._providers:
             raise ValueError(f"Unsupported provider type: {provider_type}")
         
-        provider_class = self._providers[provider_type]
-        return provider_class(api_key=api_key, base_url=base_url, **kwargs)
+        if Config.LLM_REPLAY_TRACE:
+            if self._replay is None:
+                from .replay_provider import ReplayProvider
+                LLMProviderFactory._replay = ReplayProvider(Config.LLM_REPLAY_TRACE, Config.LLM_REPLAY_TIME_SCALE)
+            return self._replay
+        
+        provider_class = self.get_provider_class(provider_type)
+        provider = provider_class(api_key=api_key, base_url=base_url, **kwargs)
+        if Config.LLM_RECORD_TRACE:
+            from .replay_provider import RecordingProvider, TraceWriter
+            if self._trace_writer is None:
+                LLMProviderFactory._trace_writer = TraceWriter(Config.LLM_RECORD_TRACE)
+            provider = RecordingProvider(provider, self._trace_writer)
+        return provider
+    
+    @classmethod
+    def close(cls) -> None:
+        """Flush and close the recording trace, if one is open"""
+        if cls._trace_writer is not None:
+            cls._trace_writer.close()
+            cls._trace_writer = None
     
     @classmethod
     def get_supported_providers(cls) -> list:
@@ -4,6 +4,8 @@ from .base import BaseLLMProvider
 
 class GoogleProvider(BaseLLMProvider):
     """Google Gemini API provider"""
+    
+    name = "google"
 
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         super().__init__(api_key, base_url)
@@ -19,10 +21,10 @@ class GoogleProvider(BaseLLMProvider):
         **kwargs
     ) -> Dict[str, Any]:
         import time
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._http_client(model) as client:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
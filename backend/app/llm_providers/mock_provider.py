@@ -1,13 +1,85 @@
 import asyncio
+import hashlib
+import math
 import random
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .base import BaseLLMProvider
+from ..config import Config
+from ..core.prometheus import TIME_TO_FIRST_TOKEN
+from ..services.concurrency_runner import current_attempt
+
+# Failure classes the mock can simulate (MOCK_FAILURES="error=0.05,timeout=0.01,...")
+FAILURE_CLASSES = ("error", "server_error", "timeout", "connection", "empty")
+
+
+def parse_latency(spec: str) -> Tuple[str, List[float]]:
+    """
+    Parse a latency distribution spec: "fixed:S", "uniform:LOW,HIGH",
+    "lognormal:MEDIAN,SIGMA" or "pareto:SCALE,ALPHA" (heavy tail), in seconds
+    """
+    kind, _, params = spec.partition(":")
+    kind = kind.strip().lower()
+    values = [float(v) for v in params.split(",") if v.strip()]
+    expected = {"fixed": 1, "uniform": 2, "lognormal": 2, "pareto": 2}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(f"Invalid mock latency {spec!r}, expected fixed:S, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA or pareto:SCALE,ALPHA")
+    return kind, values
+
+
+def parse_failures(spec: str) -> Dict[str, float]:
+    """Parse "class=probability,..." into {class: probability}"""
+    failures = {}
+    for entry in spec.split(","):
+        name, _, probability = entry.partition("=")
+        if not name.strip():
+            continue
+        if name.strip() not in FAILURE_CLASSES:
+            raise ValueError(f"Unknown mock failure class {name.strip()!r}, expected one of: {', '.join(FAILURE_CLASSES)}")
+        failures[name.strip()] = float(probability)
+    if sum(failures.values()) > 1:
+        raise ValueError("Mock failure probabilities add up to more than 1")
+    return failures
+
 
 class MockProvider(BaseLLMProvider):
-    """Mock LLM provider for testing and development"""
+    """
+    Mock LLM provider for testing, development and benchmarks
+    
+    Behaviour is configured through Config (MOCK_*) or constructor overrides:
+    - seed: every call draws from its own RNG, seeded from the seed, the call's
+      parameters, how many calls with those parameters came before and the runner's
+      retry attempt, so a run reproduces regardless of how concurrent calls
+      interleave, and a retry draws differently from the attempt it retries
+    - latency: distribution of the time to first token (see `parse_latency`), scaled
+      by (1 + temperature) and MOCK_LATENCY_SCALE
+    - token_rate: when > 0, the response then streams at this many tokens/second
+    - capacity: calls served concurrently per model, across provider instances;
+      calls beyond it queue
+    - rate_limit: (probability, seconds); with that probability (drawn from the
+      call's RNG) a call is answered with a 429 and a Retry-After of `seconds`
+    - failures: per-call probability of each failure class in FAILURE_CLASSES
+    """
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    name = "mock"
+    
+    # Simulates an API with a native sample count: n samples cost one round trip
+    supports_native_samples = True
+    
+    # Shared by all instances, like the capacity of a real endpoint
+    _capacity: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        seed: Optional[int] = None,
+        latency: Optional[str] = None,
+        token_rate: Optional[float] = None,
+        capacity: Optional[int] = None,
+        rate_limit: Optional[Tuple[float, float]] = None,
+        failures: Optional[Dict[str, float]] = None,
+    ):
         super().__init__(api_key, base_url)
         self.mock_responses = [
             "This is a mock response from the LLM. It demonstrates how the system works with parameter variations.",
@@ -16,6 +88,96 @@ class MockProvider(BaseLLMProvider):
             "Another simulated response that varies based on the input parameters you've configured.",
             "Final mock response demonstrating the parameter sweep functionality in action."
         ]
+        self.seed = Config.MOCK_SEED if seed is None else seed
+        self.latency = parse_latency(latency or Config.MOCK_LATENCY)
+        self.token_rate = Config.MOCK_TOKEN_RATE if token_rate is None else token_rate
+        self.capacity = Config.MOCK_CAPACITY if capacity is None else capacity
+        if rate_limit is None:
+            probability, _, seconds = Config.MOCK_RATE_LIMIT.partition(",")
+            rate_limit = (float(probability or 0), float(seconds or 0))
+        self.rate_limit = rate_limit
+        self.failures = parse_failures(Config.MOCK_FAILURES) if failures is None else failures
+        self._call_counts: Dict[Tuple, int] = {}
+    
+    def _rng(self, *key: Any) -> random.Random:
+        """
+        RNG for one call: the n-th call with the same parameters gets the n-th stream
+        
+        The runner builds a new provider for every attempt, so the call count restarts
+        on a retry; the attempt number keeps the retry from replaying the same draw.
+        """
+        count = self._call_counts.get(key, 0)
+        self._call_counts[key] = count + 1
+        if self.seed is None:
+            return random.Random()
+        digest = hashlib.sha256(repr((self.seed, key, count, current_attempt.get())).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+    
+    def _time_to_first_token(self, rng: random.Random, temperature: float) -> float:
+        kind, params = self.latency
+        if kind == "fixed":
+            seconds = params[0]
+        elif kind == "uniform":
+            seconds = rng.uniform(params[0], params[1])
+        elif kind == "lognormal":
+            seconds = rng.lognormvariate(math.log(params[0]), params[1])
+        else:
+            seconds = params[0] * rng.paretovariate(params[1])
+        return seconds * (1 + temperature) * Config.MOCK_LATENCY_SCALE
+    
+    def _draw_failure(self, rng: random.Random) -> Optional[str]:
+        roll = rng.random()
+        for failure, probability in self.failures.items():
+            if roll < probability:
+                return failure
+            roll -= probability
+        return None
+    
+    async def _call(self, rng: random.Random, model: str, temperature: float, tokens: int) -> Optional[Dict[str, Any]]:
+        """
+        Simulate one round trip: queue for capacity, apply rate limiting, wait out the
+        latency and raise or return the drawn failure
+        
+        Returns:
+            Fields overriding the prepared results (a failure), or None on success
+        """
+        semaphore = None
+        if self.capacity > 0:
+            key = (id(asyncio.get_running_loop()), model)
+            semaphore = self._capacity.setdefault(key, asyncio.Semaphore(self.capacity))
+            await semaphore.acquire()
+        try:
+            probability, retry_after = self.rate_limit
+            # Always drawn, so enabling rate limiting does not shift the draws below
+            if rng.random() < probability:
+                return {
+                    "response": "",
+                    "tokens_used": 0,
+                    "success": False,
+                    "error": f"API Error: 429 - rate limited, retry after {math.ceil(retry_after)}s",
+                    "status_code": 429,
+                    "retry_after": math.ceil(retry_after),
+                }
+            
+            time_to_first_token = self._time_to_first_token(rng, temperature)
+            failure = self._draw_failure(rng)
+            await asyncio.sleep(time_to_first_token)
+            # The response "arrives" once the first token does
+            TIME_TO_FIRST_TOKEN.labels(self.name, model).observe(time_to_first_token)
+            if failure == "timeout":
+                raise asyncio.TimeoutError("Mock provider simulated timeout")
+            if failure == "connection":
+                raise ConnectionError("Mock provider simulated connection reset")
+            if failure == "server_error":
+                return {"response": "", "tokens_used": 0, "success": False, "error": "API Error: 500 - mock server error", "status_code": 500}
+            if failure == "error":
+                return {"response": "", "tokens_used": 0, "success": False, "error": "Mock provider simulated failure for testing"}
+            if self.token_rate > 0:
+                await asyncio.sleep(tokens / self.token_rate * Config.MOCK_LATENCY_SCALE)
+            return {"response": ""} if failure == "empty" else None
+        finally:
+            if semaphore is not None:
+                semaphore.release()
     
     async def generate_response(
         self, 
@@ -27,12 +189,34 @@ class MockProvider(BaseLLMProvider):
         **kwargs
     ) -> Dict[str, Any]:
         """Generate mock response with simulated processing time"""
-        start_time = time.time()
+        start_time = time.perf_counter()
+        rng = self._rng(model, prompt, temperature, top_p)
+        result = self._mock_response(temperature, top_p, start_time)
         
-        # Simulate processing time based on temperature (higher temp = longer processing)
-        processing_delay = random.uniform(0.5, 2.0) * (1 + temperature)
-        await asyncio.sleep(processing_delay)
+        overrides = await self._call(rng, model, temperature, result["tokens_used"])
+        return {**result, **(overrides or {}), "execution_time": self._calculate_execution_time(start_time)}
+    
+    async def generate_samples(
+        self, 
+        prompt: str, 
+        n: int,
+        temperature: float = 0.7, 
+        top_p: float = 0.9,
+        max_tokens: int = 1000,
+        model: str = "mock-model",
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Generate n mock samples with the processing time of a single call"""
+        start_time = time.perf_counter()
+        rng = self._rng(model, prompt, temperature, top_p, n)
+        results = [self._mock_response(temperature, top_p, start_time) for _ in range(n)]
         
+        overrides = await self._call(rng, model, temperature, sum(r["tokens_used"] for r in results))
+        execution_time = self._calculate_execution_time(start_time)
+        return [{**result, **(overrides or {}), "execution_time": execution_time} for result in results]
+    
+    def _mock_response(self, temperature: float, top_p: float, start_time: float) -> Dict[str, Any]:
+        """Build one mock result for the given parameters"""
         # Select response based on temperature and top_p for variety
         response_index = int((temperature + top_p) * 2) % len(self.mock_responses)
         base_response = self.mock_responses[response_index]
@@ -52,16 +236,6 @@ class MockProvider(BaseLLMProvider):
         # Simulate token usage based on response length and parameters
         tokens_used = len(base_response.split()) + int(temperature * 50) + int(top_p * 30)
         
-        # Simulate occasional failures for testing error handling
-        if random.random() < 0.05:  # 5% failure rate
-            return {
-                "response": "",
-                "tokens_used": 0,
-                "execution_time": self._calculate_execution_time(start_time),
-                "success": False,
-                "error": "Mock provider simulated failure for testing"
-            }
-        
         return {
             "response": base_response,
             "tokens_used": tokens_used,
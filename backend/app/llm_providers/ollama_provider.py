@@ -5,6 +5,8 @@ from .base import BaseLLMProvider
 class OllamaProvider(BaseLLMProvider):
     """Ollama local LLM provider"""
     
+    name = "ollama"
+    
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         super().__init__(api_key, base_url)
         self.base_url = base_url or "http://localhost:11434"
@@ -20,10 +22,10 @@ class OllamaProvider(BaseLLMProvider):
     ) -> Dict[str, Any]:
         """Generate response using Ollama local API"""
         import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._http_client(model) as client:
                 payload = {
                     "model": model,
                     "prompt": prompt,
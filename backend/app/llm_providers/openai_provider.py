@@ -1,10 +1,14 @@
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from .base import BaseLLMProvider
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI API provider"""
     
+    name = "openai"
+    
+    supports_native_samples = True
+    
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         super().__init__(api_key, base_url)
         self.base_url = base_url or "https://api.openai.com/v1"
@@ -19,25 +23,60 @@ class OpenAIProvider(BaseLLMProvider):
         **kwargs
     ) -> Dict[str, Any]:
         """Generate response using OpenAI API"""
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        results = await self._chat_completions(payload, 1)
+        return results[0]
+
+    async def generate_samples(
+        self, 
+        prompt: str, 
+        n: int,
+        temperature: float = 0.7, 
+        top_p: float = 0.9,
+        max_tokens: int = 1000,
+        model: str = "gpt-3.5-turbo",
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Generate n samples in one OpenAI API call (the `n` parameter)"""
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+            "n": n,
+            **kwargs
+        }
+        return await self._chat_completions(payload, n)
+
+    async def _chat_completions(self, payload: Dict[str, Any], n: int) -> List[Dict[str, Any]]:
+        """
+        Send a chat completions request and return one result per choice
+        
+        Args:
+            payload: request body
+            n: number of samples requested (failed results on an error)
+            
+        Returns:
+            One result per returned choice, or `n` failed results when the call fails
+        """
         import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._http_client(payload["model"]) as client:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
                 }
                 
-                payload = {
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": temperature,
-                    "top_p": top_p,
-                    "max_tokens": max_tokens,
-                    **kwargs
-                }
-                
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
@@ -47,26 +86,35 @@ class OpenAIProvider(BaseLLMProvider):
                 
                 if response.status_code == 200:
                     data = response.json()
-                    return {
-                        "response": data["choices"][0]["message"]["content"],
-                        "tokens_used": data["usage"]["total_tokens"],
-                        "execution_time": self._calculate_execution_time(start_time),
-                        "success": True,
-                        "error": None
-                    }
+                    execution_time = self._calculate_execution_time(start_time)
+                    choices = data["choices"]
+                    if not choices:
+                        raise ValueError("API returned no choices")
+                    # usage covers the whole call; split it evenly across the samples
+                    tokens_per_sample = round(data["usage"]["total_tokens"] / max(1, len(choices)))
+                    return [
+                        {
+                            "response": choice["message"]["content"],
+                            "tokens_used": tokens_per_sample,
+                            "execution_time": execution_time,
+                            "success": True,
+                            "error": None
+                        }
+                        for choice in choices
+                    ]
                 else:
-                    return {
-                        "response": "",
-                        "tokens_used": 0,
-                        "execution_time": self._calculate_execution_time(start_time),
-                        "success": False,
-                        "error": f"API Error: {response.status_code} - {response.text}"
-                    }
+                    error = f"API Error: {response.status_code} - {response.text}"
         except Exception as e:
-            return {
+            error = str(e)
+        
+        execution_time = self._calculate_execution_time(start_time)
+        return [
+            {
                 "response": "",
                 "tokens_used": 0,
-                "execution_time": self._calculate_execution_time(start_time),
+                "execution_time": execution_time,
                 "success": False,
-                "error": str(e)
+                "error": error
             }
+            for _ in range(n)
+        ]
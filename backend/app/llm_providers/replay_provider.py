@@ -0,0 +1,231 @@
+"""
+Record-and-replay providers for reproducible performance testing.
+
+RecordingProvider wraps any provider and appends every call to a trace file: the
+request parameters, the results (response text, token counts, success/error) and the
+measured latency. ReplayProvider serves a trace back with the recorded latencies
+(optionally time-scaled), so scheduler, runner and cache changes can be compared on
+identical traffic without calling any API.
+
+Traces are JSON lines, one call per line, gzip-compressed when the path ends in
+".gz". Each call carries its arrival offset from the start of the recording ("at").
+Prompts are stored as a SHA-256 prefix; the prompt text is only stored when
+LLM_RECORD_PROMPTS is set, and is what `benchmarks.replay_traffic` needs to
+re-submit a recorded day through the API with its original arrival times.
+
+Enabled through the provider factory: LLM_RECORD_TRACE=path records real traffic,
+LLM_REPLAY_TRACE=path replays it for every provider type (no API keys needed).
+"""
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, IO, Iterator, List, Optional, Tuple
+
+from .base import BaseLLMProvider
+from ..config import Config
+from ..core.logger import Logger
+
+
+logger = Logger(__name__)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+
+def _open_trace(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """The call records of a trace file, in recording order."""
+    with _open_trace(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _recorded(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a provider result kept in a trace."""
+    return {
+        "response": result.get("response", ""),
+        "tokens_used": result.get("tokens_used", 0),
+        "success": result.get("success", True),
+        "error": result.get("error"),
+    }
+
+
+class TraceWriter:
+    """
+    Appends call records to a trace file, flushed every `flush_every` records and on close.
+
+    Like the logging pipeline, `write` only stamps the record and queues it; a writer
+    thread serializes, compresses and writes, so no trace I/O runs on the event loop.
+    """
+
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = path
+        self.flush_every = flush_every
+        # Opened here, so a bad path fails when recording starts, not in the thread
+        self._file = _open_trace(path, "a")
+        self._origin = time.perf_counter()
+        self._records: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record: Dict[str, Any], started: float) -> None:
+        """Queue a call record; `started` is the call's perf_counter() start (its arrival)."""
+        record["at"] = round(started - self._origin, 4)
+        self._records.put(record)
+
+    def _run(self) -> None:
+        pending = 0
+        with self._file:
+            # None is the stop sentinel queued by close()
+            for record in iter(self._records.get, None):
+                try:
+                    self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    pending += 1
+                    if pending >= self.flush_every:
+                        self._file.flush()
+                        pending = 0
+                except Exception as e:
+                    logger.error(f"Failed to write trace record to {self.path}: {str(e)}")
+
+    def close(self) -> None:
+        """Write the queued records and close the file (idempotent)."""
+        if self._thread.is_alive():
+            self._records.put(None)
+            self._thread.join()
+        atexit.unregister(self.close)
+
+
+class RecordingProvider(BaseLLMProvider):
+    """
+    Usage example:
+        provider = RecordingProvider(OpenAIProvider(api_key), TraceWriter("traces/day1.jsonl.gz"))
+
+    Calls are passed through unchanged; failures are recorded too (raised exceptions
+    as failed results), so a replay sees the same error rate.
+    """
+
+    def __init__(self, inner: BaseLLMProvider, writer: TraceWriter):
+        super().__init__(inner.api_key, inner.base_url)
+        self.inner = inner
+        self.writer = writer
+        self.name = inner.name
+        self.supports_native_samples = inner.supports_native_samples
+
+    def _record(self, kind: str, prompt: str, n: int, temperature: float, top_p: float, max_tokens: int,
+                model: Optional[str], start: float, results: List[Dict[str, Any]]) -> None:
+        record = {
+            "kind": kind,
+            "provider": self.name,
+            "model": model,
+            "prompt": prompt_hash(prompt),
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+            "n": n,
+            "latency": round(time.perf_counter() - start, 6),
+            "results": [_recorded(r) for r in results],
+        }
+        if Config.LLM_RECORD_PROMPTS:
+            record["prompt_text"] = prompt
+        self.writer.write(record, start)
+
+    async def generate_response(self, prompt: str, temperature: float = 0.7, top_p: float = 0.9, max_tokens: int = 1000, **kwargs) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = await self.inner.generate_response(prompt, temperature=temperature, top_p=top_p, max_tokens=max_tokens, **kwargs)
+        except Exception as e:
+            self._record("response", prompt, 1, temperature, top_p, max_tokens, kwargs.get("model"), start,
+                         [{"response": "", "tokens_used": 0, "success": False, "error": str(e)}])
+            raise
+        self._record("response", prompt, 1, temperature, top_p, max_tokens, kwargs.get("model"), start, [result])
+        return result
+
+    async def generate_samples(self, prompt: str, n: int, temperature: float = 0.7, top_p: float = 0.9, max_tokens: int = 1000, **kwargs) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            results = await self.inner.generate_samples(prompt, n, temperature=temperature, top_p=top_p, max_tokens=max_tokens, **kwargs)
+        except Exception as e:
+            self._record("samples", prompt, n, temperature, top_p, max_tokens, kwargs.get("model"), start,
+                         [{"response": "", "tokens_used": 0, "success": False, "error": str(e)} for _ in range(n)])
+            raise
+        self._record("samples", prompt, n, temperature, top_p, max_tokens, kwargs.get("model"), start, results)
+        return results
+
+
+CallKey = Tuple[Optional[str], str, float, float, int]
+
+
+class ReplayProvider(BaseLLMProvider):
+    """
+    Usage example:
+        provider = ReplayProvider("traces/day1.jsonl.gz", time_scale=0.1)
+
+    Each call is answered with the next recorded call with the same model, prompt,
+    temperature, top_p and sample count, after its recorded latency times
+    `time_scale` (0 answers instantly). Recorded calls are reused in order once a
+    key runs out; a call whose key was never recorded gets the next recorded call
+    of the same model, and a model that was never recorded gets a failed result.
+    """
+
+    name = "replay"
+
+    supports_native_samples = True
+
+    def __init__(self, path: str, time_scale: float = 1.0):
+        super().__init__(None, None)
+        self.path = path
+        self.time_scale = time_scale
+        self._by_key: Dict[CallKey, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_model: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for record in read_trace(path):
+            self._by_key[self._key(record["model"], record["prompt"], record["temperature"], record["top_p"], record["n"])].append(record)
+            self._by_model[record["model"]].append(record)
+        self._queues: Dict[Any, Deque[Dict[str, Any]]] = {}
+        logger.info(f"Loaded {sum(len(r) for r in self._by_model.values())} recorded calls from {path}")
+
+    @staticmethod
+    def _key(model: Optional[str], prompt: str, temperature: float, top_p: float, n: int) -> CallKey:
+        return (model, prompt, round(float(temperature), 4), round(float(top_p), 4), n)
+
+    def _next(self, queue_key: Any, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        queue = self._queues.get(queue_key)
+        if not queue:
+            queue = self._queues[queue_key] = deque(records)
+        return queue.popleft()
+
+    async def _replay(self, prompt: str, n: int, temperature: float, top_p: float, model: Optional[str]) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        key = self._key(model, prompt_hash(prompt), temperature, top_p, n)
+        if self._by_key.get(key):
+            record = self._next(key, self._by_key[key])
+        elif self._by_model.get(model):
+            record = self._next(("model", model), self._by_model[model])
+        else:
+            return [{"response": "", "tokens_used": 0, "success": False, "error": f"No recorded calls for model {model}",
+                     "execution_time": 0.0} for _ in range(n)]
+        await asyncio.sleep(record["latency"] * self.time_scale)
+        results = [dict(result) for result in record["results"]]
+        # Samples calls recorded with a different n are padded by repeating results
+        results = [results[i % len(results)] for i in range(n)]
+        execution_time = self._calculate_execution_time(start)
+        return [{**result, "execution_time": execution_time} for result in results]
+
+    async def generate_response(self, prompt: str, temperature: float = 0.7, top_p: float = 0.9, max_tokens: int = 1000, **kwargs) -> Dict[str, Any]:
+        return (await self._replay(prompt, 1, temperature, top_p, kwargs.get("model")))[0]
+
+    async def generate_samples(self, prompt: str, n: int, temperature: float = 0.7, top_p: float = 0.9, max_tokens: int = 1000, **kwargs) -> List[Dict[str, Any]]:
+        return await self._replay(prompt, n, temperature, top_p, kwargs.get("model"))
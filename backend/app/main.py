@@ -1,10 +1,16 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import time
-import traceback
+import asyncio
 from .api import api_router
-from .core.logger import logger
+from .core.instrumentation import RequestInstrumentationMiddleware
+from .core.logger import logger, shutdown_logging
+from .core.loop_monitor import loop_monitor
+from .core.profiling import ProfilingMiddleware
+from .core.tracing import tracer
+from .config import Config
+from .db.init_db import init_db
+from .llm_providers.factory import LLMProviderFactory
+from .services.metrics_pool import metrics_pool
 
 # Create FastAPI app
 app = FastAPI(
@@ -24,57 +30,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests"""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        f"Request started: {request.method} {request.url}",
-        method=request.method,
-        url=str(request.url),
-        client_ip=request.client.host if request.client else "unknown"
-    )
-    
-    # Process request
-    try:
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Request completed: {request.method} {request.url} - Status: {response.status_code}",
-            method=request.method,
-            url=str(request.url),
-            status_code=response.status_code,
-            process_time=round(process_time, 4),
-            client_ip=request.client.host if request.client else "unknown"
-        )
-        
-        return response
-        
-    except Exception as e:
-        # Log error
-        process_time = time.time() - start_time
-        logger.error(
-            f"Request failed: {request.method} {request.url} - Error: {str(e)}",
-            method=request.method,
-            url=str(request.url),
-            error=str(e),
-            process_time=round(process_time, 4),
-            client_ip=request.client.host if request.client else "unknown",
-            traceback=traceback.format_exc()
-        )
-        
-        # Return error response
-        return JSONResponse(
-            status_code=500,
-            content={"error": "Internal server error", "detail": str(e)}
-        )
+# Request instrumentation (timing histograms, Server-Timing header, sampled access logs)
+app.add_middleware(RequestInstrumentationMiddleware)
+
+# On-demand request profiling (X-Profile header / ?profile=, only with PROFILING_ENABLED)
+app.add_middleware(ProfilingMiddleware)
 
 # Include API routes
 app.include_router(api_router)
@@ -96,6 +56,12 @@ async def root():
 async def startup_event():
     """Application startup event"""
     logger.info("LLM Lab API starting up...")
+    await init_db()
+    if Config.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    if Config.METRICS_WARMUP:
+        # Warm the metrics workers in the background so startup is not delayed
+        app.state.metrics_warmup = asyncio.create_task(metrics_pool.warmup())
     logger.info("API Documentation available at /docs")
 
 # Shutdown event
@@ -103,6 +69,11 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event"""
     logger.info("LLM Lab API shutting down...")
+    await loop_monitor.stop()
+    metrics_pool.shutdown()
+    LLMProviderFactory.close()
+    tracer.shutdown()
+    shutdown_logging()
 
 if __name__ == "__main__":
     import uvicorn
@@ -116,5 +87,6 @@ if __name__ == "__main__":
         host="0.0.0.0", 
         port=8000,
         log_level="info",
-        access_log=True
+        # Access logs come from RequestInstrumentationMiddleware (sampled)
+        access_log=False
     )
@@ -0,0 +1,13 @@
+import uuid
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+class ExperimentArtifact(SQLModel, table=True):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    experiment_id: uuid.UUID = Field(foreign_key="experiment.id", index=True)
+    kind: str = Field(index=True)
+    # Identifies the responses a cached payload was computed from; a mismatch means the artifact
+    # is stale. Empty for artifacts that are records rather than caches (sweep report, trace)
+    fingerprint: str
+    payload: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -15,4 +15,14 @@ class LLMResponse(SQLModel, table=True):
     execution_time: float
     success: bool = True
     error: Optional[str] = None
+    # Position of the prompt in the dataset, for dataset experiments
+    prompt_index: Optional[int] = Field(default=None, index=True)
+    # Repeated samples of one (model, temperature, top_p) cell share a cell_id
+    cell_id: Optional[uuid.UUID] = Field(default=None, index=True)
+    sample_index: Optional[int] = None
+    # Latency breakdown of the provider HTTP request(s) in seconds (None without HTTP)
+    connect_time: Optional[float] = None
+    tls_time: Optional[float] = None
+    first_byte_time: Optional[float] = None
+    transfer_time: Optional[float] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,15 @@
+import uuid
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+class ResponseMetric(SQLModel, table=True):
+    # One value per (response, metric): concurrent materializations insert with ON CONFLICT DO NOTHING
+    __table_args__ = (UniqueConstraint("response_id", "metric", name="uq_responsemetric_response_metric"),)
+    
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    experiment_id: uuid.UUID = Field(foreign_key="experiment.id", index=True)
+    response_id: uuid.UUID = Field(foreign_key="llmresponse.id", index=True)
+    metric: str
+    value: float
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,75 @@
+import uuid
+from typing import Optional
+from sqlmodel import select, delete
+from ..core.logger import Logger
+from ..core.prometheus import DB_WRITE_DURATION
+from ..core.tracing import traced
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.experiment_artifacts import ExperimentArtifact
+
+logger = Logger(__name__)
+
+@traced("db.get_artifact")
+async def get_artifact(session: AsyncSession, experiment_id: str, kind: str) -> Optional[ExperimentArtifact]:
+    """Fetch the cached artifact of a given kind for an experiment."""
+    try:
+        logger.info(f"Getting {kind} artifact for experiment id: {experiment_id}")
+        # Convert string to UUID if needed
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        result = await session.execute(
+            select(ExperimentArtifact).where(
+                ExperimentArtifact.experiment_id == experiment_uuid,
+                ExperimentArtifact.kind == kind,
+            )
+        )
+        return result.scalars().first()
+    except Exception as e:
+        logger.error(f"Error getting {kind} artifact for experiment id: {experiment_id}, error: {e}")
+        raise
+
+
+@traced("db.save_artifact")
+async def save_artifact(
+    session: AsyncSession, experiment_id: str, kind: str, payload: str, fingerprint: str = ""
+) -> ExperimentArtifact:
+    """
+    Store an artifact for an experiment, replacing any previous artifact of the same kind.
+    
+    `fingerprint` identifies the data a cached artifact was computed from (see
+    `responses_fingerprint`); artifacts that are not caches leave it empty.
+    """
+    try:
+        logger.info(f"Saving {kind} artifact for experiment id: {experiment_id}")
+        # Convert string to UUID if needed
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        with DB_WRITE_DURATION.labels("artifact").time():
+            await session.execute(
+                delete(ExperimentArtifact).where(
+                    ExperimentArtifact.experiment_id == experiment_uuid,
+                    ExperimentArtifact.kind == kind,
+                )
+            )
+            artifact = ExperimentArtifact(
+                id=uuid.uuid4(),
+                experiment_id=experiment_uuid,
+                kind=kind,
+                fingerprint=fingerprint,
+                payload=payload,
+            )
+            session.add(artifact)
+            await session.commit()
+
+        logger.info(f"Successfully saved {kind} artifact for experiment id: {experiment_id}")
+        return artifact
+    except Exception as e:
+        logger.error(f"Error saving {kind} artifact for experiment id: {experiment_id}, error: {e}")
+        await session.rollback()
+        raise
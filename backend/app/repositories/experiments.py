@@ -1,20 +1,25 @@
+import json
 import uuid
 from sqlmodel import select, update
 from datetime import datetime
 from ..core.logger import Logger
+from ..core.prometheus import DB_WRITE_DURATION
+from ..core.tracing import traced
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.experiments import Experiment
 from app.consts import ExperimentStatus
 
 logger = Logger(__name__)
 
+@traced("db.save_experiment")
 async def save_experiment(session: AsyncSession, name: str, original_message: str) -> Experiment:
     """Insert a new experiment record."""
     try:
         logger.info(f"Creating a new experiment with name: {name}")
         experiment = Experiment(id=uuid.uuid4(), name=name, original_message=original_message)
         session.add(experiment)
-        await session.commit()
+        with DB_WRITE_DURATION.labels("experiment").time():
+            await session.commit()
         await session.refresh(experiment)
         logger.info(f"Experiment created with ID: {experiment.id}")
         return experiment
@@ -23,6 +28,7 @@ async def save_experiment(session: AsyncSession, name: str, original_message: st
         raise
 
 
+@traced("db.get_experiment_by_id")
 async def get_experiment_by_id(session: AsyncSession, experiment_id: str) -> Experiment | None:
     """Fetch an experiment by ID."""
     try:
@@ -40,6 +46,7 @@ async def get_experiment_by_id(session: AsyncSession, experiment_id: str) -> Exp
         raise
         
 
+@traced("db.get_all_experiments")
 async def get_all_experiments(session: AsyncSession) -> list[Experiment]:
     """Fetch all experiments."""
     try:
@@ -51,13 +58,21 @@ async def get_all_experiments(session: AsyncSession) -> list[Experiment]:
         logger.error(f"Error getting all experiments with error: {e}")
         raise
 
+@traced("db.update_experiment_status")
 async def update_experiment_status(
     session: AsyncSession, 
     experiment_id: str, 
     status: str, 
-    error_message: str = None
+    error_message: str = None,
+    expected_status: str = None
 ) -> bool:
-    """Update experiment status in database."""
+    """
+    Update experiment status in database.
+    
+    With `expected_status`, the row only changes if the experiment is still in that
+    status, so concurrent callers can use it to claim the experiment: exactly one
+    of them gets True.
+    """
     try:
         logger.info(f"Updating experiment {experiment_id} status to {status}")
         
@@ -78,12 +93,19 @@ async def update_experiment_status(
             )
         )
         
-        result = await session.execute(stmt)
-        await session.commit()
+        if expected_status is not None:
+            stmt = stmt.where(Experiment.status == expected_status)
+        
+        with DB_WRITE_DURATION.labels("experiment_status").time():
+            result = await session.execute(stmt)
+            await session.commit()
         
         if result.rowcount > 0:
             logger.info(f"Successfully updated experiment {experiment_id} status to {status}")
             return True
+        elif expected_status is not None:
+            logger.info(f"Experiment {experiment_id} is not {expected_status}, status left unchanged")
+            return False
         else:
             logger.warning(f"Experiment {experiment_id} not found for status update")
             return False
@@ -93,6 +115,7 @@ async def update_experiment_status(
         await session.rollback()
         raise
 
+@traced("db.get_experiment_with_responses")
 async def get_experiment_with_responses(session: AsyncSession, experiment_id: str) -> dict:
     """Get experiment with its responses for status checking."""
     try:
@@ -115,9 +138,16 @@ async def get_experiment_with_responses(session: AsyncSession, experiment_id: st
         
         # Get LLM responses if experiment is completed
         responses = []
+        skipped_cells = []
         if experiment.status == ExperimentStatus.COMPLETED:
             from app.repositories.llm_response import get_responses_by_experiment
+            from app.repositories.experiment_artifacts import get_artifact
+            from app.services.convergent_sweep import SKIPPED_CELLS_ARTIFACT
             responses = await get_responses_by_experiment(session, experiment_id)
+            # Cells an early-stopping sweep skipped because their neighbours converged
+            skipped = await get_artifact(session, experiment_id, SKIPPED_CELLS_ARTIFACT)
+            if skipped:
+                skipped_cells = json.loads(skipped.payload)
         
         return {
             "id": str(experiment.id),
@@ -139,10 +169,18 @@ async def get_experiment_with_responses(session: AsyncSession, experiment_id: st
                     "execution_time": response.execution_time,
                     "success": response.success,
                     "error": response.error,
+                    "prompt_index": response.prompt_index,
+                    "cell_id": str(response.cell_id) if response.cell_id else None,
+                    "sample_index": response.sample_index,
+                    "connect_time": response.connect_time,
+                    "tls_time": response.tls_time,
+                    "first_byte_time": response.first_byte_time,
+                    "transfer_time": response.transfer_time,
                     "created_at": response.created_at.isoformat() if response.created_at else None
                 }
                 for response in responses
-            ]
+            ],
+            "skipped_cells": skipped_cells
         }
         
     except Exception as e:
@@ -1,12 +1,16 @@
 import uuid
-from typing import List, Dict, Any
-from sqlmodel import select
+from typing import List, Dict, Any, Iterable, Tuple
+from sqlmodel import select, delete
 from ..core.logger import Logger
+from ..core.prometheus import DB_WRITE_DURATION
+from ..core.tracing import traced
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.llm_response import LLMResponse
+from app.models.response_metrics import ResponseMetric
 
 logger = Logger(__name__)
 
+@traced("db.get_responses_by_experiment")
 async def get_responses_by_experiment(session: AsyncSession, experiment_id: str) -> List[LLMResponse]:
     """Return all Response rows for a given experiment id (ordered by id)."""
     try:
@@ -27,6 +31,7 @@ async def get_responses_by_experiment(session: AsyncSession, experiment_id: str)
         raise
 
 
+@traced("db.save_responses_transaction")
 async def save_responses_transaction(
     session: AsyncSession, experiment_id: str, responses: List[Dict[str, Any]]
 ) -> List[LLMResponse]:
@@ -53,20 +58,113 @@ async def save_responses_transaction(
                 execution_time=float(r.get("execution_time", 0.0)),
                 success=bool(r.get("success", True)),
                 error=r.get("error"),
+                prompt_index=r.get("prompt_index"),
+                cell_id=r.get("cell_id"),
+                sample_index=r.get("sample_index"),
+                connect_time=r.get("connect_time"),
+                tls_time=r.get("tls_time"),
+                first_byte_time=r.get("first_byte_time"),
+                transfer_time=r.get("transfer_time"),
             )
             session.add(resp)
             created.append(resp)
 
-        # Flush to assign IDs
-        await session.flush()
-        for resp in created:
-            await session.refresh(resp)
-            
-        await session.commit()
+        with DB_WRITE_DURATION.labels("responses").time():
+            # Flush to assign IDs
+            await session.flush()
+            for resp in created:
+                await session.refresh(resp)
+                
+            await session.commit()
 
         logger.info(f"Successfully saved {len(created)} LLM responses for experiment id: {experiment_id}")
         return created
 
     except Exception as e:
         logger.error(f"Error saving LLM responses for experiment id: {experiment_id}, error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+@traced("db.delete_failed_responses")
+async def delete_failed_responses(
+    session: AsyncSession, experiment_id: str, cells: Iterable[Tuple[str, float, float]]
+) -> int:
+    """
+    Delete the failed responses stored for the given (model, temperature, top_p)
+    cells, with their metrics. Does not commit, so a retry can replace the failed
+    rows in the same transaction that saves the new ones.
+    """
+    try:
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        # Same rounding as diff_parameter_cells, so float noise does not hide a cell
+        keys = {(model, round(temp, 6), round(top_p, 6)) for model, temp, top_p in cells}
+        result = await session.execute(
+            select(LLMResponse).where(LLMResponse.experiment_id == experiment_uuid, LLMResponse.success.is_(False))
+        )
+        stale = [
+            r.id for r in result.scalars().all()
+            if (r.model, round(r.temperature, 6), round(r.top_p, 6)) in keys
+        ]
+        if stale:
+            await session.execute(delete(ResponseMetric).where(ResponseMetric.response_id.in_(stale)))
+            await session.execute(delete(LLMResponse).where(LLMResponse.id.in_(stale)))
+        logger.info(f"Deleted {len(stale)} failed responses for experiment id: {experiment_id}")
+        return len(stale)
+
+    except Exception as e:
+        logger.error(f"Error deleting failed responses for experiment id: {experiment_id}, error: {e}")
+        await session.rollback()
+        raise
+
+@traced("db.append_responses")
+async def append_responses(
+    session: AsyncSession, experiment_id: str, responses: List[Dict[str, Any]]
+) -> List[LLMResponse]:
+    """
+    Insert a batch of responses for an experiment in one commit, without reloading
+    them. Used to persist long-running experiments incrementally.
+    """
+    try:
+        logger.info(f"Appending {len(responses)} LLM responses for experiment id: {experiment_id}")
+        # Convert string to UUID if needed
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        created = [
+            LLMResponse(
+                id=uuid.uuid4(),
+                experiment_id=experiment_uuid,
+                provider=r.get("provider", ""),
+                model=r.get("model", ""),
+                temperature=float(r.get("temperature", 0.0)),
+                top_p=float(r.get("top_p", 0.0)),
+                response_text=r.get("response", ""),
+                tokens_used=int(r.get("tokens_used") or 0),
+                execution_time=float(r.get("execution_time", 0.0)),
+                success=bool(r.get("success", True)),
+                error=r.get("error"),
+                prompt_index=r.get("prompt_index"),
+                cell_id=r.get("cell_id"),
+                sample_index=r.get("sample_index"),
+                connect_time=r.get("connect_time"),
+                tls_time=r.get("tls_time"),
+                first_byte_time=r.get("first_byte_time"),
+                transfer_time=r.get("transfer_time"),
+            )
+            for r in responses
+        ]
+        session.add_all(created)
+        with DB_WRITE_DURATION.labels("responses").time():
+            await session.commit()
+
+        return created
+
+    except Exception as e:
+        logger.error(f"Error appending LLM responses for experiment id: {experiment_id}, error: {e}")
+        await session.rollback()
+        raise
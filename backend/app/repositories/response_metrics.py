@@ -0,0 +1,105 @@
+import uuid
+from typing import List, Dict, Any
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select, func
+from ..core.logger import Logger
+from ..core.prometheus import DB_WRITE_DURATION
+from ..core.tracing import traced
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.llm_response import LLMResponse
+from app.models.response_metrics import ResponseMetric
+
+logger = Logger(__name__)
+
+@traced("db.get_metrics_by_experiment")
+async def get_metrics_by_experiment(session: AsyncSession, experiment_id: str) -> List[ResponseMetric]:
+    """Return all stored metric rows for a given experiment id."""
+    try:
+        logger.info(f"Getting response metrics with experiment id: {experiment_id}")
+        # Convert string to UUID if needed
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        result = await session.execute(
+            select(ResponseMetric).where(ResponseMetric.experiment_id == experiment_uuid)
+        )
+        logger.info(f"Successfully got response metrics with experiment id: {experiment_id}")
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"Error getting response metrics with experiment id: {experiment_id}, error: {e}")
+        raise
+
+
+@traced("db.save_response_metrics")
+async def save_response_metrics(
+    session: AsyncSession, experiment_id: str, metrics: List[Dict[str, Any]]
+) -> int:
+    """
+    Insert metric rows ({response_id, metric, value}) in a single transaction.
+    
+    Rows whose (response_id, metric) is already stored are skipped, so concurrent
+    materializations of the same experiment cannot store a metric twice.
+    
+    Returns:
+        Number of rows inserted
+    """
+    try:
+        logger.info(f"Saving {len(metrics)} response metrics for experiment id: {experiment_id}")
+
+        # Convert string to UUID if needed
+        if isinstance(experiment_id, str):
+            experiment_uuid = uuid.UUID(experiment_id)
+        else:
+            experiment_uuid = experiment_id
+
+        if not metrics:
+            return 0
+
+        # Core insert on the table (not the ORM bulk path) so the result reports the rows inserted
+        statement = insert(ResponseMetric.__table__).on_conflict_do_nothing(index_elements=["response_id", "metric"])
+        rows = [
+            {
+                "experiment_id": experiment_uuid,
+                "response_id": m["response_id"],
+                "metric": m["metric"],
+                "value": float(m["value"]),
+            }
+            for m in metrics
+        ]
+
+        with DB_WRITE_DURATION.labels("response_metrics").time():
+            result = await session.execute(statement, rows)
+            await session.commit()
+
+        inserted = result.rowcount
+        logger.info(f"Successfully saved {inserted} of {len(metrics)} response metrics for experiment id: {experiment_id}")
+        return inserted
+
+    except Exception as e:
+        logger.error(f"Error saving response metrics for experiment id: {experiment_id}, error: {e}")
+        await session.rollback()
+        raise
+
+
+@traced("db.get_experiment_ids_missing_metrics")
+async def get_experiment_ids_missing_metrics(session: AsyncSession, metric_keys: List[str]) -> List[uuid.UUID]:
+    """Return ids of experiments that have at least one response missing any of `metric_keys`."""
+    try:
+        logger.info("Getting experiments with responses missing metrics")
+        incomplete = (
+            select(LLMResponse.experiment_id)
+            .outerjoin(
+                ResponseMetric,
+                (ResponseMetric.response_id == LLMResponse.id) & ResponseMetric.metric.in_(metric_keys),
+            )
+            .group_by(LLMResponse.id, LLMResponse.experiment_id)
+            .having(func.count(ResponseMetric.id) < len(metric_keys))
+            .subquery()
+        )
+        result = await session.execute(select(incomplete.c.experiment_id).distinct())
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"Error getting experiments missing metrics, error: {e}")
+        raise
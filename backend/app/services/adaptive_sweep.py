@@ -0,0 +1,256 @@
+"""
+Adaptive (temperature, top_p) search.
+
+A full sweep evaluates every cell of the temperatures x top_ps grid. The strategies
+here explore the same grid in rounds against an objective score instead, so the
+best region is found with a fraction of the provider calls:
+
+- successive_halving: evaluate a coarse sub-grid, keep the best 1/eta cells, evaluate
+  the unexplored neighbours of the survivors with a shrinking radius, and repeat.
+  Weak regions are never refined.
+- bayesian: fit a Gaussian process (RBF kernel, NumPy) to the scores seen so far and
+  evaluate the cells with the highest upper confidence bound, one batch per round.
+
+Strategies only decide *which* cells to evaluate; the caller supplies an async
+`evaluate(cells) -> scores` callback (higher is better, NaN for failed cells) that
+runs the provider calls, so every evaluated cell is stored like a normal sweep.
+"""
+import math
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from ..core.logger import Logger
+
+# NumPy is imported where it is used, so loading the sweep strategies (on every API
+# start) does not load it
+if TYPE_CHECKING:
+    import numpy as np
+
+
+logger = Logger(__name__)
+
+# Experiment artifact kind under which the search report is stored
+SWEEP_ARTIFACT = "adaptive_sweep"
+
+Cell = Tuple[float, float]
+Evaluator = Callable[[List[Cell]], Awaitable[List[float]]]
+
+# Coarse sub-grid evaluated in the first round (points per axis)
+INITIAL_POINTS_PER_AXIS = 3
+# Gaussian process settings (coordinates are normalized to [0, 1])
+GP_LENGTH_SCALE = 0.3
+GP_NOISE = 1e-2
+UCB_BETA = 2.0
+
+
+def _spread(n: int, k: int) -> "np.ndarray":
+    """k evenly spread indices in range(n), always including both ends."""
+    import numpy as np
+    return np.unique(np.round(np.linspace(0, n - 1, min(n, k))).astype(int))
+
+
+class AdaptiveSweep(ABC):
+    """
+    Base class: holds the candidate grid, the call budget and every evaluated cell.
+
+    Parameters:
+    - temperatures / top_ps: the sweep axes (candidate cells are their product)
+    - budget: max number of cells to evaluate
+    - batch_size: cells evaluated per round (where the strategy does not decide)
+    """
+
+    name = "adaptive"
+
+    def __init__(self, temperatures: Sequence[float], top_ps: Sequence[float], budget: int, batch_size: int = 4):
+        self.temperatures = sorted(set(float(t) for t in temperatures))
+        self.top_ps = sorted(set(float(p) for p in top_ps))
+        self.shape = (len(self.temperatures), len(self.top_ps))
+        self.budget = max(1, min(budget, self.shape[0] * self.shape[1]))
+        self.batch_size = max(1, batch_size)
+        # (row, col) -> score, in evaluation order
+        self.scores: Dict[Tuple[int, int], float] = {}
+        self.rounds: List[Dict[str, Any]] = []
+
+    @property
+    def remaining(self) -> int:
+        return self.budget - len(self.scores)
+
+    def cell(self, index: Tuple[int, int]) -> Cell:
+        return self.temperatures[index[0]], self.top_ps[index[1]]
+
+    def initial_indices(self) -> List[Tuple[int, int]]:
+        """Coarse sub-grid spread over the whole space, trimmed to the budget."""
+        rows = _spread(self.shape[0], INITIAL_POINTS_PER_AXIS)
+        cols = _spread(self.shape[1], INITIAL_POINTS_PER_AXIS)
+        indices = [(int(r), int(c)) for r in rows for c in cols]
+        return indices[:self.budget]
+
+    def ranked(self) -> List[Tuple[int, int]]:
+        """Evaluated cells, best first; failed (NaN) cells last."""
+        return sorted(self.scores, key=lambda i: -self.scores[i] if not math.isnan(self.scores[i]) else math.inf)
+
+    async def _evaluate(self, indices: List[Tuple[int, int]], evaluate: Evaluator) -> None:
+        indices = [i for i in indices if i not in self.scores][:self.remaining]
+        if not indices:
+            return
+        scores = await evaluate([self.cell(i) for i in indices])
+        for index, score in zip(indices, scores):
+            self.scores[index] = float(score) if score is not None else math.nan
+        self.rounds.append({
+            "round": len(self.rounds),
+            "cells": [list(self.cell(i)) for i in indices],
+            "scores": [None if math.isnan(self.scores[i]) else round(self.scores[i], 4) for i in indices],
+        })
+        logger.info(
+            f"[adaptive-sweep] {self.name} round={len(self.rounds) - 1} evaluated={len(indices)} "
+            f"total={len(self.scores)}/{self.budget}"
+        )
+
+    @abstractmethod
+    async def search(self, evaluate: Evaluator) -> None:
+        """Evaluate cells round by round (through `_evaluate`) until the budget is spent."""
+        pass
+
+    async def run(self, evaluate: Evaluator) -> Dict[str, Any]:
+        """Run the search and return a report of every round and the best cell found."""
+        await self.search(evaluate)
+
+        best = next((i for i in self.ranked() if not math.isnan(self.scores[i])), None)
+        return {
+            "strategy": self.name,
+            "grid_size": self.shape[0] * self.shape[1],
+            "budget": self.budget,
+            "calls": len(self.scores),
+            "rounds": self.rounds,
+            "best": None if best is None else {
+                "temperature": self.cell(best)[0],
+                "top_p": self.cell(best)[1],
+                "score": round(self.scores[best], 4),
+            },
+        }
+
+
+class SuccessiveHalvingSweep(AdaptiveSweep):
+    """
+    Coarse-to-fine successive halving: each round keeps the best 1/eta of the cells
+    evaluated so far and evaluates the unexplored cells around them, halving the
+    neighbourhood radius until it reaches adjacent cells.
+    """
+
+    name = "successive_halving"
+
+    def __init__(self, temperatures: Sequence[float], top_ps: Sequence[float], budget: int, batch_size: int = 4, eta: int = 2):
+        super().__init__(temperatures, top_ps, budget, batch_size)
+        self.eta = max(2, eta)
+
+    def _neighbours(self, index: Tuple[int, int], radius: int) -> List[Tuple[int, int]]:
+        r0, c0 = index
+        return [
+            (r, c)
+            for r in range(max(0, r0 - radius), min(self.shape[0], r0 + radius + 1))
+            for c in range(max(0, c0 - radius), min(self.shape[1], c0 + radius + 1))
+            if (r, c) not in self.scores
+        ]
+
+    async def search(self, evaluate: Evaluator) -> None:
+        initial = self.initial_indices()
+        await self._evaluate(initial, evaluate)
+
+        # Start from half the coarse stride so the first refinement fills the gaps
+        stride = max(math.ceil(self.shape[0] / INITIAL_POINTS_PER_AXIS), math.ceil(self.shape[1] / INITIAL_POINTS_PER_AXIS))
+        radius = max(1, stride // 2)
+        keep = max(1, math.ceil(len(initial) / self.eta))
+
+        while self.remaining > 0:
+            survivors = [i for i in self.ranked() if not math.isnan(self.scores[i])][:keep]
+            # Closest neighbours of the best survivors first; each round spends at most
+            # as many calls as the initial round
+            candidates: Dict[Tuple[int, int], Tuple[int, int]] = {}
+            for rank, (r0, c0) in enumerate(survivors):
+                for neighbour in self._neighbours((r0, c0), radius):
+                    priority = (max(abs(neighbour[0] - r0), abs(neighbour[1] - c0)), rank)
+                    candidates[neighbour] = min(candidates.get(neighbour, priority), priority)
+            batch = sorted(candidates, key=candidates.get)[:max(self.batch_size, len(initial))]
+
+            if not batch:
+                if radius == 1:
+                    break
+                radius = max(1, radius // 2)
+                continue
+
+            await self._evaluate(batch, evaluate)
+            keep = max(1, keep // self.eta)
+            radius = max(1, radius // 2)
+
+
+class BayesianSweep(AdaptiveSweep):
+    """
+    Gaussian-process search: after the coarse initial round, each round evaluates the
+    `batch_size` cells with the highest upper confidence bound. Cells within a batch
+    are chosen greedily, treating earlier picks as observed at their predicted mean.
+    """
+
+    name = "bayesian"
+
+    def _coords(self, indices: Sequence[Tuple[int, int]]) -> "np.ndarray":
+        import numpy as np
+        scale = np.array([max(1, self.shape[0] - 1), max(1, self.shape[1] - 1)], dtype=np.float64)
+        return np.asarray(indices, dtype=np.float64).reshape(-1, 2) / scale
+
+    @staticmethod
+    def _kernel(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+        sq_dist = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * sq_dist / GP_LENGTH_SCALE ** 2)
+
+    def _posterior(self, observed: "np.ndarray", targets: "np.ndarray", candidates: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """GP posterior mean and standard deviation at the candidates (standardized targets)."""
+        import numpy as np
+        k = self._kernel(observed, observed) + GP_NOISE * np.eye(len(observed))
+        chol = np.linalg.cholesky(k)
+        k_star = self._kernel(observed, candidates)
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, targets))
+        v = np.linalg.solve(chol, k_star)
+        mean = k_star.T @ alpha
+        var = np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None)
+        return mean, np.sqrt(var)
+
+    def _next_batch(self) -> List[Tuple[int, int]]:
+        observed = [i for i in self.scores if not math.isnan(self.scores[i])]
+        candidates = [(r, c) for r in range(self.shape[0]) for c in range(self.shape[1]) if (r, c) not in self.scores]
+        if not candidates:
+            return []
+        if not observed:
+            return candidates[:min(self.batch_size, self.remaining)]
+
+        import numpy as np
+
+        values = np.array([self.scores[i] for i in observed], dtype=np.float64)
+        spread = values.std() or 1.0
+        targets = (values - values.mean()) / spread
+
+        batch: List[Tuple[int, int]] = []
+        points = self._coords(observed)
+        for _ in range(min(self.batch_size, self.remaining, len(candidates))):
+            remaining = [c for c in candidates if c not in batch]
+            mean, std = self._posterior(points, targets, self._coords(remaining))
+            pick = int(np.argmax(mean + UCB_BETA * std))
+            batch.append(remaining[pick])
+            # "Kriging believer": pretend the pick was observed at its mean so the next pick spreads out
+            points = np.vstack([points, self._coords([remaining[pick]])])
+            targets = np.append(targets, mean[pick])
+        return batch
+
+    async def search(self, evaluate: Evaluator) -> None:
+        await self._evaluate(self.initial_indices(), evaluate)
+        while self.remaining > 0:
+            batch = self._next_batch()
+            if not batch:
+                break
+            await self._evaluate(batch, evaluate)
+
+
+SWEEP_STRATEGIES = {
+    SuccessiveHalvingSweep.name: SuccessiveHalvingSweep,
+    BayesianSweep.name: BayesianSweep,
+}
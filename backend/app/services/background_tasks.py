@@ -3,14 +3,19 @@ Background task service for handling long-running LLM operations
 """
 import asyncio
 import uuid
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from app.db.session import AsyncSessionLocal
 from app.repositories.experiments import update_experiment_status, get_experiment_with_responses
 from app.services.llm_service import LLMService
-from app.validations.llm_requests import LLMRequest
+from app.validations.llm_requests import LLMRequest, DatasetExperimentRequest, ExtendExperimentRequest
 from app.consts import ExperimentStatus
 from app.core.logger import logger
+from app.core.profiling import profiler
+from app.core.prometheus import RUNNING_EXPERIMENTS
+from app.core.tracing import current_span, tracer
+from app.services.experiment_service import experiment_trace_id, save_experiment_trace
 
 
 class BackgroundTaskService:
@@ -44,9 +49,9 @@ class BackgroundTaskService:
             )
         
         # Create and store the background task
-        task = asyncio.create_task(
-            self._process_llm_experiment(experiment_id, request)
-        )
+        task = asyncio.create_task(self._traced(
+            experiment_id, "sweep", self._process_llm_experiment(experiment_id, request)
+        ))
         self.running_tasks[experiment_id] = task
         
         logger.info(f"Started background LLM experiment: {experiment_id}")
@@ -67,8 +72,12 @@ class BackgroundTaskService:
         try:
             logger.info(f"Processing LLM experiment: {experiment_id}")
             
-            # Process the LLM request
-            result = await self.llm_service.process_llm_request(experiment_id, request)
+            async with self._profiled(experiment_id, request):
+                # Process the LLM request
+                result = await self.llm_service.process_llm_request(experiment_id, request)
+                
+                # Materialize quality metrics for the persisted responses
+                await self._materialize_metrics(experiment_id)
             
             # Update experiment status to completed in database
             async with AsyncSessionLocal() as session:
@@ -82,6 +91,7 @@ class BackgroundTaskService:
             
         except Exception as e:
             logger.error(f"Failed LLM experiment {experiment_id}: {str(e)}")
+            current_span().record_exception(e)
             
             # Update experiment status to failed in database
             async with AsyncSessionLocal() as session:
@@ -97,6 +107,226 @@ class BackgroundTaskService:
             if experiment_id in self.running_tasks:
                 del self.running_tasks[experiment_id]
     
+    async def start_dataset_experiment(
+        self, 
+        experiment_id: str, 
+        request: DatasetExperimentRequest
+    ) -> str:
+        """
+        Start a background dataset experiment
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: dataset experiment request to process
+            
+        Returns:
+            Experiment ID
+        """
+        async with AsyncSessionLocal() as session:
+            await update_experiment_status(
+                session, 
+                experiment_id, 
+                ExperimentStatus.RUNNING
+            )
+        
+        task = asyncio.create_task(self._traced(
+            experiment_id, "dataset", self._process_dataset_experiment(experiment_id, request)
+        ))
+        self.running_tasks[experiment_id] = task
+        
+        logger.info(f"Started background dataset experiment: {experiment_id}")
+        return experiment_id
+    
+    async def _process_dataset_experiment(
+        self, 
+        experiment_id: str, 
+        request: DatasetExperimentRequest
+    ) -> None:
+        """
+        Process dataset experiment in background
+        
+        Responses and their metrics are persisted incrementally while the experiment
+        runs, so there is no separate metrics stage; heatmaps are built on first read.
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: dataset experiment request to process
+        """
+        try:
+            logger.info(f"Processing dataset experiment: {experiment_id}")
+            
+            await self.llm_service.process_dataset_experiment(experiment_id, request)
+            
+            async with AsyncSessionLocal() as session:
+                await update_experiment_status(
+                    session, 
+                    experiment_id, 
+                    ExperimentStatus.COMPLETED
+                )
+            
+            logger.info(f"Completed dataset experiment: {experiment_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed dataset experiment {experiment_id}: {str(e)}")
+            current_span().record_exception(e)
+            
+            async with AsyncSessionLocal() as session:
+                await update_experiment_status(
+                    session, 
+                    experiment_id, 
+                    ExperimentStatus.FAILED,
+                    error_message=str(e)
+                )
+            
+        finally:
+            if experiment_id in self.running_tasks:
+                del self.running_tasks[experiment_id]
+    
+    async def start_experiment_extension(
+        self, 
+        experiment_id: str, 
+        request: ExtendExperimentRequest,
+        prompt: str,
+        cells: List[Tuple[str, float, float]]
+    ) -> str:
+        """
+        Start running the missing cells of an existing experiment in the background
+        
+        The caller must already have claimed the experiment (moved it to running).
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: extension request
+            prompt: the experiment's original prompt
+            cells: missing (model, temperature, top_p) cells
+            
+        Returns:
+            Experiment ID
+        """
+        task = asyncio.create_task(self._traced(
+            experiment_id, "extension", self._process_experiment_extension(experiment_id, request, prompt, cells)
+        ))
+        self.running_tasks[experiment_id] = task
+        
+        logger.info(f"Started background extension of experiment: {experiment_id} ({len(cells)} new cells)")
+        return experiment_id
+    
+    async def _process_experiment_extension(
+        self, 
+        experiment_id: str, 
+        request: ExtendExperimentRequest,
+        prompt: str,
+        cells: List[Tuple[str, float, float]]
+    ) -> None:
+        """
+        Process an experiment extension in background
+        
+        The experiment's earlier responses are untouched, so a failed extension
+        returns the experiment to completed with the error recorded.
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: extension request
+            prompt: the experiment's original prompt
+            cells: missing (model, temperature, top_p) cells
+        """
+        try:
+            logger.info(f"Processing extension of experiment: {experiment_id}")
+            
+            await self.llm_service.process_experiment_extension(experiment_id, request, prompt, cells)
+            
+            # Metrics are only computed for the new responses; heatmaps are rebuilt
+            await self._materialize_metrics(experiment_id)
+            
+            async with AsyncSessionLocal() as session:
+                await update_experiment_status(
+                    session, 
+                    experiment_id, 
+                    ExperimentStatus.COMPLETED
+                )
+            
+            logger.info(f"Completed extension of experiment: {experiment_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed extension of experiment {experiment_id}: {str(e)}")
+            current_span().record_exception(e)
+            
+            async with AsyncSessionLocal() as session:
+                await update_experiment_status(
+                    session, 
+                    experiment_id, 
+                    ExperimentStatus.COMPLETED,
+                    error_message=f"Extension failed: {str(e)}"
+                )
+            
+        finally:
+            # The experiment is completed again before this runs, so a newer extension
+            # may already be registered under the same id; only remove our own task
+            if self.running_tasks.get(experiment_id) is asyncio.current_task():
+                del self.running_tasks[experiment_id]
+    
+    async def _traced(self, experiment_id: str, kind: str, processing) -> None:
+        """
+        Run an experiment's processing coroutine as the root span of the experiment's
+        trace, then persist the finished spans for the trace endpoint
+        
+        Args:
+            experiment_id: ID of the experiment
+            kind: what is being processed (sweep, dataset, extension)
+            processing: the processing coroutine
+        """
+        try:
+            with tracer.start_trace(
+                "experiment",
+                trace_id=experiment_trace_id(experiment_id),
+                attributes={"experiment.id": str(experiment_id), "experiment.kind": kind},
+            ):
+                await processing
+        finally:
+            await save_experiment_trace(experiment_id)
+    
+    @asynccontextmanager
+    async def _profiled(self, experiment_id: str, request: LLMRequest):
+        """
+        Profile the enclosed experiment processing if the request asks for it
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: LLM request being processed
+        """
+        if request.profile is None:
+            yield
+            return
+        async with profiler.profile(
+            f"experiment {experiment_id}", request.profile, target=f"experiment:{experiment_id}"
+        ) as profile_id:
+            if profile_id is not None:
+                current_span().set_attribute("profile.id", profile_id)
+            yield
+    
+    async def _materialize_metrics(self, experiment_id: str) -> None:
+        """
+        Pipeline stage: compute and store quality metrics for an experiment's responses,
+        then cache the metric heatmaps built from them.
+        
+        Failures are logged but never fail the experiment; the metrics endpoints
+        materialize anything missing on first read.
+        
+        Args:
+            experiment_id: ID of the experiment
+        """
+        try:
+            # Imported on first use: the metrics stack pulls in NumPy, NLTK and Pyphen
+            from app.services.metrics import materialize_experiment_metrics, materialize_experiment_heatmaps
+            
+            with tracer.start_span("materialize_metrics"):
+                created = await materialize_experiment_metrics(experiment_id)
+            logger.info(f"Materialized {created} metrics for experiment: {experiment_id}")
+            with tracer.start_span("materialize_heatmaps"):
+                await materialize_experiment_heatmaps(experiment_id)
+        except Exception as e:
+            logger.error(f"Failed to materialize metrics for experiment {experiment_id}: {str(e)}")
+    
     async def cancel_experiment(self, experiment_id: str) -> bool:
         """
         Cancel a running experiment
@@ -165,3 +395,4 @@ class BackgroundTaskService:
 
 # Global background task service instance
 background_task_service = BackgroundTaskService()
+RUNNING_EXPERIMENTS.set_function(lambda: len(background_task_service.running_tasks))
@@ -1,13 +1,20 @@
 import sys
 import asyncio
 import time
-from typing import Iterable, Callable, Any, List, Optional
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Iterable, Callable, Any, List, Optional, Tuple
 
+from ..config import Config
 from ..core.logger import Logger
+from ..core.prometheus import QUEUE_WAIT
+from ..core.tracing import tracer
 
 
 logger = Logger(__name__)
 
+# Attempt number (0 for the first call) of the job running in the current task
+current_attempt: ContextVar[int] = ContextVar("current_attempt", default=0)
+
 
 class ConcurrencyRunner:
     """
@@ -32,6 +39,8 @@ class ConcurrencyRunner:
     - Falls back to asyncio.wait(..., FIRST_EXCEPTION) on older Pythons.
     - Returns a list of results aligned with the input ordering.
     - On first un-retriable exception, cancels remaining tasks and re-raises the exception.
+    - `stream` is the lazy variant for very large inputs: items are pulled from the
+      iterable only as slots free up and results are yielded as they complete.
     """
 
     def __init__(
@@ -62,27 +71,31 @@ class ConcurrencyRunner:
         start_ts = time.time()
         while True:
             try:
-                self.logger.debug(f"[runner] start idx={idx} attempt={attempt} item={item}")
-                result = await worker_coro_factory(item)
+                self.logger.debug("[runner] start idx=%d attempt=%d item=%r", idx, attempt, item, sample_every=Config.LOG_SAMPLE_EVERY)
+                current_attempt.set(attempt)
+                with tracer.start_span("runner.attempt", {"runner.idx": idx, "runner.attempt": attempt}):
+                    result = await worker_coro_factory(item)
                 elapsed = time.time() - start_ts
-                self.logger.info(f"[runner] succeeded idx={idx} attempts={attempt+1} elapsed={elapsed:.2f}s")
+                self.logger.info(
+                    "[runner] succeeded idx=%d attempts=%d elapsed=%.2fs", idx, attempt + 1, elapsed,
+                    sample_every=Config.LOG_SAMPLE_EVERY
+                )
                 return result
             except asyncio.CancelledError:
                 # Propagate cancellations immediately so fail-fast works
-                self.logger.debug(f"[runner] cancelled idx={idx}")
+                self.logger.debug("[runner] cancelled idx=%d", idx)
                 raise
             except Exception as exc:
                 attempt += 1
-                self.logger.warning(
-                    f"[runner] error idx={idx} attempt={attempt} error={str(exc)}"
-                )
+                self.logger.warning("[runner] error idx=%d attempt=%d error=%s", idx, attempt, exc)
                 if attempt > self.retries:
-                    self.logger.error(f"[runner] giving up idx={idx} after {attempt} attempts")
+                    self.logger.error("[runner] giving up idx=%d after %d attempts", idx, attempt)
                     raise
                 # backoff before next attempt
                 sleep_for = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
-                self.logger.info(f"[runner] retrying idx={idx} in {sleep_for:.2f}s (attempt {attempt+1})")
-                await asyncio.sleep(sleep_for)
+                self.logger.info("[runner] retrying idx=%d in %.2fs (attempt %d)", idx, sleep_for, attempt + 1)
+                with tracer.start_span("runner.backoff", {"runner.idx": idx, "runner.sleep_seconds": sleep_for}):
+                    await asyncio.sleep(sleep_for)
 
     async def run(self, items: Iterable[Any], worker_coro_factory: Callable[[Any], Any]) -> List[Any]:
         items_list = list(items)
@@ -92,10 +105,16 @@ class ConcurrencyRunner:
 
         async def _worker_write(idx: int, item: Any):
             # each worker acquires the semaphore so at most `concurrency` run concurrently
-            async with sem:
+            queued_at = time.perf_counter()
+            with tracer.start_span("runner.queue", {"runner.idx": idx}):
+                await sem.acquire()
+            try:
+                QUEUE_WAIT.labels("runner").observe(time.perf_counter() - queued_at)
                 # call worker with retries
                 res = await self._call_with_retries(idx, item, worker_coro_factory)
                 results[idx] = res
+            finally:
+                sem.release()
 
         self.logger.info(
             f"[runner] starting run: items={n} concurrency={self.concurrency} retries={self.retries}"
@@ -133,3 +152,51 @@ class ConcurrencyRunner:
                 if not t.done():
                     t.cancel()
             await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream(
+        self, items: Iterable[Any], worker_coro_factory: Callable[[Any], Any]
+    ) -> AsyncIterator[Tuple[int, Any, Any]]:
+        """Run jobs from a (possibly lazy, unbounded) iterable with bounded memory.
+
+        At most `concurrency` items are pulled from `items` and in flight at any time;
+        results are yielded as (idx, item, result) in completion order. Unlike `run`,
+        a job that still fails after retries does not cancel the others: its exception
+        is yielded as the result.
+        """
+        iterator = iter(items)
+        pending: Dict[asyncio.Task, Tuple[int, Any]] = {}
+        next_idx = 0
+        exhausted = False
+
+        self.logger.info(
+            f"[runner] starting stream: concurrency={self.concurrency} retries={self.retries}"
+        )
+
+        try:
+            while True:
+                # top up the in-flight window from the iterator
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.create_task(self._call_with_retries(next_idx, item, worker_coro_factory))
+                    pending[task] = (next_idx, item)
+                    next_idx += 1
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    idx, item = pending.pop(task)
+                    exc = task.exception()
+                    yield idx, item, exc if exc is not None else task.result()
+
+            self.logger.info(f"[runner] completed stream: items={next_idx}")
+        finally:
+            # ensure no background tasks remain (e.g. the consumer stopped early or was cancelled)
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
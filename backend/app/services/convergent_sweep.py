@@ -0,0 +1,162 @@
+"""
+Convergence-aware grid sweeps.
+
+Cells of the temperatures x top_ps grid are scheduled coarse-to-fine: the four grid
+corners first, then the midpoints that split each region into quadrants, and so on.
+A region whose corner outputs are all within the similarity threshold of each other
+(TF-IDF cosine, see `similarity.compute_similarity`) is considered converged and its
+remaining interior cells are skipped instead of called. Regions that disagree keep
+being refined down to adjacent cells, so every cell is either evaluated or covered
+by a converged region.
+"""
+import itertools
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from ..core.logger import Logger
+
+
+logger = Logger(__name__)
+
+# Experiment artifact kind under which skipped cells are stored
+SKIPPED_CELLS_ARTIFACT = "skipped_cells"
+
+Cell = Tuple[float, float]
+Index = Tuple[int, int]
+# (first row, last row, first column, last column), inclusive
+Region = Tuple[int, int, int, int]
+Evaluator = Callable[[List[Cell]], Awaitable[List[Dict[str, Any]]]]
+SimilarityFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def _split(start: int, stop: int) -> List[Tuple[int, int]]:
+    if stop - start <= 1:
+        return [(start, stop)]
+    middle = (start + stop) // 2
+    return [(start, middle), (middle, stop)]
+
+
+class ConvergentSweep:
+    """
+    Coarse-to-fine sweep over a temperature x top_p grid with early stopping.
+
+    Usage example:
+        sweep = ConvergentSweep(temperatures, top_ps, threshold=0.9)
+        results = await sweep.run(evaluate, similarity)
+
+    Parameters:
+    - temperatures / top_ps: the sweep axes
+    - threshold: minimum pairwise similarity between a region's corner outputs for
+      the region to count as converged
+
+    `evaluate(cells)` runs one batch of provider calls and returns a result dict per
+    cell; `similarity(texts)` returns the N x N similarity matrix of the given texts.
+    """
+
+    def __init__(self, temperatures: Sequence[float], top_ps: Sequence[float], threshold: float):
+        self.temperatures = sorted(set(temperatures))
+        self.top_ps = sorted(set(top_ps))
+        self.threshold = threshold
+        self.results: Dict[Index, Dict[str, Any]] = {}
+        # Converged regions and the smallest corner similarity that let them stop
+        self.converged: List[Tuple[Region, float]] = []
+        self.levels = 0
+
+    def cell(self, index: Index) -> Cell:
+        return self.temperatures[index[0]], self.top_ps[index[1]]
+
+    @staticmethod
+    def _corners(region: Region) -> List[Index]:
+        r0, r1, c0, c1 = region
+        return list(dict.fromkeys([(r0, c0), (r0, c1), (r1, c0), (r1, c1)]))
+
+    @staticmethod
+    def _has_interior(region: Region) -> bool:
+        r0, r1, c0, c1 = region
+        return r1 - r0 > 1 or c1 - c0 > 1
+
+    def _corner_similarity(self, region: Region, matrix: List[List[float]], position: Dict[Index, int]) -> float:
+        """Smallest pairwise similarity among the region's corners (0 if any corner failed)."""
+        corners = self._corners(region)
+        if any(not self.results[i].get("success") for i in corners):
+            return 0.0
+        return min(
+            (matrix[position[a]][position[b]] for a, b in itertools.combinations(corners, 2)),
+            default=1.0,
+        )
+
+    async def run(self, evaluate: Evaluator, similarity: SimilarityFn) -> List[Dict[str, Any]]:
+        """
+        Run the sweep and return one result per grid cell in temperature-major order.
+        Skipped cells are returned with `skipped=True` and the evaluated cell they
+        converged with.
+        """
+        regions: List[Region] = [(0, len(self.temperatures) - 1, 0, len(self.top_ps) - 1)]
+
+        while regions:
+            # Evaluate every corner the current level needs, in one batch
+            needed = [i for i in dict.fromkeys(itertools.chain.from_iterable(map(self._corners, regions)))
+                      if i not in self.results]
+            if needed:
+                batch = await evaluate([self.cell(i) for i in needed])
+                self.results.update(zip(needed, batch))
+            self.levels += 1
+
+            refinable = [region for region in regions if self._has_interior(region)]
+            if not refinable:
+                break
+
+            # Pairwise similarity of every successful output so far
+            evaluated = [i for i, r in self.results.items() if r.get("success")]
+            position = {index: n for n, index in enumerate(evaluated)}
+            matrix = await similarity([self.results[i].get("response") or "" for i in evaluated]) if len(evaluated) > 1 else [[1.0]]
+
+            regions = []
+            for region in refinable:
+                score = self._corner_similarity(region, matrix, position)
+                if score >= self.threshold:
+                    self.converged.append((region, score))
+                    continue
+                r0, r1, c0, c1 = region
+                regions.extend(
+                    (rows[0], rows[1], cols[0], cols[1])
+                    for rows in _split(r0, r1) for cols in _split(c0, c1)
+                )
+
+        skipped = 0
+        results: List[Dict[str, Any]] = []
+        for index in itertools.product(range(len(self.temperatures)), range(len(self.top_ps))):
+            if index in self.results:
+                results.append(self.results[index])
+            else:
+                results.append(self._skipped_result(index))
+                skipped += 1
+
+        logger.info(
+            f"[convergent-sweep] evaluated={len(self.results)} skipped={skipped} levels={self.levels} "
+            f"converged_regions={len(self.converged)}"
+        )
+        return results
+
+    def _skipped_result(self, index: Index) -> Dict[str, Any]:
+        """Result for a skipped cell, pointing at the nearest evaluated corner of its converged region."""
+        region, score = next(
+            (region, score) for region, score in self.converged
+            if region[0] <= index[0] <= region[1] and region[2] <= index[1] <= region[3]
+        )
+        nearest = min(self._corners(region), key=lambda c: (abs(c[0] - index[0]) + abs(c[1] - index[1]), c))
+        source = self.results[nearest]
+        temperature, top_p = self.cell(index)
+        return {
+            'provider': source.get('provider'),
+            'model': source.get('model'),
+            'temperature': temperature,
+            'top_p': top_p,
+            'response': '',
+            'tokens_used': 0,
+            'execution_time': 0,
+            'success': False,
+            'skipped': True,
+            'converged_with': {'temperature': self.cell(nearest)[0], 'top_p': self.cell(nearest)[1]},
+            'similarity': round(float(score), 4),
+            'error': None,
+        }
@@ -0,0 +1,177 @@
+"""
+JSONL prompt datasets for dataset-scale experiments.
+
+A dataset is a JSONL file with one object per line, each with a "prompt" string (other
+fields are ignored). Uploads are streamed straight to disk under `Config.DATASETS_DIR`
+and every read goes through generators, so neither uploading nor running a dataset
+ever holds the whole file in memory.
+
+File writes and the validation pass run in a worker thread, off the event loop. The
+prompt count found at upload is stored beside the dataset in `<id>.meta.json`, so
+starting an experiment does not parse the file again.
+"""
+import asyncio
+import itertools
+import json
+import os
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from ..config import Config
+from ..core.logger import Logger
+
+
+logger = Logger(__name__)
+
+# Same per-prompt limit as a single-prompt LLMRequest
+MAX_PROMPT_LENGTH = 10000
+
+# (prompt_index, prompt, model, temperature, top_p)
+DatasetCell = Tuple[int, str, str, float, float]
+
+
+class DatasetError(ValueError):
+    """Raised when a dataset is missing or malformed."""
+    pass
+
+
+def validate_dataset_id(dataset_id: str) -> str:
+    """Normalized dataset id; dataset ids are UUIDs, which also rules out path traversal."""
+    try:
+        return str(uuid.UUID(str(dataset_id)))
+    except ValueError:
+        raise DatasetError(f"Invalid dataset id {dataset_id!r}: expected the dataset_id returned by POST /datasets/")
+
+
+def dataset_path(dataset_id: str) -> str:
+    return os.path.join(Config.DATASETS_DIR, f"{validate_dataset_id(dataset_id)}.jsonl")
+
+
+def _meta_path(dataset_id: str) -> str:
+    return os.path.join(Config.DATASETS_DIR, f"{validate_dataset_id(dataset_id)}.meta.json")
+
+
+def _write_meta(dataset_id: str, meta: Dict[str, Any]) -> None:
+    tmp_path = f"{_meta_path(dataset_id)}.part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, _meta_path(dataset_id))
+
+
+def _read_meta(dataset_id: str) -> Optional[Dict[str, Any]]:
+    """The dataset's stored meta, or None if it has none yet."""
+    if not os.path.exists(dataset_path(dataset_id)):
+        raise DatasetError(f"Dataset not found: {dataset_id}")
+    try:
+        with open(_meta_path(dataset_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _parse_line(line: str, line_number: int) -> str:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise DatasetError(f"Line {line_number}: invalid JSON ({e.msg})")
+    prompt = record.get("prompt") if isinstance(record, dict) else None
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise DatasetError(f"Line {line_number}: expected an object with a non-empty \"prompt\" string")
+    if len(prompt) > MAX_PROMPT_LENGTH:
+        raise DatasetError(f"Line {line_number}: prompt longer than {MAX_PROMPT_LENGTH} characters")
+    return prompt
+
+
+def iter_prompts(dataset_id: str) -> Iterator[Tuple[int, str]]:
+    """Yield (prompt_index, prompt) for every prompt in a dataset, reading one line at a time."""
+    path = dataset_path(dataset_id)
+    if not os.path.exists(path):
+        raise DatasetError(f"Dataset not found: {dataset_id}")
+
+    index = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            yield index, _parse_line(line, line_number)
+            index += 1
+
+
+def iter_dataset_cells(
+    dataset_id: str, models: Sequence[str], temperatures: Sequence[float], top_ps: Sequence[float]
+) -> Iterator[DatasetCell]:
+    """
+    Lazily yield every (prompt, model, temperature, top_p) cell of a dataset experiment,
+    prompt-major. Only the current prompt is held in memory.
+    """
+    parameters = list(itertools.product(models, temperatures, top_ps))
+    for prompt_index, prompt in iter_prompts(dataset_id):
+        for model, temperature, top_p in parameters:
+            yield prompt_index, prompt, model, temperature, top_p
+
+
+async def save_dataset(chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+    """
+    Stream an uploaded JSONL body to disk, then validate it line by line.
+
+    Returns:
+        {dataset_id, prompts, size_bytes}
+
+    Raises:
+        DatasetError if the file is empty or any line is malformed (nothing is kept)
+    """
+    os.makedirs(Config.DATASETS_DIR, exist_ok=True)
+    dataset_id = str(uuid.uuid4())
+    path = dataset_path(dataset_id)
+    tmp_path = f"{path}.part"
+
+    size = 0
+    try:
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > Config.DATASET_MAX_BYTES:
+                    raise DatasetError(f"Dataset larger than {Config.DATASET_MAX_BYTES} bytes")
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        os.replace(tmp_path, path)
+
+        prompts = await asyncio.to_thread(count_prompts, dataset_id)
+        if prompts == 0:
+            raise DatasetError("Dataset contains no prompts")
+        await asyncio.to_thread(_write_meta, dataset_id, {"prompts": prompts, "size_bytes": size})
+    except Exception:
+        for leftover in (tmp_path, path, _meta_path(dataset_id)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+    logger.info(f"Saved dataset {dataset_id}: {prompts} prompts, {size} bytes")
+    return {"dataset_id": dataset_id, "prompts": prompts, "size_bytes": size}
+
+
+def count_prompts(dataset_id: str) -> int:
+    """Number of prompts in a dataset (one streaming pass)."""
+    return sum(1 for _ in iter_prompts(dataset_id))
+
+
+async def get_prompt_count(dataset_id: str) -> int:
+    """
+    Number of prompts in a dataset, as stored at upload
+
+    Datasets uploaded before the count was stored are counted once (in a worker
+    thread) and their count is stored then.
+
+    Raises:
+        DatasetError if the id is invalid or the dataset does not exist
+    """
+    meta = await asyncio.to_thread(_read_meta, dataset_id)
+    if meta is not None:
+        return meta["prompts"]
+    prompts = await asyncio.to_thread(count_prompts, dataset_id)
+    size = await asyncio.to_thread(os.path.getsize, dataset_path(dataset_id))
+    await asyncio.to_thread(_write_meta, dataset_id, {"prompts": prompts, "size_bytes": size})
+    return prompts
+
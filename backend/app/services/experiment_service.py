@@ -1,11 +1,22 @@
-from app.validations.llm_requests import ExperimentResponse
-from app.repositories.experiments import get_experiment_by_id, get_all_experiments, get_experiment_with_responses
+import json
+import uuid
+from app.validations.llm_requests import ExperimentResponse, ExtendExperimentRequest
+from app.repositories.experiments import get_experiment_by_id, get_all_experiments, get_experiment_with_responses, update_experiment_status
 from app.repositories.llm_response import get_responses_by_experiment
+from app.repositories.experiment_artifacts import get_artifact, save_artifact
+from app.services.adaptive_sweep import SWEEP_ARTIFACT
+from app.utils.parameter_calculator import diff_parameter_cells
+from app.consts import ExperimentStatus
 from app.db.session import AsyncSessionLocal
 from ..core.logger import Logger
+from ..core.prometheus import CACHE_HITS, CACHE_MISSES
+from ..core.tracing import tracer, build_timeline
 
 logger = Logger(__name__)
 
+# Experiment artifact kind under which finished trace spans are stored
+TRACE_ARTIFACT = "trace"
+
 async def fetch_experiment(experiment_id: str) -> ExperimentResponse:
     """
     Retrieve an experiment and its associated LLM results by experiment_id and
@@ -111,4 +122,150 @@ async def get_experiment_status(experiment_id: str) -> dict:
             return await get_experiment_with_responses(session, experiment_id)
     except Exception as e:
         logger.error(f"Error getting experiment status {experiment_id}: {e}")
-        raise
\ No newline at end of file
+        raise
+async def get_experiment_sweep(experiment_id: str) -> dict:
+    """
+    Get the adaptive sweep report of an experiment (rounds, evaluated cells and scores,
+    best cell found)
+    
+    Args:
+        experiment_id: ID of the experiment
+        
+    Returns:
+        Sweep report, or None if the experiment did not run an adaptive sweep
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            artifact = await get_artifact(session, experiment_id, SWEEP_ARTIFACT)
+        return json.loads(artifact.payload) if artifact else None
+    except Exception as e:
+        logger.error(f"Error getting experiment sweep {experiment_id}: {e}")
+        raise
+
+
+def experiment_trace_id(experiment_id: str) -> str:
+    """Trace id of an experiment: its UUID as 32 hex digits (both are 16 bytes)."""
+    return uuid.UUID(str(experiment_id)).hex
+
+async def _merged_trace(session, experiment_id: str) -> dict:
+    """Finished spans of an experiment: stored ones plus any still held in memory."""
+    live = tracer.get_trace(experiment_trace_id(experiment_id))
+    artifact = await get_artifact(session, experiment_id, TRACE_ARTIFACT)
+    stored = json.loads(artifact.payload) if artifact else {"spans": [], "dropped": 0}
+    spans = {span["span_id"]: span for span in stored["spans"]}
+    spans.update((span["span_id"], span) for span in live["spans"])
+    return {"spans": list(spans.values()), "dropped": max(stored["dropped"], live["dropped"])}
+
+async def save_experiment_trace(experiment_id: str) -> None:
+    """
+    Persist an experiment's finished spans so its trace outlives the in-memory store
+    
+    Args:
+        experiment_id: ID of the experiment
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            trace = await _merged_trace(session, experiment_id)
+            if trace["spans"]:
+                await save_artifact(session, experiment_id, TRACE_ARTIFACT, json.dumps(trace))
+    except Exception as e:
+        logger.error(f"Error saving experiment trace {experiment_id}: {e}")
+
+async def get_experiment_trace(experiment_id: str) -> dict:
+    """
+    Get the trace timeline of an experiment: every finished span (experiment run,
+    scheduling, runner attempts and backoffs, provider calls, DB operations) with its
+    offset, duration and depth, plus time totals per span name
+    
+    Args:
+        experiment_id: ID of the experiment
+        
+    Returns:
+        Trace timeline, or None if no spans were recorded for the experiment
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            trace = await _merged_trace(session, experiment_id)
+        if not trace["spans"]:
+            return None
+        return {
+            "experiment_id": str(experiment_id),
+            "trace_id": experiment_trace_id(experiment_id),
+            **build_timeline(trace["spans"], trace["dropped"]),
+        }
+    except Exception as e:
+        logger.error(f"Error getting experiment trace {experiment_id}: {e}")
+        raise
+
+
+class ExperimentConflictError(Exception):
+    """Raised when an experiment is in a state that does not allow the operation."""
+    pass
+
+async def extend_experiment(experiment_id: str, request: ExtendExperimentRequest) -> dict:
+    """
+    Extend a completed experiment's sweep with new axes, running only the
+    (model, temperature, top_p) cells it does not already have
+    
+    Cells with a stored successful response are reused; failed ones are run again.
+    
+    Args:
+        experiment_id: ID of the experiment
+        request: the extended grid
+        
+    Returns:
+        Experiment ID, number of new and reused cells, and status; None if the
+        experiment does not exist
+    """
+    from app.services.background_tasks import background_task_service
+    
+    try:
+        async with AsyncSessionLocal() as session:
+            experiment = await get_experiment_by_id(session, experiment_id)
+            if experiment is None:
+                return None
+            if experiment.status != ExperimentStatus.COMPLETED:
+                raise ExperimentConflictError(f"Only completed experiments can be extended (status: {experiment.status})")
+            if experiment.original_message.startswith("dataset:"):
+                raise ExperimentConflictError("Dataset experiments cannot be extended")
+            
+            responses = await get_responses_by_experiment(session, experiment_id)
+        
+        stored = [(r.model, r.temperature, r.top_p) for r in responses if r.success]
+        models = request.models or list(dict.fromkeys(r.model for r in responses))
+        cells = diff_parameter_cells(models, request.temperatures, request.top_ps, stored)
+        total = len(models) * len(set(request.temperatures)) * len(set(request.top_ps))
+        
+        if cells:
+            # Claim the experiment in one conditional update: of concurrent extensions
+            # only the first moves it from completed to running, the rest get a conflict
+            async with AsyncSessionLocal() as session:
+                claimed = await update_experiment_status(
+                    session, experiment_id, ExperimentStatus.RUNNING, expected_status=ExperimentStatus.COMPLETED
+                )
+            if not claimed:
+                raise ExperimentConflictError("Experiment is already being extended")
+        
+        logger.info(
+            f"Extending experiment {experiment_id}: {len(cells)} new cells, {total - len(cells)} reused",
+            experiment_id=str(experiment_id),
+        )
+        
+        # Stored cells are served like cache entries: only misses cost provider calls
+        CACHE_HITS.labels("sweep_cells").inc(total - len(cells))
+        CACHE_MISSES.labels("sweep_cells").inc(len(cells))
+        
+        if cells:
+            await background_task_service.start_experiment_extension(
+                experiment_id, request, experiment.original_message, cells
+            )
+        
+        return {
+            "experiment_id": str(experiment_id),
+            "new_cells": len(cells),
+            "reused_cells": total - len(cells),
+            "status": ExperimentStatus.RUNNING if cells else ExperimentStatus.COMPLETED,
+        }
+    except Exception as e:
+        logger.error(f"Error extending experiment {experiment_id}: {e}")
+        raise
@@ -1,15 +1,28 @@
 import asyncio
+import json
+import math
 import time
-from typing import List, Dict, Any, Tuple
-from ..validations.llm_requests import LLMRequest, LLMResponse, LLMResult
+import uuid
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from ..validations.llm_requests import LLMRequest, LLMResponse, LLMResult, DatasetExperimentRequest, ExtendExperimentRequest
 from ..utils.parameter_calculator import generate_parameter_combinations
+from ..llm_providers.base import HttpTimings, http_timings
 from ..llm_providers.factory import LLMProviderFactory
 from ..config import Config
 from ..core.logger import Logger
-from ..services.concurrency_runner import ConcurrencyRunner
+from ..core.prometheus import INFLIGHT_CALLS, PROVIDER_LATENCY, PROVIDER_RETRIES, PROVIDER_TIMEOUTS, TOKENS
+from ..core.tracing import STATUS_ERROR, traced, tracer
+from ..services.concurrency_runner import ConcurrencyRunner, current_attempt
+from ..services.adaptive_sweep import SWEEP_STRATEGIES, SuccessiveHalvingSweep, SWEEP_ARTIFACT
+from ..services.convergent_sweep import ConvergentSweep, SKIPPED_CELLS_ARTIFACT
+from ..services.metrics_pool import metrics_pool
+from ..services.datasets import iter_dataset_cells, DatasetCell
+from ..consts import SweepMode
 from app.db.session import AsyncSessionLocal
+from app.repositories.experiment_artifacts import save_artifact
 from app.repositories.experiments import save_experiment
-from app.repositories.llm_response import save_responses_transaction
+from app.repositories.llm_response import save_responses_transaction, append_responses, delete_failed_responses
+from app.repositories.response_metrics import save_response_metrics
 
 
 logger = Logger(__name__)
@@ -18,12 +31,77 @@ class LLMProviderError(Exception):
     """Raised when an LLM provider returns a semantic/validation failure or a hard timeout."""
     pass
 
+class _ProviderCallMetrics:
+    """
+    Record one provider call in the Prometheus metrics (in-flight gauge, retry and
+    timeout counters, latency by outcome) and as a `provider.call` trace span. The
+    outcome is "error" unless the call is marked successful before the block exits.
+    
+    The HTTP requests the provider makes inside the block are collected in `http`,
+    in the order their clients were created.
+    """
+    
+    __slots__ = ("labels", "outcome", "span", "http", "_inflight", "_start", "_http_token")
+    
+    def __init__(self, provider_name: str, model: str, temperature: float, top_p: float):
+        self.labels = (provider_name, model)
+        self.outcome = "error"
+        self.span = tracer.start_span("provider.call", {
+            "llm.provider": provider_name,
+            "llm.model": model,
+            "llm.temperature": temperature,
+            "llm.top_p": top_p,
+        })
+    
+    def __enter__(self) -> "_ProviderCallMetrics":
+        self.span.__enter__()
+        if current_attempt.get():
+            PROVIDER_RETRIES.labels(*self.labels).inc()
+        self._inflight = INFLIGHT_CALLS.labels(*self.labels)
+        self._inflight.inc()
+        self.http: List[HttpTimings] = []
+        self._http_token = http_timings.set(self.http)
+        self._start = time.perf_counter()
+        return self
+    
+    def latency_breakdown(self, sample_index: Optional[int] = None, samples: int = 1) -> Dict[str, float]:
+        """
+        The `*_time` breakdown fields for a result of this call (empty when the
+        provider made no HTTP request, e.g. the mock)
+        
+        Args:
+            sample_index: For sample results, which sample the fields are for
+            samples: Number of samples the call returned
+        """
+        if not self.http:
+            return {}
+        if sample_index is None or len(self.http) == 1:
+            # One call, or n samples from one request: requests ran one after another
+            return HttpTimings.total(self.http).as_result()
+        if len(self.http) == samples:
+            # One request per sample, issued in sample order
+            return self.http[sample_index].as_result()
+        return {}
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        http_timings.reset(self._http_token)
+        self._inflight.dec()
+        if exc_type is not None and issubclass(exc_type, asyncio.TimeoutError):
+            self.outcome = "timeout"
+            PROVIDER_TIMEOUTS.labels(*self.labels).inc()
+        PROVIDER_LATENCY.labels(*self.labels, self.outcome).observe(time.perf_counter() - self._start)
+        self.span.set_attribute("llm.outcome", self.outcome)
+        if exc is None and self.outcome != "success":
+            self.span.set_status(STATUS_ERROR, self.outcome)
+        self.span.__exit__(exc_type, exc, tb)
+
 class LLMService:
     """Service class for handling LLM requests"""
     
     def __init__(self):
         self.provider_factory = LLMProviderFactory()
     
+    @traced("process_llm_request")
     async def process_llm_request(self, experiment_id: str, request: LLMRequest) -> LLMResponse:
         """
         Process LLM request based on single_llm flag
@@ -46,7 +124,11 @@ class LLMService:
                 top_ps=request.top_ps
             )
             
-            if request.single_llm:
+            if request.single_llm and request.sweep_mode != SweepMode.GRID:
+                # Use single LLM with an adaptive search over the parameter grid
+                logger.info(f"Using single LLM mode with {request.sweep_mode.value} sweep for model: {request.models[0]}")
+                results = await self._process_adaptive_sweep(experiment_id, request)
+            elif request.single_llm:
                 # Use single LLM with parameter variations
                 logger.info(f"Using single LLM mode with parameter variations for model: {request.models[0]}")
                 results = await self._process_single_llm_with_variations(request)
@@ -55,17 +137,26 @@ class LLMService:
                 logger.info(f"Using multiple LLM mode with {len(request.models)} models: {request.models}")
                 results = await self._process_multiple_llms(request)
                 
+            # Cells skipped by an early-stopping sweep are reported, not stored as responses
+            skipped = [result for result in results if result.get('skipped')]
+            
             # Save experiment and responses to the database
             try:
                 async with AsyncSessionLocal() as db_session:
                     # save all responses in a single transaction
                     # repository expects list[dict]; our `results` is already a list of dicts
-                    created = await save_responses_transaction(db_session, experiment_id, results)
+                    created = await save_responses_transaction(
+                        db_session, experiment_id, [result for result in results if not result.get('skipped')]
+                    )
                     logger.info(
                         "Saved experiment and responses to database",
-                        experiment_id=str(experiment.id),
+                        experiment_id=str(experiment_id),
                         created_responses=len(created),
                     )
+                    if skipped:
+                        await save_artifact(
+                            db_session, experiment_id, SKIPPED_CELLS_ARTIFACT, json.dumps(skipped)
+                        )
             except Exception as db_exc:
                 # Log DB errors but do not fail the entire request — metrics should not block the LLM path
                 logger.error(
@@ -75,12 +166,14 @@ class LLMService:
             
             execution_time = time.time() - start_time
             successful_requests = sum(1 for result in results if result.get('success', False))
-            failed_requests = len(results) - successful_requests
+            failed_requests = len(results) - successful_requests - len(skipped)
             
             logger.info(
-                f"LLM request completed: {successful_requests} successful, {failed_requests} failed, {execution_time:.2f}s",
+                f"LLM request completed: {successful_requests} successful, {failed_requests} failed, "
+                f"{len(skipped)} skipped, {execution_time:.2f}s",
                 successful_requests=successful_requests,
                 failed_requests=failed_requests,
+                skipped_requests=len(skipped),
                 execution_time=execution_time
             )
             
@@ -91,6 +184,7 @@ class LLMService:
                 total_requests=len(results),
                 successful_requests=successful_requests,
                 failed_requests=failed_requests,
+                skipped_requests=len(skipped),
                 execution_time=execution_time,
                 message="Request processed successfully"
             )
@@ -107,6 +201,186 @@ class LLMService:
             )
             raise
     
+    @traced("process_dataset_experiment")
+    async def process_dataset_experiment(self, experiment_id: str, request: DatasetExperimentRequest) -> Dict[str, int]:
+        """
+        Run every (prompt, model, temperature, top_p) cell of a dataset experiment
+        
+        Cells are generated lazily from the JSONL dataset and executed with
+        ConcurrencyRunner.stream, so only the in-flight cells and one persist batch are
+        held in memory. Responses are saved (with their quality metrics) every
+        Config.DATASET_PERSIST_BATCH results. Failed cells are stored as failed
+        responses instead of aborting the run.
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: dataset experiment request
+            
+        Returns:
+            Counts of total, successful and failed cells
+        """
+        from app.services.metrics import compute_response_metrics
+        
+        start_time = time.time()
+        counts = {"total": 0, "successful": 0, "failed": 0}
+        providers: Dict[str, Tuple[str, Optional[Any]]] = {}
+        
+        async def _single_call_factory(cell: DatasetCell):
+            _, prompt, model_id, temp, top_p = cell
+            provider_type, provider = self._get_cached_provider(model_id, request.mock_mode, request.api_keys, providers)
+            if provider is None:
+                raise LLMProviderError(f"Missing required API key for provider: {provider_type}")
+            return await self._execute_llm_request(
+                provider=provider,
+                prompt=prompt,
+                temperature=temp,
+                top_p=top_p,
+                # The mock answers under the requested model id, so the models of a
+                # mock dataset run stay distinguishable
+                model=model_id,
+                provider_name=provider_type
+            )
+        
+        async def _persist(batch: List[Dict[str, Any]]) -> None:
+            async with AsyncSessionLocal() as db_session:
+                created = await append_responses(db_session, experiment_id, batch)
+                rows = await compute_response_metrics(created)
+                await save_response_metrics(db_session, experiment_id, rows)
+            logger.info(
+                f"Persisted dataset batch: {len(batch)} responses ({counts['total']} so far)",
+                experiment_id=str(experiment_id),
+            )
+        
+        runner = ConcurrencyRunner(
+            concurrency=Config.LLM_CONCURRENCY,
+            retries=Config.LLM_RETRIES,
+            backoff_factor=Config.LLM_BACKOFF_FACTOR,
+            logger_instance=logger
+        )
+        
+        cells = iter_dataset_cells(request.dataset_id, request.models, request.temperatures, request.top_ps)
+        batch: List[Dict[str, Any]] = []
+        async for _, (prompt_index, _, model_id, temp, top_p), result in runner.stream(cells, _single_call_factory):
+            if isinstance(result, Exception):
+                result = self._failed_result(providers[model_id][0], model_id, temp, top_p, str(result))
+            result['prompt_index'] = prompt_index
+            
+            counts["total"] += 1
+            counts["successful" if result.get('success') else "failed"] += 1
+            batch.append(result)
+            if len(batch) >= Config.DATASET_PERSIST_BATCH:
+                await _persist(batch)
+                batch = []
+        
+        if batch:
+            await _persist(batch)
+        
+        logger.info(
+            f"Dataset experiment completed: {counts['successful']} successful, {counts['failed']} failed, "
+            f"{time.time() - start_time:.2f}s",
+            experiment_id=str(experiment_id),
+            **counts
+        )
+        return counts
+    
+    def _get_cached_provider(
+        self,
+        model_id: str,
+        mock_mode: bool,
+        api_keys: Optional[Dict[str, str]],
+        cache: Dict[str, Tuple[str, Optional[Any]]],
+    ) -> Tuple[str, Optional[Any]]:
+        """
+        Resolve (provider_type, provider) for a model once per experiment
+        
+        The provider is None when the required API key is missing from `api_keys`.
+        """
+        if model_id not in cache:
+            provider_type = "mock" if mock_mode else Config.get_provider_for_model(model_id)
+            api_key = None
+            requires_api_key = self.provider_factory.requires_api_key(provider_type)
+            if requires_api_key:
+                api_key = (api_keys or {}).get(provider_type)
+            provider = None
+            if api_key or not requires_api_key:
+                provider = self.provider_factory.create_provider(
+                    provider_type=provider_type,
+                    api_key=api_key,
+                    base_url=Config.get_base_url(provider_type)
+                )
+            cache[model_id] = (provider_type, provider)
+        return cache[model_id]
+    
+    @traced("process_experiment_extension")
+    async def process_experiment_extension(
+        self, experiment_id: str, request: ExtendExperimentRequest, prompt: str, cells: List[Tuple[str, float, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the (model, temperature, top_p) cells an existing experiment is missing and
+        store them alongside its previous responses, replacing the failed responses
+        of retried cells
+        
+        Args:
+            experiment_id: ID of the experiment being extended
+            request: extension request (new axes, provider settings)
+            prompt: the experiment's original prompt
+            cells: missing cells, as computed by `diff_parameter_cells`
+            
+        Returns:
+            List of results for the new cells
+        """
+        providers: Dict[str, Tuple[str, Optional[Any]]] = {}
+        
+        async def _single_call_factory(cell: Tuple[str, float, float]):
+            model_id, temp, top_p = cell
+            provider_type, provider = self._get_cached_provider(model_id, request.mock_mode, request.api_keys, providers)
+            if provider is None:
+                raise LLMProviderError(f"Missing required API key for provider: {provider_type}")
+            return await self._execute_llm_request(
+                provider=provider,
+                prompt=prompt,
+                temperature=temp,
+                top_p=top_p,
+                model=model_id,
+                provider_name=provider_type
+            )
+        
+        runner = ConcurrencyRunner(
+            concurrency=Config.LLM_CONCURRENCY,
+            retries=Config.LLM_RETRIES,
+            backoff_factor=Config.LLM_BACKOFF_FACTOR,
+            logger_instance=logger
+        )
+        
+        try:
+            raw_results = await runner.run(cells, _single_call_factory)
+        except Exception as exc:
+            logger.error(
+                "One or more LLM calls failed while extending experiment",
+                error=str(exc),
+                experiment_id=str(experiment_id),
+                cells=len(cells)
+            )
+            raise
+        
+        processed_results: List[Dict[str, Any]] = []
+        for (model_id, temp, top_p), result in zip(cells, raw_results):
+            if isinstance(result, Exception):
+                result = self._failed_result(providers[model_id][0], model_id, temp, top_p, str(result))
+            processed_results.append(result)
+        
+        async with AsyncSessionLocal() as db_session:
+            # A retried cell replaces its failed row, so every cell keeps one response
+            await delete_failed_responses(db_session, experiment_id, cells)
+            created = await save_responses_transaction(db_session, experiment_id, processed_results)
+        
+        logger.info(
+            f"Extended experiment with {len(created)} new responses",
+            experiment_id=str(experiment_id),
+            cells=len(cells)
+        )
+        return processed_results
+    
     async def _process_single_llm_with_variations(self, request: LLMRequest) -> List[Dict[str, Any]]:
         """
         Process single LLM with parameter variations
@@ -118,17 +392,13 @@ class LLMService:
             List of results
         """
         try:
-            # there will be only one model in the request
-            model_id = request.models[0]
-            
-            # Check if mock mode is enabled by user
-            if request.mock_mode:
-                logger.info("Using mock LLM provider for testing (user requested)")
-                provider_type = "mock"
-                model_id = "mock-model"
-            else:
-                provider_type = Config.get_provider_for_model(model_id)
-                print("hi: ", provider_type)
+            provider_type, model_id, provider = self._create_single_llm_provider(request)
+            if provider is None:
+                # Return a single result list with error and success=False
+                return [self._failed_result(
+                    provider_type, model_id, None, None,
+                    f"Missing required API key for provider: {provider_type}"
+                )]
             
             # Calculate parameter variations
             parameter_combinations = generate_parameter_combinations(
@@ -136,35 +406,6 @@ class LLMService:
                 request.top_ps
             )
             
-            # Get API key from request
-            api_key = None
-            # Only require API key if not mock or ollama provider
-            if provider_type not in ['mock', 'ollama']:
-                if request.api_keys and provider_type in request.api_keys:
-                    api_key = request.api_keys[provider_type]
-                else:
-                    error_msg = f"Missing required API key for provider: {provider_type}"
-                    logger.error(error_msg)
-                    # Return a single result list with error and success=False
-                    return [{
-                        'provider': provider_type,
-                        'model': model_id,
-                        'temperature': None,
-                        'top_p': None,
-                        'response': '',
-                        'tokens_used': 0,
-                        'execution_time': 0,
-                        'success': False,
-                        'error': error_msg,
-                    }]
-            
-            # Create provider
-            provider = self.provider_factory.create_provider(
-                provider_type=provider_type,
-                api_key=api_key,
-                base_url=Config.get_base_url(provider_type)
-            )
-            
             # Build runner (reads concurrency from config; fall back to 4)
             runner = ConcurrencyRunner(
                 concurrency=Config.LLM_CONCURRENCY,
@@ -174,9 +415,20 @@ class LLMService:
             )
 
             # Worker factory: given a (temp, top_p) tuple, call the LLM and return the result dict
+            # (or the list of sample result dicts when sampling a cell repeatedly)
             async def _single_call_factory(params: Tuple[float, float]):
                 temp, top_p = params
                 try:
+                    if request.samples_per_cell > 1:
+                        return await self._execute_llm_samples(
+                            provider=provider,
+                            prompt=request.prompt,
+                            temperature=temp,
+                            top_p=top_p,
+                            model=model_id,
+                            provider_name=provider_type,
+                            n=request.samples_per_cell
+                        )
                     return await self._execute_llm_request(
                         provider=provider,
                         prompt=request.prompt,
@@ -188,6 +440,11 @@ class LLMService:
                 except Exception as e:
                     raise
 
+            if request.early_stopping:
+                return await self._run_convergent_sweep(
+                    request, runner, _single_call_factory, provider_type, model_id
+                )
+
             # Run all calls with limited concurrency and fail-fast semantics.
             # If any call raises after retries, runner.run will raise and cancel others.
             try:
@@ -209,17 +466,9 @@ class LLMService:
                 result = raw_results[i]
                 # result is expected to be the dict returned by _execute_llm_request
                 if isinstance(result, Exception):
-                    processed_results.append({
-                        'provider': provider_type,
-                        'model': model_id,
-                        'temperature': temp,
-                        'top_p': top_p,
-                        'response': '',
-                        'tokens_used': 0,
-                        'execution_time': 0,
-                        'success': False,
-                        'error': str(result)
-                    })
+                    processed_results.append(self._failed_result(provider_type, model_id, temp, top_p, str(result)))
+                elif isinstance(result, list):
+                    processed_results.extend(result)
                 else:
                     processed_results.append(result)
 
@@ -234,6 +483,209 @@ class LLMService:
             raise Exception(f"Error processing single LLM with parameter variations: {str(e)}")
         
     
+    @traced("convergent_sweep")
+    async def _run_convergent_sweep(
+        self,
+        request: LLMRequest,
+        runner: ConcurrencyRunner,
+        call_factory: Callable[[Tuple[float, float]], Any],
+        provider_type: str,
+        model_id: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the parameter grid coarse-to-fine, skipping regions whose outputs converge
+        
+        Each refinement level runs through the runner in one batch; output similarity
+        is computed in the metrics process pool.
+        
+        Returns:
+            List of results aligned with the full grid; skipped cells have skipped=True
+        """
+        threshold = request.convergence_threshold
+        if threshold is None:
+            threshold = Config.CONVERGENCE_THRESHOLD
+        
+        async def _evaluate(cells: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+            raw_results = await runner.run(cells, call_factory)
+            return [
+                self._failed_result(provider_type, model_id, temp, top_p, str(result))
+                if isinstance(result, Exception) else result
+                for (temp, top_p), result in zip(cells, raw_results)
+            ]
+        
+        async def _similarity(texts: List[str]) -> List[List[float]]:
+            from app.services.similarity import compute_similarity
+            similarity = await metrics_pool.submit(compute_similarity, texts)
+            return similarity["cosine"]
+        
+        sweep = ConvergentSweep(request.temperatures, request.top_ps, threshold=threshold)
+        try:
+            return await sweep.run(_evaluate, _similarity)
+        except Exception as exc:
+            logger.error(
+                "One or more LLM calls failed during early-stopping parameter sweep",
+                error=str(exc),
+                model=model_id,
+                temperatures=request.temperatures,
+                top_ps=request.top_ps
+            )
+            raise
+    
+    def _create_single_llm_provider(self, request: LLMRequest) -> Tuple[str, str, Optional[Any]]:
+        """
+        Resolve the provider and model for single LLM mode.
+        
+        Returns:
+            (provider_type, model_id, provider); provider is None when the required
+            API key is missing from the request
+        """
+        # there will be only one model in the request
+        model_id = request.models[0]
+        
+        # Check if mock mode is enabled by user
+        if request.mock_mode:
+            logger.info("Using mock LLM provider for testing (user requested)")
+            provider_type = "mock"
+            model_id = "mock-model"
+        else:
+            provider_type = Config.get_provider_for_model(model_id)
+        
+        # Get API key from request
+        api_key = None
+        # Only require API key if not mock or ollama provider (or replaying a trace)
+        if self.provider_factory.requires_api_key(provider_type):
+            if request.api_keys and provider_type in request.api_keys:
+                api_key = request.api_keys[provider_type]
+            else:
+                logger.error(f"Missing required API key for provider: {provider_type}")
+                return provider_type, model_id, None
+        
+        # Create provider
+        provider = self.provider_factory.create_provider(
+            provider_type=provider_type,
+            api_key=api_key,
+            base_url=Config.get_base_url(provider_type)
+        )
+        return provider_type, model_id, provider
+    
+    @staticmethod
+    def _failed_result(
+        provider_type: str, model_id: str, temperature: Optional[float], top_p: Optional[float], error: str
+    ) -> Dict[str, Any]:
+        """Result dict for a call that did not produce a response."""
+        return {
+            'provider': provider_type,
+            'model': model_id,
+            'temperature': temperature,
+            'top_p': top_p,
+            'response': '',
+            'tokens_used': 0,
+            'execution_time': 0,
+            'success': False,
+            'error': error,
+        }
+    
+    @traced("adaptive_sweep")
+    async def _process_adaptive_sweep(self, experiment_id: str, request: LLMRequest) -> List[Dict[str, Any]]:
+        """
+        Process single LLM with an adaptive search over the temperatures x top_ps grid
+        
+        Each round's cells run through the ConcurrencyRunner like a grid sweep and are
+        scored on `request.objective_metric`; the search strategy picks the next round
+        from those scores until the call budget is spent. Every evaluated cell is
+        returned (and so stored) as a normal result, and the search report is saved as
+        an experiment artifact.
+        
+        Args:
+            experiment_id: ID of the experiment
+            request: LLM request
+            
+        Returns:
+            List of results, one per evaluated cell
+        """
+        try:
+            provider_type, model_id, provider = self._create_single_llm_provider(request)
+            if provider is None:
+                return [self._failed_result(
+                    provider_type, model_id, None, None,
+                    f"Missing required API key for provider: {provider_type}"
+                )]
+            
+            runner = ConcurrencyRunner(
+                concurrency=Config.LLM_CONCURRENCY,
+                retries=Config.LLM_RETRIES,
+                backoff_factor=Config.LLM_BACKOFF_FACTOR,
+                logger_instance=logger
+            )
+            
+            # Budget: explicit max_calls, else a fixed share of the full grid
+            grid_size = len(set(request.temperatures)) * len(set(request.top_ps))
+            budget = request.max_calls or max(1, math.ceil(grid_size * Config.ADAPTIVE_SWEEP_BUDGET_FRACTION))
+            strategy_cls = SWEEP_STRATEGIES[request.sweep_mode.value]
+            options = {"eta": Config.ADAPTIVE_SWEEP_ETA} if strategy_cls is SuccessiveHalvingSweep else {}
+            sweep = strategy_cls(
+                request.temperatures, request.top_ps, budget=budget, batch_size=Config.LLM_CONCURRENCY, **options
+            )
+            
+            objective = request.objective_metric
+            sign = 1.0 if request.maximize_objective else -1.0
+            processed_results: List[Dict[str, Any]] = []
+            
+            async def _single_call_factory(params: Tuple[float, float]):
+                temp, top_p = params
+                return await self._execute_llm_request(
+                    provider=provider,
+                    prompt=request.prompt,
+                    temperature=temp,
+                    top_p=top_p,
+                    model=model_id,
+                    provider_name=provider_type
+                )
+            
+            # Evaluate one round: run the calls, keep the results, score them on the objective
+            async def _evaluate(cells: List[Tuple[float, float]]) -> List[float]:
+                raw_results = await runner.run(cells, _single_call_factory)
+                batch = [
+                    self._failed_result(provider_type, model_id, temp, top_p, str(result))
+                    if isinstance(result, Exception) else result
+                    for (temp, top_p), result in zip(cells, raw_results)
+                ]
+                processed_results.extend(batch)
+                
+                values = await metrics_pool.compute(
+                    [{"text": r['response'], "tokens_used": r.get('tokens_used'), "execution_time": r.get('execution_time')} for r in batch],
+                    keys=[objective]
+                )
+                return [sign * v[objective] if r.get('success') else math.nan for r, v in zip(batch, values)]
+            
+            report = await sweep.run(_evaluate)
+            
+            # Scores are reported in the objective's own units
+            for round_info in report["rounds"]:
+                round_info["scores"] = [None if v is None else sign * v for v in round_info["scores"]]
+            if report["best"]:
+                report["best"]["score"] = sign * report["best"]["score"]
+            report.update(objective=objective, maximize=request.maximize_objective)
+            
+            logger.info(
+                f"Adaptive sweep finished: {report['calls']}/{report['grid_size']} cells evaluated",
+                strategy=report["strategy"],
+                best=report["best"],
+            )
+            
+            async with AsyncSessionLocal() as db_session:
+                await save_artifact(db_session, experiment_id, SWEEP_ARTIFACT, json.dumps(report))
+            
+            return processed_results
+        except Exception as e:
+            logger.error(
+                f"Error processing adaptive parameter sweep: {str(e)}",
+                error=str(e),
+                temperatures=request.temperatures,
+                top_ps=request.top_ps
+            )
+            raise Exception(f"Error processing adaptive parameter sweep: {str(e)}")
+    
     async def _process_multiple_llms(self, request: LLMRequest) -> List[Dict[str, Any]]:
         """
         Process multiple LLMs with single parameters (one temp/top_p applied to all models)
@@ -261,7 +713,7 @@ class LLMService:
                 
                 # Get API key from request
                 api_key = None
-                if provider_type not in ['mock', 'ollama']:
+                if self.provider_factory.requires_api_key(provider_type):
                     if request.api_keys and provider_type in request.api_keys:
                         api_key = request.api_keys[provider_type]
                     else:
@@ -286,6 +738,16 @@ class LLMService:
                     base_url=Config.get_base_url(provider_type),
                 )
                 try:
+                    if request.samples_per_cell > 1:
+                        return await self._execute_llm_samples(
+                            provider=provider,
+                            prompt=request.prompt,
+                            temperature=temperature,
+                            top_p=top_p,
+                            model=model_id,
+                            provider_name=provider_type,
+                            n=request.samples_per_cell,
+                        )
                     return await self._execute_llm_request(
                         provider=provider,
                         prompt=request.prompt,
@@ -329,6 +791,8 @@ class LLMService:
                         'success': False,
                         'error': str(result),
                     })
+                elif isinstance(result, list):
+                    processed_results.extend(result)
                 else:
                     processed_results.append(result)
 
@@ -368,7 +832,12 @@ class LLMService:
                 top_p=top_p,
                 model=model
             )
-            result = await asyncio.wait_for(coro, timeout=per_call_timeout)
+            with _ProviderCallMetrics(provider_name, model, temperature, top_p) as call:
+                result = await asyncio.wait_for(coro, timeout=per_call_timeout)
+                if result and not (isinstance(result, dict) and result.get("success") is False):
+                    call.outcome = "success"
+                    if isinstance(result, dict):
+                        call.span.set_attribute("llm.tokens_used", result.get("tokens_used") or 0)
         except asyncio.TimeoutError as exc:
             logger.error(
                 "LLM call timed out",
@@ -426,6 +895,9 @@ class LLMService:
             )
             raise LLMProviderError("LLM returned empty response")
 
+        tokens_used = result.get('tokens_used', 0) if isinstance(result, dict) else 0
+        TOKENS.labels(provider_name, model).inc(tokens_used or 0)
+        
         # Normalize and return successful response
         return {
             'provider': provider_name,
@@ -433,8 +905,106 @@ class LLMService:
             'temperature': temperature,
             'top_p': top_p,
             'response': response_text,
-            'tokens_used': result.get('tokens_used', 0) if isinstance(result, dict) else 0,
+            'tokens_used': tokens_used,
             'execution_time': result.get('execution_time', 0) if isinstance(result, dict) else 0,
             'success': True,
-            'error': None
+            'error': None,
+            **call.latency_breakdown()
         }
+
+    async def _execute_llm_samples(
+        self,
+        provider,
+        prompt: str,
+        temperature: float,
+        top_p: float,
+        model: str,
+        provider_name: str,
+        n: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate n samples of one (model, temperature, top_p) cell.
+
+        Providers with a native sample count (e.g. OpenAI/OpenRouter `n`) return all
+        samples from a single call; others fall back to n concurrent calls. Every
+        sample becomes its own result, linked by a shared cell_id and numbered by
+        sample_index. Failed samples are kept as failed results; the cell raises (so
+        the runner can retry it) only when no sample succeeded.
+        """
+        per_call_timeout = getattr(Config, 'PER_CALL_TIMEOUT', None) or getattr(Config, 'PER_CALL_TIMEOUT_SECONDS', None) or 30
+
+        try:
+            with _ProviderCallMetrics(provider_name, model, temperature, top_p) as call:
+                call.span.set_attribute("llm.samples", n)
+                samples = await asyncio.wait_for(
+                    provider.generate_samples(
+                        prompt=prompt,
+                        n=n,
+                        temperature=temperature,
+                        top_p=top_p,
+                        model=model
+                    ),
+                    timeout=per_call_timeout
+                )
+                if any(isinstance(sample, dict) and sample.get("success") is not False for sample in samples or []):
+                    call.outcome = "success"
+        except asyncio.TimeoutError as exc:
+            logger.error(
+                "LLM sample call timed out",
+                model=model,
+                temperature=temperature,
+                top_p=top_p,
+                samples=n,
+                timeout_seconds=per_call_timeout
+            )
+            raise LLMProviderError(f"timeout after {per_call_timeout}s for model={model}") from exc
+
+        cell_id = uuid.uuid4()
+        results: List[Dict[str, Any]] = []
+        for sample_index, sample in enumerate((samples or [])[:n]):
+            sample = sample if isinstance(sample, dict) else {}
+            response_text = (sample.get("response") or "").strip()
+            if sample.get("success") is False or not response_text:
+                result = self._failed_result(
+                    provider_name, model, temperature, top_p,
+                    sample.get("error") or "LLM returned empty response"
+                )
+            else:
+                result = {
+                    'provider': provider_name,
+                    'model': model,
+                    'temperature': temperature,
+                    'top_p': top_p,
+                    'response': response_text,
+                    'tokens_used': sample.get('tokens_used', 0),
+                    'execution_time': sample.get('execution_time', 0),
+                    'success': True,
+                    'error': None,
+                    **call.latency_breakdown(sample_index, len(samples))
+                }
+            result['cell_id'] = cell_id
+            result['sample_index'] = sample_index
+            results.append(result)
+
+        if not any(result['success'] for result in results):
+            logger.error(
+                "LLM returned no successful samples",
+                model=model,
+                temperature=temperature,
+                top_p=top_p,
+                samples=n
+            )
+            raise LLMProviderError(f"no successful samples out of {n} for model={model}")
+
+        TOKENS.labels(provider_name, model).inc(sum(result['tokens_used'] or 0 for result in results if result['success']))
+        
+        logger.info(
+            "Generated %d samples for cell",
+            len(results),
+            model=model,
+            temperature=temperature,
+            top_p=top_p,
+            native=provider.supports_native_samples,
+            sample_every=Config.LOG_SAMPLE_EVERY
+        )
+        return results
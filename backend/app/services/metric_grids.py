@@ -0,0 +1,109 @@
+"""
+Temperature x top_p grids for single-LLM parameter sweeps.
+
+A sweep built by `generate_parameter_combinations` is a dense grid, so each metric is
+returned as a matrix indexed by the sweep axes (rows = temperatures, columns = top_p
+values) instead of a flat list of labelled bars. Grids are assembled with NumPy
+scatter operations; cells without a successful response are None.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def _to_list(array: np.ndarray, decimals: int) -> List[Any]:
+    """Round and convert to nested lists, mapping NaN (empty cells) to None."""
+    rounded = np.round(array.astype(np.float64), decimals)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+def build_grid(
+    temperatures: Sequence[float],
+    top_ps: Sequence[float],
+    values: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Scatter per-response values onto the temperature x top_p grid.
+
+    Args:
+        temperatures: temperature of each response
+        top_ps: top_p of each response
+        values: (N, M) metric values, one column per metric
+
+    Returns:
+        - temperatures: sorted distinct temperatures (row axis)
+        - top_ps: sorted distinct top_p values (column axis)
+        - matrix: (M, T, P) mean value per cell, NaN for empty cells
+        - counts: (T, P) number of responses per cell
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(len(temperatures), -1)
+    temp_axis, rows = np.unique(np.asarray(temperatures, dtype=np.float64), return_inverse=True)
+    top_p_axis, cols = np.unique(np.asarray(top_ps, dtype=np.float64), return_inverse=True)
+
+    counts = np.zeros((len(temp_axis), len(top_p_axis)), dtype=np.int64)
+    np.add.at(counts, (rows, cols), 1)
+
+    # Cell sums per metric, averaged by the number of responses in the cell
+    sums = np.zeros((values.shape[1], len(temp_axis), len(top_p_axis)), dtype=np.float64)
+    np.add.at(sums, (slice(None), rows, cols), values.T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix = np.where(counts > 0, sums / counts, np.nan)
+
+    return {"temperatures": temp_axis, "top_ps": top_p_axis, "matrix": matrix, "counts": counts}
+
+
+def grid_marginals(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Row and column marginals of (M, T, P) grids: the mean over filled cells of each
+    temperature row and each top_p column.
+    """
+    filled = ~np.isnan(matrix)
+    total = np.where(filled, matrix, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rows = total.sum(axis=2) / filled.sum(axis=2)
+        columns = total.sum(axis=1) / filled.sum(axis=1)
+    return {"temperature": rows, "top_p": columns}
+
+
+def grid_payload(
+    temperatures: Sequence[float],
+    top_ps: Sequence[float],
+    values: np.ndarray,
+    metrics: List[Dict[str, Any]],
+    decimals: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the JSON-ready heatmaps for one model.
+
+    Args:
+        temperatures: temperature of each response
+        top_ps: top_p of each response
+        values: (N, M) metric values aligned with `metrics`
+        metrics: chart metadata per metric (key, name, description, y_axis)
+        decimals: rounding per metric (defaults to 4)
+
+    Returns:
+        {temperatures, top_ps, counts, metrics: [{..., graph, matrix, marginals}]}
+    """
+    grid = build_grid(temperatures, top_ps, values)
+    marginals = grid_marginals(grid["matrix"])
+    decimals = decimals or [4] * len(metrics)
+
+    charts = []
+    for i, (meta, places) in enumerate(zip(metrics, decimals)):
+        charts.append({
+            **meta,
+            "graph": "heatmap",
+            "matrix": _to_list(grid["matrix"][i], places),
+            "marginals": {
+                "temperature": _to_list(marginals["temperature"][i], places),
+                "top_p": _to_list(marginals["top_p"][i], places),
+            },
+        })
+
+    return {
+        "temperatures": grid["temperatures"].tolist(),
+        "top_ps": grid["top_ps"].tolist(),
+        "counts": grid["counts"].tolist(),
+        "metrics": charts,
+    }
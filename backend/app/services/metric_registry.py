@@ -0,0 +1,266 @@
+"""
+Pluggable quality metric registry.
+
+Every metric declares the shared features it needs (tokens, sentences, n-grams,
+lengths, ...). `compute_metrics` extracts each required feature once per batch and
+feeds it to every registered metric, so adding a metric costs one vectorized
+formula rather than another pass over the text.
+
+Registering a metric:
+
+    @register_metric(
+        key="avg_word_length",
+        name="Average Word Length",
+        description="Average number of characters per word.",
+        y_axis="Characters",
+        requires=("lengths",),
+    )
+    def avg_word_length(features):
+        chars, words = features["lengths"].T
+        return np.divide(chars, words, out=np.zeros_like(chars), where=words > 0)
+
+Metric functions receive a `FeatureSet` and return one value per response.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .readability import tokenize, count_sentences, count_syllables, scores_from_counts
+
+
+# n-gram size used by the repetition metric
+NGRAM_SIZE = 3
+
+
+class MetricDefinition:
+    """A registered quality metric: how to compute it and how to chart it."""
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        description: str,
+        y_axis: str,
+        requires: Iterable[str],
+        compute: Callable[["FeatureSet"], np.ndarray],
+        decimals: int = 2,
+    ):
+        self.key = key
+        self.name = name
+        self.description = description
+        self.y_axis = y_axis
+        self.requires = tuple(requires)
+        self.compute = compute
+        self.decimals = decimals
+
+
+# Registered features (name -> extractor) and metrics (key -> definition), in registration order
+FEATURE_REGISTRY: Dict[str, Callable[["FeatureSet"], Any]] = {}
+METRIC_REGISTRY: Dict[str, MetricDefinition] = {}
+
+
+def register_feature(name: str):
+    """Register a shared feature extractor. Extractors may read other features."""
+    def decorator(func: Callable[["FeatureSet"], Any]):
+        FEATURE_REGISTRY[name] = func
+        return func
+    return decorator
+
+
+def register_metric(
+    key: str,
+    name: str,
+    description: str,
+    y_axis: str,
+    requires: Iterable[str],
+    decimals: int = 2,
+):
+    """Register a quality metric computed from shared features."""
+    def decorator(func: Callable[["FeatureSet"], np.ndarray]):
+        for feature in requires:
+            if feature not in FEATURE_REGISTRY:
+                raise ValueError(f"Metric {key} requires unknown feature: {feature}")
+        METRIC_REGISTRY[key] = MetricDefinition(key, name, description, y_axis, requires, func, decimals)
+        return func
+    return decorator
+
+
+class FeatureSet:
+    """
+    Lazily computed features for a batch of responses.
+
+    Each feature is extracted at most once per batch, on first access, and shared by
+    every metric (and every other feature) that asks for it.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = items
+        self._cache: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._cache:
+            self._cache[name] = FEATURE_REGISTRY[name](self)
+        return self._cache[name]
+
+
+# --- Shared features -------------------------------------------------------
+
+@register_feature("tokens")
+def _tokens(features: FeatureSet) -> List[List[str]]:
+    return [tokenize(item.get("text") or "") for item in features.items]
+
+
+@register_feature("sentences")
+def _sentences(features: FeatureSet) -> np.ndarray:
+    return np.array([count_sentences(item.get("text") or "") for item in features.items], dtype=np.float64)
+
+
+@register_feature("lengths")
+def _lengths(features: FeatureSet) -> np.ndarray:
+    """(characters, words) per response."""
+    return np.array(
+        [(len(item.get("text") or ""), len(tokens)) for item, tokens in zip(features.items, features["tokens"])],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+@register_feature("syllables")
+def _syllables(features: FeatureSet) -> np.ndarray:
+    """(syllables, complex words) per response."""
+    return np.array([count_syllables(tokens) for tokens in features["tokens"]], dtype=np.float64).reshape(-1, 2)
+
+
+@register_feature("ngrams")
+def _ngrams(features: FeatureSet) -> np.ndarray:
+    """(total, distinct) lowercased word n-grams per response."""
+    counts = []
+    for tokens in features["tokens"]:
+        lowered = [t.lower() for t in tokens]
+        grams = list(zip(*(lowered[i:] for i in range(NGRAM_SIZE))))
+        counts.append((len(grams), len(set(grams))))
+    return np.array(counts, dtype=np.float64).reshape(-1, 2)
+
+
+@register_feature("generation")
+def _generation(features: FeatureSet) -> np.ndarray:
+    """(tokens used, execution time in seconds) per response, as reported by the provider."""
+    return np.array(
+        [(item.get("tokens_used") or 0, item.get("execution_time") or 0.0) for item in features.items],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+@register_feature("readability")
+def _readability(features: FeatureSet) -> Dict[str, np.ndarray]:
+    syllables, complex_words = features["syllables"].T
+    return scores_from_counts(features["sentences"], features["lengths"][:, 1], syllables, complex_words)
+
+
+# --- Built-in metrics ------------------------------------------------------
+
+@register_metric(
+    key="readability_ease",
+    name="Readability Ease",
+    description="How easy it is to read the text (higher is easier).",
+    y_axis="Ease Score",
+    requires=("readability",),
+)
+def readability_ease(features: FeatureSet) -> np.ndarray:
+    return features["readability"]["readability_ease"]
+
+
+@register_metric(
+    key="reading_grade",
+    name="Reading Grade Level",
+    description="The US school grade level needed to understand the text.",
+    y_axis="Grade Level",
+    requires=("readability",),
+)
+def reading_grade(features: FeatureSet) -> np.ndarray:
+    return features["readability"]["reading_grade"]
+
+
+@register_metric(
+    key="text_complexity",
+    name="Text Complexity",
+    description="How complex the text is based on sentence length and difficult words.",
+    y_axis="Complexity Score",
+    requires=("readability",),
+)
+def text_complexity(features: FeatureSet) -> np.ndarray:
+    return features["readability"]["text_complexity"]
+
+
+@register_metric(
+    key="lexical_diversity",
+    name="Lexical Diversity",
+    description="Share of distinct words in the text (type-token ratio, higher is more varied).",
+    y_axis="Type-Token Ratio",
+    requires=("tokens",),
+    decimals=3,
+)
+def lexical_diversity(features: FeatureSet) -> np.ndarray:
+    ratios = [len({t.lower() for t in tokens}) / len(tokens) if tokens else 0.0 for tokens in features["tokens"]]
+    return np.array(ratios, dtype=np.float64)
+
+
+@register_metric(
+    key="ngram_repetition",
+    name="Repetition Rate",
+    description=f"Share of repeated {NGRAM_SIZE}-word phrases in the text (lower is less repetitive).",
+    y_axis="Repetition Rate",
+    requires=("ngrams",),
+    decimals=3,
+)
+def ngram_repetition(features: FeatureSet) -> np.ndarray:
+    total, distinct = features["ngrams"].T
+    return np.divide(total - distinct, total, out=np.zeros_like(total), where=total > 0)
+
+
+@register_metric(
+    key="response_length",
+    name="Response Length",
+    description="Number of words in the response.",
+    y_axis="Words",
+    requires=("lengths",),
+    decimals=0,
+)
+def response_length(features: FeatureSet) -> np.ndarray:
+    return features["lengths"][:, 1]
+
+
+@register_metric(
+    key="tokens_per_second",
+    name="Generation Speed",
+    description="Tokens generated per second of provider time.",
+    y_axis="Tokens / sec",
+    requires=("generation",),
+)
+def tokens_per_second(features: FeatureSet) -> np.ndarray:
+    tokens, seconds = features["generation"].T
+    return np.divide(tokens, seconds, out=np.zeros_like(tokens), where=seconds > 0)
+
+
+def compute_metrics(items: List[Dict[str, Any]], keys: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    """
+    Compute registered metrics for a batch of responses.
+
+    Each item is a dict with `text` and, optionally, `tokens_used` and `execution_time`.
+    Pure CPU work with no database or event loop access, so it can run inside a
+    worker process. Returns one {metric_key: value} dict per item, in input order.
+    """
+    if not items:
+        return []
+
+    features = FeatureSet(items)
+    definitions = [METRIC_REGISTRY[k] for k in keys] if keys else list(METRIC_REGISTRY.values())
+
+    columns = {}
+    for definition in definitions:
+        values = np.asarray(definition.compute(features), dtype=np.float64)
+        columns[definition.key] = [round(v, definition.decimals) for v in values.tolist()]
+
+    return [{key: values[i] for key, values in columns.items()} for i in range(len(items))]
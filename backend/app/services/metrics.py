@@ -1,63 +1,70 @@
+import hashlib
+import json
 from typing import List, Dict, Any
-import os
-from pathlib import Path
-import nltk
-import textstat
+import numpy as np
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.llm_response import LLMResponse
+from app.models.response_metrics import ResponseMetric
 from app.repositories.llm_response import get_responses_by_experiment
+from app.repositories.response_metrics import get_metrics_by_experiment, save_response_metrics
+from app.repositories.experiment_artifacts import get_artifact, save_artifact
+from app.services.metric_registry import METRIC_REGISTRY
+from app.services.metrics_pool import metrics_pool
+from app.services.metric_grids import grid_payload
+from app.services.similarity import compute_similarity
 from ..core.logger import Logger
+from ..core.prometheus import CACHE_HITS, CACHE_MISSES
 
 
 logger = Logger(__name__)
 
+SIMILARITY_ARTIFACT = "similarity"
+HEATMAPS_ARTIFACT = "heatmaps"
 
-def ensure_nltk_data_available(bundled_path: str | None = None) -> None:
-    """Ensure NLTK cmudict data is available by appending a bundled path.
 
-    This function will:
-    - Prefer an explicit `bundled_path` if provided.
-    - Otherwise use the repository relative path `app/data/nltk_data`.
-    - Append the path to `nltk.data.path` if not already present.
-    - Attempt to load `nltk.corpus.cmudict.dict()` and raise a RuntimeError if missing.
+def response_label(r: LLMResponse) -> str:
+    """Chart label for a response: "ModelName (temp=0.5, top_p=0.8)"."""
+    return f"{r.model}\n(temp={r.temperature}, top_p={r.top_p})"
+
+
+def responses_fingerprint(responses: List[LLMResponse], *extra: str) -> str:
+    """Stable hash of the response ids (and any extra inputs) an artifact was computed from."""
+    ids = sorted(str(r.id) for r in responses)
+    return hashlib.sha256(",".join(ids + list(extra)).encode()).hexdigest()
+
+
+async def compute_response_metrics(responses: List[LLMResponse]) -> List[Dict[str, Any]]:
     """
-    # Determine the path to bundled NLTK data
-    if bundled_path:
-        path = os.path.abspath(bundled_path)
-    else:
-        # default repo-relative path: <repo>/app/data/nltk_data
-        # metrics.py is at <repo>/app/services/metrics.py, so parents[1] points to <repo>/app
-        repo_root = Path(__file__).resolve().parents[1]
-        path = str(repo_root / "data" / "nltk_data")
+    Compute every registered quality metric for the given responses.
 
-    # Append to nltk data path if not present
-    if path not in nltk.data.path:
-        logger.info(f"Adding bundled NLTK data path: {path}")
-        nltk.data.path.insert(0, path)
+    The text work is dispatched to the metrics process pool so it never runs on the
+    event loop. Returns one row per (response, metric) shaped as
+    {response_id, metric, value}, ready to be persisted with `save_response_metrics`.
+    """
+    if not responses:
+        return []
 
-    # Debug: report current nltk.data.path for troubleshooting
-    logger.info(f"NLTK data search paths: {nltk.data.path}")
+    computed = await metrics_pool.compute([
+        {"text": r.response_text, "tokens_used": r.tokens_used, "execution_time": r.execution_time}
+        for r in responses
+    ])
 
-    # Verify existence of the expected cmudict folder before trying to load
-    cmu_path = os.path.join(path, "corpora", "cmudict")
-    cmu_exists = os.path.exists(cmu_path)
-    logger.info(f"Checked cmudict folder exists at: {cmu_path} -> {cmu_exists}")
+    rows = []
+    for r, values in zip(responses, computed):
+        for key, value in values.items():
+            rows.append({
+                "response_id": r.id,
+                "metric": key,
+                "value": value,
+            })
+    return rows
 
-    # Verify availability of cmudict via nltk
-    try:
-        nltk.corpus.cmudict.dict()
-        logger.info(f"NLTK cmudict loaded successfully from: {path}")
-    except LookupError as e:
-        msg = (
-            "NLTK corpus 'cmudict' not found at the bundled path. "
-            "Make sure app/data/nltk_data/corpora/cmudict exists and is committed to the repo."
-        )
-        logger.error(msg)
-        raise RuntimeError(msg) from e
 
-def generate_quality_charts(responses: List[LLMResponse]) -> List[Dict[str, Any]]:
+def generate_quality_charts(
+    responses: List[LLMResponse], metrics: List[ResponseMetric]
+) -> List[Dict[str, Any]]:
     """
-    Generate three user-friendly quality metrics for all responses, ready for bar chart plotting.
+    Shape stored quality metrics into user-friendly charts, ready for bar chart plotting.
     
     Each metric includes:
         - name
@@ -69,62 +76,155 @@ def generate_quality_charts(responses: List[LLMResponse]) -> List[Dict[str, Any]
     if not responses:
         return []
 
-    # ensure NLTK data (cmudict) is available from the bundled location
-    ensure_nltk_data_available()
+    # Index stored values by (response_id, metric) so they line up with the responses
+    values = {(m.response_id, m.metric): m.value for m in metrics}
 
     # Labels for each bar: "ModelName (temp=0.5, top_p=0.8)"
-    labels = [f"{r.model}\n(temp={r.temperature}, top_p={r.top_p})" for r in responses]
-
-    # Compute metrics
-    readability_ease = [round(textstat.flesch_reading_ease(r.response_text), 2) for r in responses]
-    reading_grade = [round(textstat.flesch_kincaid_grade(r.response_text), 2) for r in responses]
-    text_complexity = [round(textstat.gunning_fog(r.response_text), 2) for r in responses]
-
-    # Prepare chart objects
-    charts = [
-        {
-            "name": "Readability Ease",
-            "description": "How easy it is to read the text (higher is easier).",
-            "value": readability_ease,
+    labels = [response_label(r) for r in responses]
+
+    # Prepare chart objects, one per registered metric
+    charts = []
+    for definition in METRIC_REGISTRY.values():
+        data = [values.get((r.id, definition.key)) for r in responses]
+        charts.append({
+            "name": definition.name,
+            "description": definition.description,
+            "value": data,
             "graph": "bar",
             "plot": {
                 "x_axis": "Responses",
-                "y_axis": "Ease Score",
-                "data": readability_ease,
+                "y_axis": definition.y_axis,
+                "data": data,
                 "labels": labels  # bar labels
             }
-        },
-        {
-            "name": "Reading Grade Level",
-            "description": "The US school grade level needed to understand the text.",
-            "value": reading_grade,
-            "graph": "bar",
-            "plot": {
-                "x_axis": "Responses",
-                "y_axis": "Grade Level",
-                "data": reading_grade,
-                "labels": labels
-            }
-        },
-        {
-            "name": "Text Complexity",
-            "description": "How complex the text is based on sentence length and difficult words.",
-            "value": text_complexity,
-            "graph": "bar",
-            "plot": {
-                "x_axis": "Responses",
-                "y_axis": "Complexity Score",
-                "data": text_complexity,
-                "labels": labels
-            }
-        }
-    ]
+        })
 
     return charts
 
+async def materialize_experiment_metrics(experiment_id: str) -> int:
+    """
+    Compute and store quality metrics for every response of an experiment that
+    does not have them yet. Safe to call repeatedly; returns the number of rows written.
+    """
+    try:
+        logger.info(f"Materializing metrics for experiment with id: {experiment_id}")
+
+        from app.db.session import AsyncSessionLocal
+        async with AsyncSessionLocal() as session:
+            responses = await get_responses_by_experiment(session, experiment_id)
+            stored = await get_metrics_by_experiment(session, experiment_id)
+
+            # A response is pending if any registered metric is missing for it
+            # (e.g. metrics registered after the response was first materialized)
+            done = {(m.response_id, m.metric) for m in stored}
+            pending = [r for r in responses if any((r.id, key) not in done for key in METRIC_REGISTRY)]
+            if not pending:
+                logger.info(f"Metrics already materialized for experiment with id: {experiment_id}")
+                return 0
+
+            rows = await compute_response_metrics(pending)
+            rows = [row for row in rows if (row["response_id"], row["metric"]) not in done]
+            return await save_response_metrics(session, experiment_id, rows)
+
+    except Exception as e:
+        logger.error(f"Error materializing metrics for experiment: {experiment_id}, error: {e}")
+        raise
+
+def generate_metric_heatmaps(
+    experiment_id: str, responses: List[LLMResponse], metrics: List[ResponseMetric]
+) -> Dict[str, Any]:
+    """
+    Shape stored quality metrics into temperature x top_p heatmaps, one grid per model.
+
+    Failed responses are left out, so their cells are empty (None) in the matrices.
+    Each model entry includes:
+        - temperatures / top_ps: the sweep axes (matrix rows / columns)
+        - counts: responses per cell
+        - metrics: name, description, y_axis, matrix and row/column marginals per metric
+    """
+    definitions = list(METRIC_REGISTRY.values())
+    values = {(m.response_id, m.metric): m.value for m in metrics}
+
+    by_model: Dict[str, List[LLMResponse]] = {}
+    for r in responses:
+        if r.success:
+            by_model.setdefault(r.model, []).append(r)
+
+    models = []
+    for model, model_responses in by_model.items():
+        matrix = np.array(
+            [[values.get((r.id, d.key), np.nan) for d in definitions] for r in model_responses],
+            dtype=np.float64,
+        ).reshape(len(model_responses), len(definitions))
+        grid = grid_payload(
+            [r.temperature for r in model_responses],
+            [r.top_p for r in model_responses],
+            matrix,
+            [
+                {"key": d.key, "name": d.name, "description": d.description, "y_axis": d.y_axis}
+                for d in definitions
+            ],
+            decimals=[max(d.decimals, 2) for d in definitions],
+        )
+        models.append({"model": model, "provider": model_responses[0].provider, **grid})
+
+    return {"experiment_id": str(experiment_id), "models": models}
+
+async def materialize_experiment_heatmaps(experiment_id: str) -> Dict[str, Any]:
+    """
+    Build the metric heatmaps for an experiment from its stored metrics and cache them.
+    Metrics must already be materialized; returns the heatmaps.
+    """
+    try:
+        logger.info(f"Materializing heatmaps for experiment with id: {experiment_id}")
+
+        from app.db.session import AsyncSessionLocal
+        async with AsyncSessionLocal() as session:
+            responses = await get_responses_by_experiment(session, experiment_id)
+            metrics = await get_metrics_by_experiment(session, experiment_id)
+
+            result = generate_metric_heatmaps(experiment_id, responses, metrics)
+            fingerprint = responses_fingerprint(responses, *METRIC_REGISTRY)
+            await save_artifact(session, experiment_id, HEATMAPS_ARTIFACT, json.dumps(result), fingerprint)
+
+        logger.info(f"Successfully materialized heatmaps for experiment with id: {experiment_id}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Error materializing heatmaps for experiment: {experiment_id}, error: {e}")
+        raise
+
+async def get_experiment_heatmaps(experiment_id: str) -> Dict[str, Any]:
+    """
+    Gets temperature x top_p metric heatmaps for an experiment.
+    Served from the cache built at experiment completion; rebuilt when the responses
+    or the registered metrics have changed since.
+    """
+    try:
+        logger.info(f"Starting to get heatmaps for experiment with id: {experiment_id}")
+
+        from app.db.session import AsyncSessionLocal
+        async with AsyncSessionLocal() as session:
+            responses = await get_responses_by_experiment(session, experiment_id)
+            artifact = await get_artifact(session, experiment_id, HEATMAPS_ARTIFACT)
+
+        if artifact and artifact.fingerprint == responses_fingerprint(responses, *METRIC_REGISTRY):
+            logger.info(f"Using cached heatmaps for experiment with id: {experiment_id}")
+            CACHE_HITS.labels(HEATMAPS_ARTIFACT).inc()
+            return json.loads(artifact.payload)
+        CACHE_MISSES.labels(HEATMAPS_ARTIFACT).inc()
+
+        await materialize_experiment_metrics(experiment_id)
+        return await materialize_experiment_heatmaps(experiment_id)
+
+    except Exception as e:
+        logger.error(f"Error getting heatmaps for experiment: {experiment_id}, error: {e}")
+        raise
+
 async def get_experiment_metrics(experiment_id: str) -> List[Dict[str, Any]]:
     """
-    Gets quality metrics for a given experiment.
+    Gets quality metrics for a given experiment from the stored metrics table.
+    Responses that predate the metrics pipeline are materialized on first read.
     """
     try:
         logger.info(f"Starting to get metrics for experiment with id: {experiment_id}")
@@ -138,11 +238,61 @@ async def get_experiment_metrics(experiment_id: str) -> List[Dict[str, Any]]:
                 logger.warning(f"No responses found for experiment id: {experiment_id}")
                 return []
 
-            metrics = generate_quality_charts(responses)
-            logger.info(f"Successfully got metrics for experiment with id: {experiment_id}")
+            metrics = await get_metrics_by_experiment(session, experiment_id)
+
+        stored = {(m.response_id, m.metric) for m in metrics if m.metric in METRIC_REGISTRY}
+        if len(stored) < len(responses) * len(METRIC_REGISTRY):
+            await materialize_experiment_metrics(experiment_id)
+            async with AsyncSessionLocal() as session:
+                metrics = await get_metrics_by_experiment(session, experiment_id)
 
-            return metrics
+        charts = generate_quality_charts(responses, metrics)
+        logger.info(f"Successfully got metrics for experiment with id: {experiment_id}")
+
+        return charts
 
     except Exception as e:
         logger.error(f"Error getting metrics for experiment: {experiment_id}, error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+async def get_experiment_similarity(experiment_id: str) -> Dict[str, Any]:
+    """
+    Gets pairwise response similarity (MinHash Jaccard and TF-IDF cosine) for an experiment.
+
+    Matrices are computed in the metrics process pool and cached per experiment; the
+    cache is reused until the experiment's set of responses changes.
+
+    Returns:
+        {experiment_id, labels, response_ids, jaccard, cosine, summary} where `jaccard`
+        and `cosine` are N x N matrices aligned with `labels` / `response_ids`
+    """
+    try:
+        logger.info(f"Starting to get similarity for experiment with id: {experiment_id}")
+
+        from app.db.session import AsyncSessionLocal
+        async with AsyncSessionLocal() as session:
+            responses = await get_responses_by_experiment(session, experiment_id)
+            fingerprint = responses_fingerprint(responses)
+
+            artifact = await get_artifact(session, experiment_id, SIMILARITY_ARTIFACT)
+            if artifact and artifact.fingerprint == fingerprint:
+                logger.info(f"Using cached similarity for experiment with id: {experiment_id}")
+                CACHE_HITS.labels(SIMILARITY_ARTIFACT).inc()
+                return json.loads(artifact.payload)
+            CACHE_MISSES.labels(SIMILARITY_ARTIFACT).inc()
+
+            similarity = await metrics_pool.submit(compute_similarity, [r.response_text for r in responses])
+            result = {
+                "experiment_id": str(experiment_id),
+                "labels": [response_label(r) for r in responses],
+                "response_ids": [str(r.id) for r in responses],
+                **similarity,
+            }
+            await save_artifact(session, experiment_id, SIMILARITY_ARTIFACT, json.dumps(result), fingerprint)
+
+        logger.info(f"Successfully got similarity for experiment with id: {experiment_id}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Error getting similarity for experiment: {experiment_id}, error: {e}")
+        raise
@@ -0,0 +1,136 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Dict, Optional
+
+from ..config import Config
+from ..core.logger import Logger
+from ..core.prometheus import QUEUE_WAIT
+
+
+logger = Logger(__name__)
+
+
+def _init_worker() -> None:
+    """Worker initializer: load NLTK data and the syllable dictionary once per process."""
+    from .text_metrics import warmup
+    warmup()
+
+
+class MetricsProcessPool:
+    """
+    Run CPU-bound text metrics in a bounded process pool, off the event loop.
+
+    Usage example:
+        pool = MetricsProcessPool(workers=2, chunk_size=32, max_pending_chunks=8)
+        values = await pool.compute([{"text": ..., "tokens_used": ..., "execution_time": ...}])
+
+    Parameters:
+    - workers: number of worker processes
+    - chunk_size: number of responses sent to a worker per task
+    - max_pending_chunks: max chunks submitted to the pool at once (across all callers)
+
+    Behavior:
+    - The executor is created lazily on first use and uses the "spawn" start method so
+      workers never inherit the event loop or database threads of the API process.
+    - Each batch (typically one experiment) is split into chunks and dispatched concurrently.
+    - An asyncio.Semaphore bounds in-flight chunks; when the pool is saturated callers
+      wait for a slot (queueing) instead of computing inline on the event loop.
+    - If the pool breaks (e.g. a worker is killed) it is recreated and the task retried once.
+    - Other CPU-bound experiment work (e.g. similarity matrices) can use `submit`.
+    - Returns results aligned with the input ordering.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        chunk_size: int = 32,
+        max_pending_chunks: int = 8,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if max_pending_chunks < 1:
+            raise ValueError("max_pending_chunks must be >= 1")
+
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"[metrics-pool] starting {self.workers} worker process(es)")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # created lazily so the semaphore binds to the running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending_chunks)
+        return self._slots
+
+    async def submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable, module-level function in the pool and return its result.
+        Waits for a free slot when the pool is saturated.
+        """
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        async with self._get_slots():
+            QUEUE_WAIT.labels("metrics_pool").observe(time.perf_counter() - queued_at)
+            try:
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            except BrokenProcessPool:
+                logger.warning("[metrics-pool] pool broken, restarting and retrying task")
+                self.shutdown(wait=False)
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def compute(self, items: List[Dict[str, Any]], keys: Optional[List[str]] = None) -> List[Dict[str, float]]:
+        """
+        Compute registered metrics (all, or only `keys`) for a batch of responses (see
+        `compute_metrics`); returns one {metric_key: value} dict per item, in input order.
+        """
+        if not items:
+            return []
+        # Imported on first use: the metric modules pull in NumPy, NLTK and Pyphen
+        from .metric_registry import compute_metrics
+
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        logger.info(f"[metrics-pool] computing metrics: items={len(items)} chunks={len(chunks)}")
+
+        results = await asyncio.gather(*(self.submit(compute_metrics, chunk, keys) for chunk in chunks))
+        return [values for chunk_result in results for values in chunk_result]
+
+    async def warmup(self) -> None:
+        """Start the worker processes ahead of the first request so they load their data early."""
+        from .text_metrics import warmup
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            await asyncio.gather(*(loop.run_in_executor(executor, warmup) for _ in range(self.workers)))
+            logger.info("[metrics-pool] workers warmed up")
+        except Exception as e:
+            logger.warning(f"[metrics-pool] warmup failed: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker processes (a new pool is created on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global metrics pool instance
+metrics_pool = MetricsProcessPool(
+    workers=Config.METRICS_WORKERS,
+    chunk_size=Config.METRICS_CHUNK_SIZE,
+    max_pending_chunks=Config.METRICS_MAX_PENDING_CHUNKS,
+)
@@ -0,0 +1,151 @@
+"""
+Single-pass readability engine.
+
+Each text is tokenized once; sentence, word, syllable and complex-word counts are
+collected in that pass and the Flesch Reading Ease, Flesch-Kincaid Grade and Gunning
+Fog formulas are then evaluated with NumPy across the whole batch.
+
+Tokenization, sentence splitting and syllable counting follow textstat's English
+rules (cmudict first pronunciation, pyphen fallback, Dale-Chall easy words), so
+scores match `textstat.flesch_reading_ease`, `flesch_kincaid_grade` and
+`gunning_fog` for the same text.
+"""
+import re
+from functools import lru_cache
+from importlib import resources
+from typing import List, Dict, Tuple
+
+import numpy as np
+from pyphen import Pyphen
+
+from .text_metrics import get_syllable_dict
+
+
+# Formula constants (English)
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLL_PER_WORD = 84.6
+FKG_SENTENCE_LENGTH = 0.39
+FKG_SYLL_PER_WORD = 11.8
+FKG_BASE = 15.59
+FOG_FACTOR = 0.4
+# Minimum syllables for a word (not in the easy word list) to count as complex
+COMPLEX_WORD_SYLLABLES = 3
+
+# Apostrophes that are not part of an English contraction are treated as punctuation
+_NON_CONTRACTION_APOSTROPHE = re.compile(r"\'(?!(?:[tsd]|ve|ll|re))")
+_PUNCTUATION = re.compile(r"[^\w\s\']")
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+
+_pyphen = None
+
+
+def _strip_punctuation(text: str) -> str:
+    return _PUNCTUATION.sub("", _NON_CONTRACTION_APOSTROPHE.sub("", text))
+
+
+@lru_cache(maxsize=None)
+def _easy_words() -> frozenset:
+    ref = resources.files("textstat").joinpath("resources/en/easy_words.txt")
+    with ref.open() as f:
+        return frozenset(line.strip() for line in f)
+
+
+@lru_cache(maxsize=65536)
+def count_word_syllables(word: str) -> int:
+    """Syllables in a lowercased word: cmudict when known, pyphen hyphenation otherwise."""
+    syllables = get_syllable_dict().get(word)
+    if syllables is not None:
+        return syllables
+
+    global _pyphen
+    if _pyphen is None:
+        _pyphen = Pyphen(lang="en_US")
+    return len(_pyphen.positions(word)) + 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into words, dropping punctuation but keeping contraction apostrophes."""
+    return _strip_punctuation(text).split()
+
+
+def count_sentences(text: str) -> int:
+    """
+    Count sentences in a text. Sentences with two words or fewer are not counted,
+    but any non-empty text has at least one sentence.
+    """
+    if not text:
+        return 0
+    found = _SENTENCE.findall(text)
+    ignored = sum(1 for sentence in found if len(tokenize(sentence)) <= 2)
+    return max(1, len(found) - ignored)
+
+
+def count_syllables(words: List[str]) -> Tuple[int, int]:
+    """Count (syllables, complex_words) over already tokenized words."""
+    easy_words = _easy_words()
+    syllables = 0
+    complex_words = 0
+    for word in words:
+        lowered = word.lower()
+        word_syllables = count_word_syllables(lowered)
+        syllables += word_syllables
+        if word_syllables >= COMPLEX_WORD_SYLLABLES and lowered not in easy_words:
+            complex_words += 1
+    return syllables, complex_words
+
+
+def count_features(text: str) -> Tuple[int, int, int, int]:
+    """Count (sentences, words, syllables, complex_words) for a text in one pass."""
+    if not text:
+        return 0, 0, 0, 0
+    words = tokenize(text)
+    syllables, complex_words = count_syllables(words)
+    return count_sentences(text), len(words), syllables, complex_words
+
+
+def scores_from_counts(
+    sentences: np.ndarray, words: np.ndarray, syllables: np.ndarray, complex_words: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the readability formulas on count arrays (one element per text).
+
+    Returns:
+        - readability_ease: Flesch Reading Ease
+        - reading_grade: Flesch-Kincaid Grade
+        - text_complexity: Gunning Fog index
+    """
+    sentences, words, syllables, complex_words = (
+        np.asarray(a, dtype=np.float64) for a in (sentences, words, syllables, complex_words)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        words_per_sentence = np.where(sentences > 0, words / sentences, 0.0)
+        syllables_per_word = np.where(words > 0, syllables / words, 0.0)
+        percent_complex = np.where(words > 0, 100.0 * complex_words / words, 0.0)
+
+    # Flesch formulas are defined as 0 when either average is 0
+    flesch_defined = (words_per_sentence != 0) & (syllables_per_word != 0)
+    ease = np.where(
+        flesch_defined,
+        FRE_BASE - FRE_SENTENCE_LENGTH * words_per_sentence - FRE_SYLL_PER_WORD * syllables_per_word,
+        0.0,
+    )
+    grade = np.where(
+        flesch_defined,
+        FKG_SENTENCE_LENGTH * words_per_sentence + FKG_SYLL_PER_WORD * syllables_per_word - FKG_BASE,
+        0.0,
+    )
+    fog = np.where(words > 0, FOG_FACTOR * (words_per_sentence + percent_complex), 0.0)
+
+    return {
+        "readability_ease": ease,
+        "reading_grade": grade,
+        "text_complexity": fog,
+    }
+
+
+def readability_scores(texts: List[str]) -> Dict[str, np.ndarray]:
+    """Compute readability scores for a batch of texts; arrays are aligned with `texts`."""
+    counts = np.array([count_features(text) for text in texts], dtype=np.float64).reshape(-1, 4)
+    return scores_from_counts(*counts.T)
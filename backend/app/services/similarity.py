@@ -0,0 +1,158 @@
+"""
+Pairwise response-similarity engine.
+
+Answers "how much do outputs actually differ across the sweep?" with two N x N
+matrices computed as NumPy array operations:
+
+- MinHash Jaccard: each response is reduced to a fixed-size MinHash signature of its
+  word shingles; the estimated Jaccard similarity of two responses is the fraction of
+  matching signature slots.
+- TF-IDF cosine: responses are embedded as L2-normalized TF-IDF vectors over a shared
+  (capped) vocabulary; cosine similarity is their dot product.
+
+Both matrices are filled in row blocks so memory stays bounded for hundreds of
+responses, and no step loops over response pairs in Python.
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .readability import tokenize
+
+
+# Shingle size (words) for MinHash
+SHINGLE_SIZE = 3
+# MinHash signature length; the Jaccard estimate's standard error is ~1/sqrt(NUM_PERMUTATIONS)
+NUM_PERMUTATIONS = 128
+# Vocabulary cap for TF-IDF (most document-frequent terms are kept)
+MAX_FEATURES = 4096
+# Upper bound on the elements materialized per block when filling N x N matrices
+BLOCK_ELEMENTS = 4_000_000
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def _token_ids(texts: List[str]) -> tuple[List[np.ndarray], int]:
+    """Tokenize each text once and map lowercased words to ids in a shared vocabulary."""
+    vocab: Dict[str, int] = {}
+    ids = []
+    for text in texts:
+        words = [w.lower() for w in tokenize(text or "")]
+        ids.append(np.fromiter((vocab.setdefault(w, len(vocab)) for w in words), dtype=np.uint64, count=len(words)))
+    return ids, len(vocab)
+
+
+def _shingle_hashes(ids: np.ndarray, vocab_size: int) -> np.ndarray:
+    """32-bit hashes of the distinct word shingles of one response."""
+    if len(ids) == 0:
+        return ids
+    if len(ids) < SHINGLE_SIZE:
+        # short responses are a single shingle
+        ids = np.pad(ids, (0, SHINGLE_SIZE - len(ids)), constant_values=vocab_size)
+    base = np.uint64(vocab_size + 1)
+    shingles = np.zeros(len(ids) - SHINGLE_SIZE + 1, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        shingles = shingles * base + ids[offset:len(ids) - SHINGLE_SIZE + 1 + offset]
+    return np.unique((shingles * _GOLDEN) >> np.uint64(32))
+
+
+def minhash_signatures(ids: List[np.ndarray], vocab_size: int) -> np.ndarray:
+    """(N, NUM_PERMUTATIONS) MinHash signatures; empty responses get an all-max signature."""
+    signatures = np.full((len(ids), NUM_PERMUTATIONS), _MAX_HASH, dtype=np.uint64)
+    for row, doc_ids in enumerate(ids):
+        hashes = _shingle_hashes(doc_ids, vocab_size)
+        if len(hashes):
+            permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+            signatures[row] = (permuted & _MAX_HASH).min(axis=1)
+    return signatures
+
+
+def jaccard_matrix(signatures: np.ndarray) -> np.ndarray:
+    """Estimated pairwise Jaccard similarity from MinHash signatures."""
+    n, k = signatures.shape
+    result = np.empty((n, n), dtype=np.float32)
+    block = max(1, BLOCK_ELEMENTS // max(1, n * k))
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        result[start:stop] = (signatures[start:stop, None, :] == signatures[None, :, :]).mean(axis=2)
+    return result
+
+
+def tfidf_matrix(ids: List[np.ndarray], vocab_size: int) -> np.ndarray:
+    """(N, V) L2-normalized TF-IDF vectors, V capped at MAX_FEATURES by document frequency."""
+    n = len(ids)
+    lengths = np.array([len(doc) for doc in ids], dtype=np.int64)
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.concatenate(ids).astype(np.int64) if n and lengths.sum() else np.zeros(0, dtype=np.int64)
+
+    # Document frequency from the distinct (doc, term) pairs
+    pairs = np.unique(rows * max(1, vocab_size) + cols)
+    df = np.bincount(pairs % max(1, vocab_size), minlength=vocab_size)
+
+    # Keep the most document-frequent terms
+    keep = np.argsort(-df, kind="stable")[:MAX_FEATURES]
+    column_of = np.full(vocab_size, -1, dtype=np.int64)
+    column_of[keep] = np.arange(len(keep))
+    mapped = column_of[cols]
+    mask = mapped >= 0
+
+    counts = np.zeros((n, len(keep)), dtype=np.float32)
+    np.add.at(counts, (rows[mask], mapped[mask]), 1.0)
+
+    # Smoothed idf: log((1 + N) / (1 + df)) + 1
+    idf = (np.log((1.0 + n) / (1.0 + df[keep])) + 1.0).astype(np.float32)
+    vectors = counts * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def cosine_matrix(vectors: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity of L2-normalized row vectors."""
+    n, v = vectors.shape
+    result = np.empty((n, n), dtype=np.float32)
+    block = max(1, BLOCK_ELEMENTS // max(1, v))
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        result[start:stop] = vectors[start:stop] @ vectors.T
+    return np.clip(result, 0.0, 1.0)
+
+
+def _summary(matrix: np.ndarray) -> Dict[str, Any]:
+    """Mean off-diagonal similarity and the most / least similar pairs."""
+    n = matrix.shape[0]
+    if n < 2:
+        return {"mean": None, "most_similar": None, "least_similar": None}
+    upper = np.triu_indices(n, k=1)
+    values = matrix[upper]
+    hi, lo = int(values.argmax()), int(values.argmin())
+    return {
+        "mean": round(float(values.mean()), 4),
+        "most_similar": {"pair": [int(upper[0][hi]), int(upper[1][hi])], "value": round(float(values[hi]), 4)},
+        "least_similar": {"pair": [int(upper[0][lo]), int(upper[1][lo])], "value": round(float(values[lo]), 4)},
+    }
+
+
+def compute_similarity(texts: List[str]) -> Dict[str, Any]:
+    """
+    Compute pairwise MinHash Jaccard and TF-IDF cosine similarity for a batch of texts.
+
+    Pure CPU work, safe to run in a worker process. Matrices are returned as nested
+    lists rounded to 4 decimals, aligned with `texts`.
+    """
+    ids, vocab_size = _token_ids(texts)
+    jaccard = jaccard_matrix(minhash_signatures(ids, vocab_size))
+    cosine = cosine_matrix(tfidf_matrix(ids, vocab_size))
+    return {
+        "jaccard": np.round(jaccard.astype(np.float64), 4).tolist(),
+        "cosine": np.round(cosine.astype(np.float64), 4).tolist(),
+        "summary": {
+            "jaccard": _summary(jaccard),
+            "cosine": _summary(cosine),
+        },
+    }
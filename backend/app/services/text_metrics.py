@@ -0,0 +1,118 @@
+from typing import Dict
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from ..config import Config
+from ..core.logger import Logger
+
+
+logger = Logger(__name__)
+
+
+# Bundled NLTK data directory: text_metrics.py is at <repo>/app/services/text_metrics.py,
+# so parents[1] points to <repo>/app
+BUNDLED_NLTK_DATA = Path(__file__).resolve().parents[1] / "data" / "nltk_data"
+
+# NLTK data paths that have already been registered and verified in this process
+_verified_nltk_paths: set[str] = set()
+
+
+def ensure_nltk_data_available(bundled_path: str | None = None) -> None:
+    """Ensure NLTK cmudict data is available by appending a bundled path.
+
+    This function will:
+    - Prefer an explicit `bundled_path` if provided.
+    - Otherwise use the repository relative path `app/data/nltk_data`.
+    - Append the path to `nltk.data.path` if not already present.
+    - Verify that `corpora/cmudict` can be found and raise a RuntimeError if missing.
+
+    The work is done once per path per process; later calls return immediately.
+    Loading the dictionary itself is left to `get_syllable_dict`.
+    """
+    import nltk
+
+    # Determine the path to bundled NLTK data
+    if bundled_path:
+        path = os.path.abspath(bundled_path)
+    else:
+        path = str(BUNDLED_NLTK_DATA)
+
+    if path in _verified_nltk_paths:
+        return
+
+    # Append to nltk data path if not present
+    if path not in nltk.data.path:
+        logger.info(f"Adding bundled NLTK data path: {path}")
+        nltk.data.path.insert(0, path)
+
+    # Verify availability of cmudict via nltk without parsing the corpus
+    try:
+        nltk.data.find("corpora/cmudict")
+        logger.info(f"NLTK cmudict found, search paths: {nltk.data.path}")
+    except LookupError as e:
+        msg = (
+            "NLTK corpus 'cmudict' not found at the bundled path. "
+            "Make sure app/data/nltk_data/corpora/cmudict exists and is committed to the repo."
+        )
+        logger.error(msg)
+        raise RuntimeError(msg) from e
+
+    _verified_nltk_paths.add(path)
+
+
+def _build_syllable_dict() -> Dict[str, int]:
+    """Parse cmudict into {word: syllable count} using each word's first pronunciation."""
+    import nltk
+
+    ensure_nltk_data_available()
+    return {
+        word: sum(1 for phone in pronunciations[0] if phone[-1].isdigit())
+        for word, pronunciations in nltk.corpus.cmudict.dict().items()
+        if pronunciations
+    }
+
+
+@lru_cache(maxsize=None)
+def get_syllable_dict() -> Dict[str, int]:
+    """
+    Return the process-wide {word: syllable count} dictionary built from cmudict.
+
+    Built once per process on first use. When `Config.SYLLABLE_CACHE_PATH` is set the
+    compact dictionary is pickled there and reused on later starts as long as it is
+    newer than the bundled cmudict source, which avoids re-parsing the corpus.
+    """
+    cache_path = Config.SYLLABLE_CACHE_PATH
+    source_path = BUNDLED_NLTK_DATA / "corpora" / "cmudict" / "cmudict"
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            if not source_path.exists() or os.path.getmtime(cache_path) >= source_path.stat().st_mtime:
+                with open(cache_path, "rb") as f:
+                    syllables = pickle.load(f)
+                logger.info(f"Loaded precompiled syllable dictionary ({len(syllables)} words) from: {cache_path}")
+                return syllables
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable syllable cache at {cache_path}: {e}")
+
+    syllables = _build_syllable_dict()
+    logger.info(f"Built syllable dictionary from cmudict ({len(syllables)} words)")
+
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(syllables, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Saved precompiled syllable dictionary to: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Could not save syllable cache to {cache_path}: {e}")
+
+    return syllables
+
+
+def warmup() -> None:
+    """Load the NLTK data and syllable dictionary ahead of the first metrics request."""
+    ensure_nltk_data_available()
+    get_syllable_dict()
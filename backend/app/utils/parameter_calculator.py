@@ -1,5 +1,4 @@
-from typing import List, Tuple
-import numpy as np
+from typing import Iterable, List, Tuple
 
 def calculate_temperature_array(base_temperature: float, step: int) -> List[float]:
     """
@@ -23,6 +22,8 @@ def calculate_temperature_array(base_temperature: float, step: int) -> List[floa
     if step == 2:
         return [min_temp, max_temp]
     
+    import numpy as np
+    
     # Create logarithmic spacing for more variation
     temperatures = np.logspace(
         np.log10(min_temp + 0.01),  # Add small value to avoid log(0)
@@ -59,6 +60,8 @@ def calculate_top_p_array(base_top_p: float, step: int) -> List[float]:
     if step == 2:
         return [min_top_p, max_top_p]
     
+    import numpy as np
+    
     # Create linear spacing for top_p values
     top_p_values = np.linspace(min_top_p, max_top_p, step).tolist()
     
@@ -111,3 +114,32 @@ def calculate_parameter_variations(
     top_p_values = calculate_top_p_array(base_top_p, step)
     
     return generate_parameter_combinations(temperatures, top_p_values)
+
+def diff_parameter_cells(
+    models: List[str],
+    temperatures: List[float],
+    top_p_values: List[float],
+    existing: Iterable[Tuple[str, float, float]]
+) -> List[Tuple[str, float, float]]:
+    """
+    Calculate the (model, temperature, top_p) cells of a grid that are not already stored.
+    
+    Args:
+        models: Models of the grid
+        temperatures: List of temperature values
+        top_p_values: List of top_p values
+        existing: Cells already stored
+        
+    Returns:
+        List of missing (model, temperature, top_p) cells, in grid order
+    """
+    # Compare rounded values so float noise does not make a stored cell look new
+    stored = {(model, round(temp, 6), round(top_p, 6)) for model, temp, top_p in existing}
+    
+    missing = []
+    for model in dict.fromkeys(models):
+        for temp, top_p in generate_parameter_combinations(list(dict.fromkeys(temperatures)), list(dict.fromkeys(top_p_values))):
+            if (model, round(temp, 6), round(top_p, 6)) not in stored:
+                missing.append((model, temp, top_p))
+    
+    return missing
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Any, Dict
 from enum import Enum
-from ..consts import SUPPORTED_PROVIDERS
+from ..consts import SUPPORTED_PROVIDERS, SweepMode, ProfileMode
+from ..config import Config
+from ..services.datasets import validate_dataset_id
 
 class LLMProvider(str, Enum):
     OPENAI = "openai"
@@ -20,6 +22,14 @@ class LLMRequest(BaseModel):
     models: List[str] = Field(..., min_items=1, max_items=10, description="List of model IDs from /llm/providers")
     mock_mode: bool = Field(default=False, description="Use mock LLM responses for testing (only works with single_llm=True)")
     api_keys: Optional[Dict[str, str]] = Field(default=None, description="API keys for different providers")
+    samples_per_cell: int = Field(default=1, ge=1, le=Config.MAX_SAMPLES_PER_CELL, description="Completions generated for every (model, temperature, top_p) cell")
+    sweep_mode: SweepMode = Field(default=SweepMode.GRID, description="Full grid sweep or an adaptive search over temperatures x top_ps (only works with single_llm=True)")
+    objective_metric: str = Field(default="readability_ease", description="Quality metric key the adaptive search optimizes")
+    maximize_objective: bool = Field(default=True, description="Whether the adaptive search maximizes (True) or minimizes the objective")
+    max_calls: Optional[int] = Field(default=None, ge=1, description="Provider call budget for the adaptive search")
+    early_stopping: bool = Field(default=False, description="Schedule grid cells coarse-to-fine and skip regions whose outputs have converged (grid sweeps only)")
+    convergence_threshold: Optional[float] = Field(default=None, ge=0.0, le=1.0, description="Output similarity (0 to 1) at which a region counts as converged")
+    profile: Optional[ProfileMode] = Field(default=None, description="Capture a CPU profile of the whole experiment run (requires PROFILING_ENABLED)")
     
     @validator('temperatures')
     def validate_temperatures(cls, v):
@@ -44,6 +54,70 @@ class LLMRequest(BaseModel):
         if v and not values.get('single_llm', False):
             raise ValueError("Mock mode can only be used with single_llm=True")
         return v
+    
+    @validator('sweep_mode')
+    def validate_sweep_mode(cls, v, values):
+        if v != SweepMode.GRID and not values.get('single_llm', False):
+            raise ValueError("Adaptive sweeps can only be used with single_llm=True")
+        if v != SweepMode.GRID and values.get('samples_per_cell', 1) > 1:
+            raise ValueError("Adaptive sweeps take one sample per cell")
+        return v
+    
+    @validator('early_stopping')
+    def validate_early_stopping(cls, v, values):
+        if v and (not values.get('single_llm', False) or values.get('sweep_mode') != SweepMode.GRID):
+            raise ValueError("Early stopping can only be used with single_llm=True and sweep_mode=grid")
+        if v and values.get('samples_per_cell', 1) > 1:
+            raise ValueError("Early stopping takes one sample per cell")
+        return v
+    
+    @validator('profile')
+    def validate_profile(cls, v):
+        if v is not None and not Config.PROFILING_ENABLED:
+            raise ValueError("Profiling is disabled on this server (PROFILING_ENABLED)")
+        return v
+    
+    @validator('objective_metric')
+    def validate_objective_metric(cls, v):
+        from ..services.metric_registry import METRIC_REGISTRY
+        if v not in METRIC_REGISTRY:
+            raise ValueError(f"Unknown objective metric {v}, expected one of: {', '.join(METRIC_REGISTRY)}")
+        return v
+
+class DatasetExperimentRequest(BaseModel):
+    dataset_id: str = Field(..., description="ID returned by POST /datasets")
+    temperatures: List[float] = Field(..., description="List of temperatures for text generation (0.0 to 2.0)")
+    top_ps: List[float] = Field(..., description="List of top-p sampling parameters (0.0 to 1.0)")
+    models: List[str] = Field(..., min_items=1, max_items=10, description="List of model IDs from /llm/providers")
+    mock_mode: bool = Field(default=False, description="Use mock LLM responses for testing")
+    api_keys: Optional[Dict[str, str]] = Field(default=None, description="API keys for different providers")
+    
+    @validator('dataset_id')
+    def validate_dataset_id(cls, v):
+        return validate_dataset_id(v)
+    
+    @validator('temperatures')
+    def validate_temperatures(cls, v):
+        return LLMRequest.validate_temperatures(v)
+    
+    @validator('top_ps')
+    def validate_top_ps(cls, v):
+        return LLMRequest.validate_top_ps(v)
+
+class ExtendExperimentRequest(BaseModel):
+    temperatures: List[float] = Field(..., description="Temperatures of the extended grid (0.0 to 2.0)")
+    top_ps: List[float] = Field(..., description="Top-p values of the extended grid (0.0 to 1.0)")
+    models: Optional[List[str]] = Field(default=None, min_items=1, max_items=10, description="Models of the extended grid (defaults to the experiment's models)")
+    mock_mode: bool = Field(default=False, description="Use mock LLM responses for testing")
+    api_keys: Optional[Dict[str, str]] = Field(default=None, description="API keys for different providers")
+    
+    @validator('temperatures')
+    def validate_temperatures(cls, v):
+        return LLMRequest.validate_temperatures(v)
+    
+    @validator('top_ps')
+    def validate_top_ps(cls, v):
+        return LLMRequest.validate_top_ps(v)
 
 class LLMResponse(BaseModel):
     success: bool
@@ -52,6 +126,7 @@ class LLMResponse(BaseModel):
     total_requests: int
     successful_requests: int
     failed_requests: int
+    skipped_requests: int = 0
     execution_time: float
     message: Optional[str] = None
 
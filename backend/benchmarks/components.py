@@ -0,0 +1,280 @@
+"""
+Component micro-benchmarks with a stored baseline.
+
+Times the hot components one at a time, entirely offline (a throwaway SQLite file,
+no providers, no server):
+
+- runner.run_10k_noop              ConcurrencyRunner.run over 10k no-op items
+- db.save_responses_1k / _10k      save_responses_transaction inserting 1k / 10k rows
+- db.experiment_with_responses_1k  get_experiment_with_responses for 1k responses
+- metrics.quality_charts_1k        generate_quality_charts on 1k responses
+- params.combinations_1000x1000    generate_parameter_combinations on a 1000 x 1000 grid
+
+Each case runs once to warm up, then --repeat times; the best time is the headline
+number (least disturbed by the rest of the machine) and the median is kept alongside.
+Every case starts on an empty database, and cases that write to it are set up again
+on an emptied database before each run, so no run times against rows an earlier
+run or case left behind.
+
+`compare` re-runs the suite and flags every case whose best time is more than
+--threshold slower than the stored baseline (exit status 1), so it can gate a
+change. Baselines are machine specific: record one with `run --save` on the machine
+that runs `compare`, before the change under test.
+
+Usage (from the backend directory):
+    python -m benchmarks.components run                        # print timings
+    python -m benchmarks.components run --save                 # store them as the baseline
+    python -m benchmarks.components compare --threshold 0.2    # fail on >20% regressions
+    python -m benchmarks.components run --only db. --repeat 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components_baseline.json")
+
+# name -> (async function returning the coroutine function to time, writes to the database)
+CASES: Dict[str, Tuple[Callable[[], Awaitable[Callable[[], Awaitable[Any]]]], bool]] = {}
+
+
+def case(name: str, writes: bool = False):
+    """
+    Register a benchmark case: an async setup returning the async callable to time.
+    Cases that write to the database pass `writes=True` to be set up afresh per run.
+    """
+    def decorator(setup):
+        CASES[name] = (setup, writes)
+        return setup
+    return decorator
+
+
+async def reset_database() -> None:
+    """Delete every row and give the freed pages back, as if the database were new."""
+    from sqlmodel import SQLModel
+    from app.db.session import async_engine
+
+    async with async_engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            await conn.execute(table.delete())
+    async with async_engine.connect() as conn:
+        await (await conn.execution_options(isolation_level="AUTOCOMMIT")).exec_driver_sql("VACUUM")
+
+
+def response_rows(n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "provider": "mock",
+            "model": "mock-model",
+            "temperature": round(0.1 * (i % 20), 2),
+            "top_p": round(0.05 * (i % 20), 2),
+            "response": f"Response {i}: a short paragraph about sampling parameters and how they shape output.",
+            "tokens_used": 40 + i % 60,
+            "execution_time": 0.5,
+            "success": True,
+            "error": None,
+        }
+        for i in range(n)
+    ]
+
+
+async def new_experiment() -> str:
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.experiments import save_experiment
+
+    async with AsyncSessionLocal() as session:
+        experiment = await save_experiment(session, name="Component benchmark", original_message="benchmark")
+        return str(experiment.id)
+
+
+@case("runner.run_10k_noop")
+async def runner_run_10k_noop():
+    from app.services.concurrency_runner import ConcurrencyRunner
+
+    runner = ConcurrencyRunner(concurrency=8, retries=0)
+    items = list(range(10_000))
+
+    async def noop(item):
+        return item
+
+    async def run():
+        await runner.run(items, noop)
+    return run
+
+
+def save_responses(n: int):
+    async def setup():
+        from app.db.session import AsyncSessionLocal
+        from app.repositories.llm_response import save_responses_transaction
+
+        experiment_id = await new_experiment()
+        rows = response_rows(n)
+
+        async def run():
+            async with AsyncSessionLocal() as session:
+                await save_responses_transaction(session, experiment_id, rows)
+        return run
+    return setup
+
+
+case("db.save_responses_1k", writes=True)(save_responses(1_000))
+case("db.save_responses_10k", writes=True)(save_responses(10_000))
+
+
+@case("db.experiment_with_responses_1k")
+async def db_experiment_with_responses_1k():
+    from app.consts import ExperimentStatus
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.experiments import get_experiment_with_responses, update_experiment_status
+    from app.repositories.llm_response import save_responses_transaction
+
+    experiment_id = await new_experiment()
+    async with AsyncSessionLocal() as session:
+        await save_responses_transaction(session, experiment_id, response_rows(1_000))
+        # Responses are only returned for completed experiments
+        await update_experiment_status(session, experiment_id, ExperimentStatus.COMPLETED)
+
+    async def run():
+        async with AsyncSessionLocal() as session:
+            experiment = await get_experiment_with_responses(session, experiment_id)
+        assert len(experiment["responses"]) == 1_000
+    return run
+
+
+@case("metrics.quality_charts_1k")
+async def metrics_quality_charts_1k():
+    from app.models.llm_response import LLMResponse
+    from app.models.response_metrics import ResponseMetric
+    from app.services.metric_registry import METRIC_REGISTRY
+    from app.services.metrics import generate_quality_charts
+
+    experiment_id = uuid.uuid4()
+    responses = [
+        LLMResponse(id=uuid.uuid4(), experiment_id=experiment_id, **{
+            key: row[key] for key in ("provider", "model", "temperature", "top_p", "tokens_used", "execution_time", "success")
+        }, response_text=row["response"])
+        for row in response_rows(1_000)
+    ]
+    metrics = [
+        ResponseMetric(experiment_id=experiment_id, response_id=r.id, metric=key, value=float(i % 100))
+        for i, r in enumerate(responses)
+        for key in METRIC_REGISTRY
+    ]
+
+    async def run():
+        generate_quality_charts(responses, metrics)
+    return run
+
+
+@case("params.combinations_1000x1000")
+async def params_combinations_1000x1000():
+    from app.utils.parameter_calculator import generate_parameter_combinations
+
+    temperatures = [round(i * 0.002, 3) for i in range(1000)]
+    top_ps = [round(i * 0.001, 3) for i in range(1000)]
+
+    async def run():
+        generate_parameter_combinations(temperatures, top_ps)
+    return run
+
+
+async def run_cases(names: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    from app.db.init_db import init_db
+
+    await init_db()
+    results = {}
+    for name in names:
+        setup, writes = CASES[name]
+        await reset_database()
+        run = await setup()
+        timings = []
+        for i in range(repeat + 1):
+            if writes and i:
+                await reset_database()
+                run = await setup()
+            start = time.perf_counter()
+            await run()
+            if i:  # the first run is the warm up
+                timings.append(time.perf_counter() - start)
+        results[name] = {"best": min(timings), "median": statistics.median(timings), "repeat": repeat}
+        print(f"  {name:<34} best {results[name]['best'] * 1000:10.2f} ms   median {results[name]['median'] * 1000:10.2f} ms")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print each case against the baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\nagainst baseline from {baseline.get('timestamp')} ({baseline.get('machine')}), threshold {threshold:.0%}:")
+    for name, result in results.items():
+        old = baseline["cases"].get(name)
+        if old is None:
+            print(f"  {name:<34} no baseline")
+            continue
+        change = result["best"] / old["best"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "faster"
+        print(f"  {name:<34} {old['best'] * 1000:10.2f} -> {result['best'] * 1000:10.2f} ms  {change:+7.1%}  {flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Component micro-benchmarks with a stored baseline")
+    parser.add_argument("command", choices=["run", "compare"])
+    parser.add_argument("--only", help="run only the cases whose name starts with this prefix")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="(run) store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="(compare) allowed slowdown as a fraction")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.only or name.startswith(args.only)]
+    if not names:
+        parser.error(f"no case starts with {args.only!r}")
+
+    # Throwaway database and quiet logs; must be set before the app is imported
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='llm_lab_bench_')}/bench.db"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("TRACING_ENABLED", "false")
+
+    print(f"{len(names)} cases, {args.repeat} timed runs each")
+    results = asyncio.run(run_cases(names, args.repeat))
+
+    if args.command == "run":
+        if args.save:
+            baseline = {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "machine": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+                "cases": results,
+            }
+            if args.only and os.path.exists(args.baseline):
+                # Partial runs update their cases and keep the rest
+                with open(args.baseline) as f:
+                    baseline["cases"] = {**json.load(f)["cases"], **results}
+            with open(args.baseline, "w") as f:
+                json.dump(baseline, f, indent=2)
+                f.write("\n")
+            print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; record one with `run --save`")
+        return 2
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    return 1 if compare(results, baseline, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
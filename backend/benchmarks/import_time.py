@@ -0,0 +1,151 @@
+"""
+Import-time report for API startup, checked against a startup budget.
+
+Imports `app.main` in fresh interpreters under `python -X importtime` and reports:
+
+- the cumulative import time of app.main (best of --repeat runs, which is the run
+  least disturbed by the rest of the machine), against --budget-ms
+- the slowest top-level packages (self time of all their modules)
+- the slowest modules by cumulative time
+- heavy dependencies that must stay lazy (numpy, nltk, requests, the provider
+  modules, ...) but were imported at startup anyway
+
+Exits with status 1 when the budget is exceeded or a lazy module was imported, so
+it can gate a change. `-X importtime` itself adds overhead, so the numbers are
+higher than a plain import; compare them with each other, not with wall time.
+
+Usage (from the backend directory):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 10 --top 30 --budget-ms 1000
+    python -m benchmarks.import_time --module app.services.llm_service --output imports.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target cumulative import time of app.main under -X importtime
+DEFAULT_BUDGET_MS = 1300
+
+# Loaded on first use, never while the API starts
+LAZY_MODULES = (
+    "numpy",
+    "nltk",
+    "pyphen",
+    "textstat",
+    "requests",
+    "cryptography",
+    "httpx",
+    "app.services.metrics",
+    "app.services.metric_registry",
+    "app.services.similarity",
+    "app.llm_providers.replay_provider",
+)
+
+
+def provider_modules() -> List[str]:
+    """The provider modules registered in the factory (imported on demand)."""
+    sys.path.insert(0, BACKEND_DIR)
+    from app.llm_providers.factory import LLMProviderFactory
+
+    return [f"app.llm_providers.{path.partition(':')[0]}" for path in LLMProviderFactory._providers.values()]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for each line of -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure(module: str) -> List[Tuple[str, int, int, int]]:
+    """Import `module` in a fresh interpreter and return its import timings."""
+    env = dict(os.environ)
+    # Keep the logs and any database file out of the working tree
+    scratch = tempfile.mkdtemp(prefix="llm_lab_imports_")
+    env["LOG_DIR"] = os.path.join(scratch, "logs")
+    env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{scratch}/imports.db")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def report(modules: List[Tuple[str, int, int, int]], module: str, top: int, lazy: List[str]) -> Dict[str, Any]:
+    total_us = next(cumulative for name, _, _, cumulative in modules if name == module)
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+    loaded = {name for name, _, _, _ in modules}
+    return {
+        "module": module,
+        "import_ms": round(total_us / 1000, 1),
+        "modules_imported": len(modules),
+        "packages": [
+            {"package": package, "self_ms": round(us / 1000, 1)}
+            for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        ],
+        "slowest_modules": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 1), "self_ms": round(self_us / 1000, 1)}
+            for name, _, self_us, cumulative in sorted(modules, key=lambda m: -m[3])[:top]
+        ],
+        "lazy_modules_imported": [name for name in lazy if name in loaded],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time report for API startup")
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=15, help="packages / modules listed")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="allowed import time of the module")
+    parser.add_argument("--output", help="write the report JSON here")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda modules: next(c for name, _, _, c in modules if name == args.module))
+    result = report(best, args.module, args.top, list(LAZY_MODULES) + provider_modules())
+    result["import_ms_runs"] = [
+        round(next(c for name, _, _, c in modules if name == args.module) / 1000, 1) for modules in runs
+    ]
+    result["budget_ms"] = args.budget_ms
+
+    print(f"{args.module}: {result['import_ms']:.1f} ms (best of {args.repeat}: {result['import_ms_runs']}), "
+          f"{result['modules_imported']} modules, budget {args.budget_ms:.0f} ms")
+    print("\nslowest packages (self time):")
+    for entry in result["packages"]:
+        print(f"  {entry['package']:<40} {entry['self_ms']:8.1f} ms")
+    print("\nslowest modules (cumulative):")
+    for entry in result["slowest_modules"]:
+        print(f"  {entry['module']:<60} {entry['cumulative_ms']:8.1f} ms  (self {entry['self_ms']:.1f})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if result["import_ms"] > args.budget_ms:
+        print(f"\nOVER BUDGET: {result['import_ms']:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    if result["lazy_modules_imported"]:
+        print(f"\nimported at startup but should load lazily: {', '.join(result['lazy_modules_imported'])}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
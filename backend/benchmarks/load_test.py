@@ -0,0 +1,280 @@
+"""
+End-to-end load test: experiments per second one instance sustains.
+
+Submits sweep experiments to POST /llms/generate (mock_mode, so no provider is
+called), keeps --concurrency of them in flight, and follows each one to completion
+through GET /llms/experiment/{id}/status. Reports:
+
+- experiments/sec and cells/sec (stored responses per second of wall time)
+- p50/p95/p99/max experiment completion time (submit to completed/failed)
+- database size growth
+- event loop lag and blocked-loop count, from the instance's /metrics histogram
+
+By default the app runs in this process (httpx ASGI transport) on a fresh SQLite
+database, with the mock's latency scaled by --latency-scale. With --url the load
+is sent to a running instance instead (start it with MOCK_LATENCY_SCALE to set the
+latency, and pass --db to measure its database file).
+
+Results are written as JSON (--output) and can be compared with an earlier run
+(--compare) to see the change across versions.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test                                   # 20 experiments, 5 in flight
+    python -m benchmarks.load_test --experiments 100 --concurrency 20 --grid 4x4 --latency-scale 0.05
+    python -m benchmarks.load_test --output load_new.json --compare load_old.json
+    python -m benchmarks.load_test --url http://localhost:8000 --db data/dev.db
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of the values, or None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def grid_values(count: int, low: float, high: float) -> List[float]:
+    if count == 1:
+        return [round((low + high) / 2, 2)]
+    return [round(low + (high - low) * i / (count - 1), 2) for i in range(count)]
+
+
+def db_size(path: Optional[str]) -> Optional[int]:
+    """Bytes of a SQLite database including its WAL/journal files."""
+    if not path:
+        return None
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal", "-journal") if os.path.exists(path + suffix))
+
+
+def parse_loop_lag(metrics: str) -> Dict[str, Any]:
+    """Event loop lag histogram buckets, sum and count, plus the blocked counter, from /metrics text."""
+    buckets: List[Tuple[float, float]] = []
+    parsed: Dict[str, Any] = {"buckets": buckets, "sum": 0.0, "count": 0.0, "blocked": 0.0}
+    for line in metrics.splitlines():
+        if line.startswith("llm_lab_event_loop_lag_seconds_bucket"):
+            le = line.split('le="', 1)[1].split('"', 1)[0]
+            buckets.append((float("inf") if le == "+Inf" else float(le), float(line.rsplit(" ", 1)[1])))
+        elif line.startswith("llm_lab_event_loop_lag_seconds_sum"):
+            parsed["sum"] = float(line.rsplit(" ", 1)[1])
+        elif line.startswith("llm_lab_event_loop_lag_seconds_count"):
+            parsed["count"] = float(line.rsplit(" ", 1)[1])
+        elif line.startswith("llm_lab_event_loop_blocked_total"):
+            parsed["blocked"] = float(line.rsplit(" ", 1)[1])
+    return parsed
+
+
+def loop_lag_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Lag over the run: mean, the upper bucket bound of p99, and blocked heartbeats."""
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"samples": 0, "mean_ms": None, "p99_upper_bound_ms": None, "blocked": 0}
+    previous = dict(before["buckets"])
+    p99_bound = None
+    for le, cumulative in after["buckets"]:
+        if cumulative - previous.get(le, 0.0) >= 0.99 * count:
+            p99_bound = le
+            break
+    return {
+        "samples": int(count),
+        "mean_ms": round((after["sum"] - before["sum"]) / count * 1000, 3),
+        "p99_upper_bound_ms": None if p99_bound in (None, float("inf")) else round(p99_bound * 1000, 3),
+        "blocked": int(after["blocked"] - before["blocked"]),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_experiment(client: httpx.AsyncClient, body: Dict[str, Any], poll_interval: float) -> Dict[str, Any]:
+    """Submit one experiment and poll it until it stops running."""
+    start = time.perf_counter()
+    response = await client.post("/llms/generate", json=body)
+    response.raise_for_status()
+    experiment_id = response.json()["experiment_id"]
+    while True:
+        await asyncio.sleep(poll_interval)
+        status = (await client.get(f"/llms/experiment/{experiment_id}/status")).json()
+        if status["status"] not in ("pending", "running"):
+            break
+    responses = status.get("responses", [])
+    return {
+        "id": experiment_id,
+        "status": status["status"],
+        "duration": time.perf_counter() - start,
+        "responses": len(responses),
+        "failed_responses": sum(1 for r in responses if not r["success"]),
+    }
+
+
+async def run_load(client: httpx.AsyncClient, args, db_path: Optional[str]) -> Dict[str, Any]:
+    temperatures_count, top_ps_count = (int(v) for v in args.grid.lower().split("x"))
+    body = {
+        "prompt": "Explain how temperature and top-p change the output of a language model.",
+        "temperatures": grid_values(temperatures_count, 0.0, 1.5),
+        "top_ps": grid_values(top_ps_count, 0.3, 1.0),
+        "single_llm": True,
+        "models": ["mock-model"],
+        "mock_mode": True,
+        "samples_per_cell": args.samples_per_cell,
+    }
+
+    lag_before = parse_loop_lag((await client.get("/metrics")).text)
+    size_before = db_size(db_path)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited():
+        async with semaphore:
+            return await run_experiment(client, body, args.poll_interval)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(args.experiments)), return_exceptions=True)
+    wall = time.perf_counter() - start
+
+    lag_after = parse_loop_lag((await client.get("/metrics")).text)
+    size_after = db_size(db_path)
+
+    finished = [r for r in results if isinstance(r, dict)]
+    errors = [repr(r) for r in results if not isinstance(r, dict)]
+    completed = [r for r in finished if r["status"] == "completed"]
+    durations = [r["duration"] for r in finished]
+    responses = sum(r["responses"] for r in finished)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "experiments_submitted": args.experiments,
+        "experiments_completed": len(completed),
+        "experiments_failed": len(finished) - len(completed),
+        "harness_errors": errors[:10],
+        "experiments_per_sec": round(len(completed) / wall, 3),
+        "responses": responses,
+        "failed_responses": sum(r["failed_responses"] for r in finished),
+        "cells_per_sec": round(responses / wall, 2),
+        "completion_ms": {
+            "p50": ms(percentile(durations, 50)),
+            "p95": ms(percentile(durations, 95)),
+            "p99": ms(percentile(durations, 99)),
+            "max": ms(max(durations) if durations else None),
+        },
+        "db_bytes_before": size_before,
+        "db_bytes_after": size_after,
+        "db_growth_bytes": None if size_before is None else size_after - size_before,
+        "db_bytes_per_response": None if size_before is None or not responses else round((size_after - size_before) / responses, 1),
+        "event_loop_lag": loop_lag_delta(lag_before, lag_after),
+    }
+
+
+async def run_in_process(args) -> Dict[str, Any]:
+    """Run the app in this process on a fresh SQLite database."""
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="llm_lab_load_"), "load.db")
+    # Must be set before the app (and its Config / engine) is imported
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.abspath(db_path)}"
+    os.environ["MOCK_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from app.main import app
+
+    for handler in app.router.on_startup:
+        await handler()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+            return await run_load(client, args, db_path)
+    finally:
+        for handler in app.router.on_shutdown:
+            await handler()
+
+
+async def run_remote(args) -> Dict[str, Any]:
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        return await run_load(client, args, args.db)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the headline numbers of two runs side by side."""
+    rows = [
+        ("experiments/sec", lambda r: r["experiments_per_sec"], True),
+        ("cells/sec", lambda r: r["cells_per_sec"], True),
+        ("p50 completion ms", lambda r: r["completion_ms"]["p50"], False),
+        ("p95 completion ms", lambda r: r["completion_ms"]["p95"], False),
+        ("p99 completion ms", lambda r: r["completion_ms"]["p99"], False),
+        ("db bytes/response", lambda r: r["db_bytes_per_response"], False),
+        ("loop lag mean ms", lambda r: r["event_loop_lag"]["mean_ms"], False),
+        ("loop blocked", lambda r: r["event_loop_lag"]["blocked"], False),
+    ]
+    print(f"\ncompared with {baseline.get('label') or baseline.get('git_commit')} ({baseline.get('timestamp')}):")
+    for name, get, higher_is_better in rows:
+        old, new = get(baseline["results"]), get(current["results"])
+        if old is None or new is None:
+            print(f"  {name:<20} {old!s:>12} -> {new!s:>12}")
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        verdict = "" if abs(change) < 5 else ("better" if better else "worse")
+        print(f"  {name:<20} {old:>12} -> {new:>12}  {change:+7.1f}%  {verdict}")
+    if current["config"] != baseline["config"]:
+        print("  note: the runs used different configurations")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end load test against /llms/generate")
+    parser.add_argument("--experiments", type=int, default=20, help="experiments to submit")
+    parser.add_argument("--concurrency", type=int, default=5, help="experiments in flight at once")
+    parser.add_argument("--grid", default="3x3", help="temperatures x top_ps per experiment")
+    parser.add_argument("--samples-per-cell", type=int, default=1)
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="MOCK_LATENCY_SCALE for the in-process app")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="seconds between status polls")
+    parser.add_argument("--url", help="base URL of a running instance (default: run the app in-process)")
+    parser.add_argument("--db", help="SQLite file to use (in-process) or to measure (--url)")
+    parser.add_argument("--label", help="name stored with the results")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_remote(args) if args.url else run_in_process(args))
+    report = {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {
+            "experiments": args.experiments,
+            "concurrency": args.concurrency,
+            "grid": args.grid,
+            "samples_per_cell": args.samples_per_cell,
+            "latency_scale": None if args.url else args.latency_scale,
+            "target": args.url or "in-process",
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0 if results["experiments_completed"] == args.experiments else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Readability engine parity check and benchmark.
+
+Compares app.services.readability against textstat on a synthetic corpus of
+LLM-style responses, then times both implementations and the full metric
+registry (every registered metric computed from shared features).
+
+Usage (from the backend directory):
+    python -m benchmarks.readability              # 1000 responses
+    python -m benchmarks.readability --n 5000 --seed 7
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+import textstat
+
+from app.services.metric_registry import METRIC_REGISTRY, compute_metrics
+from app.services.readability import readability_scores
+from app.services.text_metrics import ensure_nltk_data_available, get_syllable_dict
+
+
+WORDS = [
+    "the", "model", "temperature", "sampling", "response", "quickly", "language", "probability",
+    "distribution", "token", "generate", "creative", "deterministic", "output", "a", "is", "of",
+    "and", "to", "in", "that", "it", "with", "as", "for", "extraordinarily", "unbelievable",
+    "nucleus", "parameter", "experiment", "comparison", "evaluation", "readability", "simple",
+    "don't", "it's", "we're", "they'll", "I've", "LLM", "GPT-4o", "3.14", "e.g.", "Dr.", "2025",
+    "hyper-parameter", "state-of-the-art", "qwertyuiop", "zxcvbnm", "transformer", "attention",
+]
+PUNCTUATION = [".", ".", ".", "!", "?", ",", ";", ":", " --", "\"", "'"]
+
+
+def make_corpus(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        sentences = []
+        for _ in range(rng.randint(1, 12)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(1, 25))]
+            words[0] = words[0].capitalize()
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), rng.choice(PUNCTUATION))
+            sentences.append(" ".join(words) + rng.choice([".", ".", "!", "?", ""]))
+        texts.append(" ".join(sentences))
+    texts.append("")
+    return texts
+
+
+def textstat_scores(texts: list[str]) -> dict[str, np.ndarray]:
+    return {
+        "readability_ease": np.array([textstat.flesch_reading_ease(t) for t in texts]),
+        "reading_grade": np.array([textstat.flesch_kincaid_grade(t) for t in texts]),
+        "text_complexity": np.array([textstat.gunning_fog(t) for t in texts]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Readability engine parity check and benchmark")
+    parser.add_argument("--n", type=int, default=1000, help="number of responses")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="max allowed absolute difference")
+    args = parser.parse_args()
+
+    # Load shared data up front so neither side pays for it inside the timings
+    ensure_nltk_data_available()
+    get_syllable_dict()
+    textstat.flesch_reading_ease("Warm up the textstat caches.")
+
+    texts = make_corpus(args.n, args.seed)
+
+    start = time.perf_counter()
+    expected = textstat_scores(texts)
+    textstat_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = readability_scores(texts)
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_metrics([{"text": t, "tokens_used": 100, "execution_time": 1.0} for t in texts])
+    registry_time = time.perf_counter() - start
+
+    print(f"responses: {len(texts)}")
+    ok = True
+    for key in expected:
+        diff = np.abs(np.round(expected[key], 2) - np.round(actual[key], 2))
+        mismatches = int((diff > args.tolerance).sum())
+        ok = ok and mismatches == 0
+        print(f"  {key:<18} max |diff| = {diff.max():.4f}  mismatches = {mismatches}")
+
+    print(f"textstat: {textstat_time * 1000:8.1f} ms")
+    print(f"engine:   {engine_time * 1000:8.1f} ms  ({textstat_time / engine_time:.1f}x faster)")
+    print(f"registry: {registry_time * 1000:8.1f} ms  (all {len(METRIC_REGISTRY)} registered metrics)")
+    print("parity: OK" if ok else "parity: FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Re-drive a recorded day of provider traffic through the API.
+
+Reads a trace recorded with LLM_RECORD_TRACE and LLM_RECORD_PROMPTS=true and
+re-submits every recorded call to POST /llms/generate as a one-cell experiment (its
+model, prompt, temperature, top_p and sample count) at its recorded arrival offset
+times --time-scale, without waiting for earlier calls to finish, then follows each
+experiment to completion through GET /llms/experiment/{id}/status.
+
+By default the app runs in this process on a fresh SQLite database with
+LLM_REPLAY_TRACE set to the same trace, so every provider call is answered from the
+recording with its recorded latency (scaled the same way) and no API keys are
+needed: scheduler, runner and storage changes can be compared on identical traffic.
+With --url the calls are sent to a running instance instead (start it with
+LLM_REPLAY_TRACE to keep it offline).
+
+Reports calls replayed and skipped (recorded without prompt text), experiments
+completed/failed, how late submissions went out against the recorded schedule,
+completion time percentiles and event loop lag.
+
+Usage (from the backend directory):
+    python -m benchmarks.replay_traffic traces/day1.jsonl.gz
+    python -m benchmarks.replay_traffic traces/day1.jsonl.gz --time-scale 0.1 --output replay.json
+    python -m benchmarks.replay_traffic traces/day1.jsonl.gz --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.load_test import git_commit, loop_lag_delta, parse_loop_lag, percentile, run_experiment
+
+
+def replayable_calls(path: str) -> List[Dict[str, Any]]:
+    """Recorded calls that carry their prompt text, in arrival order."""
+    from app.llm_providers.replay_provider import read_trace
+
+    return sorted((record for record in read_trace(path) if "prompt_text" in record), key=lambda record: record.get("at", 0.0))
+
+
+def experiment_body(call: Dict[str, Any]) -> Dict[str, Any]:
+    """A one-cell experiment repeating a recorded provider call."""
+    return {
+        "prompt": call["prompt_text"],
+        "temperatures": [call["temperature"]],
+        "top_ps": [call["top_p"]],
+        "single_llm": True,
+        "models": [call["model"]],
+        # Mock calls go through the mock provider type, like they did when recorded
+        "mock_mode": call["provider"] == "mock",
+        "samples_per_cell": call["n"],
+    }
+
+
+async def replay(client: httpx.AsyncClient, calls: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    lag_before = parse_loop_lag((await client.get("/metrics")).text)
+    lateness: List[float] = []
+    start = time.perf_counter()
+
+    async def submit(call: Dict[str, Any]) -> Dict[str, Any]:
+        scheduled = call.get("at", 0.0) * args.time_scale
+        await asyncio.sleep(max(0.0, scheduled - (time.perf_counter() - start)))
+        lateness.append(time.perf_counter() - start - scheduled)
+        return await run_experiment(client, experiment_body(call), args.poll_interval)
+
+    results = await asyncio.gather(*(submit(call) for call in calls), return_exceptions=True)
+    wall = time.perf_counter() - start
+    lag_after = parse_loop_lag((await client.get("/metrics")).text)
+
+    finished = [r for r in results if isinstance(r, dict)]
+    errors = [repr(r) for r in results if not isinstance(r, dict)]
+    completed = [r for r in finished if r["status"] == "completed"]
+    durations = [r["duration"] for r in finished]
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "recorded_seconds": round(calls[-1].get("at", 0.0), 3),
+        "calls_replayed": len(calls),
+        "experiments_completed": len(completed),
+        "experiments_failed": len(finished) - len(completed),
+        "harness_errors": errors[:10],
+        "failed_responses": sum(r["failed_responses"] for r in finished),
+        "submit_late_ms": {
+            "p50": ms(percentile(lateness, 50)),
+            "p95": ms(percentile(lateness, 95)),
+            "max": ms(max(lateness) if lateness else None),
+        },
+        "completion_ms": {
+            "p50": ms(percentile(durations, 50)),
+            "p95": ms(percentile(durations, 95)),
+            "p99": ms(percentile(durations, 99)),
+            "max": ms(max(durations) if durations else None),
+        },
+        "event_loop_lag": loop_lag_delta(lag_before, lag_after),
+    }
+
+
+def configure_in_process(args) -> None:
+    """Fresh SQLite database, providers answered from the trace; before any app import."""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="llm_lab_replay_"), "replay.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["LLM_REPLAY_TRACE"] = os.path.abspath(args.trace)
+    os.environ["LLM_REPLAY_TIME_SCALE"] = str(args.time_scale)
+    os.environ.pop("LLM_RECORD_TRACE", None)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def run_in_process(calls: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    """Run the app in this process (see `configure_in_process`)."""
+    from app.main import app
+
+    for handler in app.router.on_startup:
+        await handler()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=None) as client:
+            return await replay(client, calls, args)
+    finally:
+        for handler in app.router.on_shutdown:
+            await handler()
+
+
+async def run_remote(calls: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        return await replay(client, calls, args)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-submit a recorded trace's calls at their recorded arrival times")
+    parser.add_argument("trace", help="trace recorded with LLM_RECORD_TRACE and LLM_RECORD_PROMPTS=true")
+    parser.add_argument("--time-scale", type=float, default=float(os.getenv("LLM_REPLAY_TIME_SCALE", 1.0)),
+                        help="multiplier on recorded arrival offsets and latencies (default LLM_REPLAY_TIME_SCALE)")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="seconds between status polls")
+    parser.add_argument("--url", help="base URL of a running instance (default: run the app in-process)")
+    parser.add_argument("--label", help="name stored with the results")
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    if not args.url:
+        # Config and the engine read these when the app is first imported
+        configure_in_process(args)
+    from app.llm_providers.replay_provider import read_trace
+
+    recorded = sum(1 for _ in read_trace(args.trace))
+    calls = replayable_calls(args.trace)
+    if not calls:
+        print(f"{args.trace}: none of its {recorded} calls has prompt text; record with LLM_RECORD_PROMPTS=true")
+        return 2
+
+    results = asyncio.run(run_remote(calls, args) if args.url else run_in_process(calls, args))
+    results["calls_skipped"] = recorded - len(calls)
+    report = {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {
+            "trace": args.trace,
+            "time_scale": args.time_scale,
+            "target": args.url or "in-process",
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if results["experiments_completed"] == len(calls) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
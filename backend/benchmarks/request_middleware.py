@@ -0,0 +1,164 @@
+"""
+Request middleware overhead benchmark.
+
+Times a no-op route through three otherwise identical FastAPI apps: no middleware,
+the previous `@app.middleware("http")` request logger (BaseHTTPMiddleware), and
+RequestInstrumentationMiddleware. Requests are driven straight through the ASGI
+interface, so the numbers are the per-request cost of the middleware stack itself
+(no sockets, no HTTP parsing).
+
+Log records still go through the queue pipeline, but the listener's handlers are
+swapped for a null handler so terminal and disk output do not skew the timings.
+
+Usage (from the backend directory):
+    python -m benchmarks.request_middleware               # 5000 requests per app
+    python -m benchmarks.request_middleware --n 20000 --repeat 5
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import traceback
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core import logger as logger_module
+from app.core.instrumentation import RequestInstrumentationMiddleware
+from app.core.logger import logger
+
+
+def _noop_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/llms/experiment/{experiment_id}/status")
+    async def status(experiment_id: str):
+        return {"experiment_id": experiment_id, "status": "running"}
+
+    return app
+
+
+def bare_app() -> FastAPI:
+    return _noop_app()
+
+
+def legacy_app() -> FastAPI:
+    """The request logger main.py used before RequestInstrumentationMiddleware."""
+    app = _noop_app()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        logger.info(
+            f"Request started: {request.method} {request.url}",
+            method=request.method,
+            url=str(request.url),
+            client_ip=request.client.host if request.client else "unknown"
+        )
+        try:
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            logger.info(
+                f"Request completed: {request.method} {request.url} - Status: {response.status_code}",
+                method=request.method,
+                url=str(request.url),
+                status_code=response.status_code,
+                process_time=round(process_time, 4),
+                client_ip=request.client.host if request.client else "unknown"
+            )
+            return response
+        except Exception as e:
+            process_time = time.time() - start_time
+            logger.error(
+                f"Request failed: {request.method} {request.url} - Error: {str(e)}",
+                method=request.method,
+                url=str(request.url),
+                error=str(e),
+                process_time=round(process_time, 4),
+                client_ip=request.client.host if request.client else "unknown",
+                traceback=traceback.format_exc()
+            )
+            return JSONResponse(status_code=500, content={"error": "Internal server error", "detail": str(e)})
+
+    return app
+
+
+def instrumented_app() -> FastAPI:
+    app = _noop_app()
+    app.add_middleware(RequestInstrumentationMiddleware)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _drive(app: FastAPI, n: int) -> float:
+    """Send n requests through the app; returns seconds elapsed."""
+    path = "/llms/experiment/6f1c0c3e-5d6b-4a59-9a38-0c2f5f2b9f11/status"
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(_scope(path), receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Request middleware overhead benchmark")
+    parser.add_argument("--n", type=int, default=5000, help="requests per app and repeat")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repeats (best is reported)")
+    args = parser.parse_args()
+
+    # Keep the queue pipeline but drop terminal / file output
+    logger_module._listener.handlers = (logging.NullHandler(),)
+
+    apps = {"none": bare_app(), "legacy @app.middleware": legacy_app(), "RequestInstrumentationMiddleware": instrumented_app()}
+
+    async def run():
+        results = {}
+        for name, app in apps.items():
+            await _drive(app, min(500, args.n))  # warm up
+            results[name] = [await _drive(app, args.n) / args.n for _ in range(args.repeat)]
+        return results
+
+    results = asyncio.run(run())
+    baseline = min(results["none"])
+    print(f"requests per run: {args.n}, repeats: {args.repeat}")
+    for name, timings in results.items():
+        best = min(timings)
+        overhead = best - baseline
+        print(
+            f"  {name:<34} {best * 1e6:8.1f} us/request (median {statistics.median(timings) * 1e6:8.1f})"
+            + ("" if name == "none" else f"  overhead {overhead * 1e6:7.1f} us")
+        )
+    legacy, new = min(results["legacy @app.middleware"]) - baseline, min(results["RequestInstrumentationMiddleware"]) - baseline
+    if new > 0:
+        print(f"middleware overhead: {legacy / new:.1f}x lower than the legacy logger")
+    logger_module.shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Local stub LLM server speaking the providers' wire formats.
+
+Serves the endpoints the HTTP providers call, so they can be benchmarked and
+checked offline with their real transport, JSON parsing and error handling:
+
+- OpenAI / OpenRouter   POST /v1/chat/completions   (n, stream: SSE chunks + [DONE])
+- Anthropic             POST /v1/messages           (stream: message_start ... message_stop events)
+- Ollama                POST /api/generate          (stream: NDJSON lines), GET /api/tags
+- llama.cpp             POST /completion            (stream: SSE chunks)
+
+Latency and errors are scripted:
+- --latency: time-to-first-byte distribution, in the mock provider's format
+  (fixed:S, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA, pareto:SCALE,ALPHA)
+- --token-rate: output tokens per second after the first byte (0 = instant)
+- --errors: per-request probability of an HTTP error status, e.g. "429=0.02,500=0.01"
+  (429 and 503 carry Retry-After)
+- --script: JSON list of steps replayed in order (cycling), each
+  {"latency": seconds, "status": code, "tokens": n}; overrides the random draws
+- --seed: makes the random draws reproducible
+
+Point the app at it with the providers' base URL settings, e.g.
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:9000/v1
+    OPENROUTER_BASE_URL=http://127.0.0.1:9000/v1 OLLAMA_BASE_URL=http://127.0.0.1:9000
+    LLAMA_CPP_BASE_URL=http://127.0.0.1:9000
+
+`--self-test N` starts the stub, runs N calls through each real provider class
+against it and reports calls/second and any parsing failures.
+
+Usage (from the backend directory):
+    python -m benchmarks.stub_server --port 9000 --latency lognormal:0.4,0.6 --token-rate 60
+    python -m benchmarks.stub_server --errors 429=0.05 --seed 1
+    python -m benchmarks.stub_server --self-test 200 --latency fixed:0.05
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.llm_providers.mock_provider import parse_latency
+
+
+WORDS = (
+    "the model samples each token from a distribution shaped by temperature and top p "
+    "so higher values spread probability across more candidates and lower values keep "
+    "the output focused on the most likely continuation of the prompt"
+).split()
+
+
+class StubBehaviour:
+    """Draws the latency, status and length of each request (randomly or from a script)."""
+
+    def __init__(
+        self,
+        latency: str = "fixed:0.1",
+        token_rate: float = 0.0,
+        errors: Optional[Dict[int, float]] = None,
+        script: Optional[List[Dict[str, Any]]] = None,
+        seed: Optional[int] = None,
+        tokens: Tuple[int, int] = (30, 120),
+    ):
+        self.latency = parse_latency(latency)
+        self.token_rate = token_rate
+        self.errors = errors or {}
+        self.script = itertools.cycle(script) if script else None
+        self.rng = random.Random(seed)
+        self.tokens = tokens
+
+    def _latency(self) -> float:
+        kind, params = self.latency
+        if kind == "fixed":
+            return params[0]
+        if kind == "uniform":
+            return self.rng.uniform(params[0], params[1])
+        if kind == "lognormal":
+            return self.rng.lognormvariate(math.log(params[0]), params[1])
+        return params[0] * self.rng.paretovariate(params[1])
+
+    def next(self, max_tokens: int) -> Dict[str, Any]:
+        """Latency (s), status code and output token count of the next request."""
+        if self.script is not None:
+            step = next(self.script)
+            return {
+                "latency": float(step.get("latency", 0.0)),
+                "status": int(step.get("status", 200)),
+                "tokens": min(int(step.get("tokens", self.tokens[0])), max_tokens),
+            }
+        status = 200
+        roll = self.rng.random()
+        for code, probability in self.errors.items():
+            if roll < probability:
+                status = code
+                break
+            roll -= probability
+        return {
+            "latency": self._latency(),
+            "status": status,
+            "tokens": min(self.rng.randint(*self.tokens), max_tokens),
+        }
+
+    def text(self, tokens: int) -> List[str]:
+        """Output split into one piece per token."""
+        start = self.rng.randrange(len(WORDS))
+        return [("" if i == 0 else " ") + WORDS[(start + i) % len(WORDS)] for i in range(tokens)]
+
+
+def prompt_tokens(text: str) -> int:
+    return max(1, len(text.split()))
+
+
+def create_app(behaviour: StubBehaviour) -> FastAPI:
+    app = FastAPI(title="LLM Lab provider stub")
+
+    async def stream_pieces(pieces: List[str]) -> AsyncIterator[str]:
+        for piece in pieces:
+            if behaviour.token_rate > 0:
+                await asyncio.sleep(1 / behaviour.token_rate)
+            yield piece
+
+    async def begin(max_tokens: int) -> Tuple[Dict[str, Any], Optional[JSONResponse]]:
+        """Draw the request's behaviour and wait for its first byte; returns an error response if it fails."""
+        draw = behaviour.next(max_tokens)
+        await asyncio.sleep(draw["latency"])
+        if draw["status"] == 200:
+            return draw, None
+        headers = {"retry-after": "1"} if draw["status"] in (429, 503) else {}
+        body = {"error": {"type": "stub_error", "message": f"Stub error {draw['status']}"}}
+        return draw, JSONResponse(body, status_code=draw["status"], headers=headers)
+
+    async def full_text(pieces: List[str]) -> str:
+        """Non-streaming responses still take the generation time."""
+        if behaviour.token_rate > 0:
+            await asyncio.sleep(len(pieces) / behaviour.token_rate)
+        return "".join(pieces)
+
+    def sse(data: Any, event: Optional[str] = None) -> str:
+        return (f"event: {event}\n" if event else "") + f"data: {json.dumps(data) if not isinstance(data, str) else data}\n\n"
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        draw, error = await begin(int(body.get("max_tokens") or 1000))
+        if error:
+            return error
+        n = int(body.get("n") or 1)
+        prompt = sum(prompt_tokens(m.get("content", "")) for m in body.get("messages", []))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        if body.get("stream"):
+            pieces = behaviour.text(draw["tokens"])
+
+            async def events():
+                async for piece in stream_pieces(pieces):
+                    yield sse({"id": completion_id, "object": "chat.completion.chunk", "model": body.get("model"),
+                               "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+                yield sse({"id": completion_id, "object": "chat.completion.chunk", "model": body.get("model"),
+                           "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                yield sse("[DONE]")
+            return StreamingResponse(events(), media_type="text/event-stream")
+        choices = []
+        for index in range(n):
+            choices.append({"index": index, "message": {"role": "assistant", "content": await full_text(behaviour.text(draw["tokens"]))}, "finish_reason": "stop"})
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": choices,
+            "usage": {"prompt_tokens": prompt, "completion_tokens": draw["tokens"] * n, "total_tokens": prompt + draw["tokens"] * n},
+        }
+
+    @app.post("/v1/messages")
+    @app.post("/messages")
+    async def anthropic_messages(request: Request):
+        body = await request.json()
+        draw, error = await begin(int(body.get("max_tokens") or 1000))
+        if error:
+            return error
+        prompt = sum(prompt_tokens(m.get("content", "") if isinstance(m.get("content"), str) else "") for m in body.get("messages", []))
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        if body.get("stream"):
+            pieces = behaviour.text(draw["tokens"])
+
+            async def events():
+                yield sse({"type": "message_start", "message": {"id": message_id, "type": "message", "role": "assistant", "model": body.get("model"),
+                           "content": [], "usage": {"input_tokens": prompt, "output_tokens": 0}}}, "message_start")
+                yield sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+                async for piece in stream_pieces(pieces):
+                    yield sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+                yield sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+                yield sse({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": draw["tokens"]}}, "message_delta")
+                yield sse({"type": "message_stop"}, "message_stop")
+            return StreamingResponse(events(), media_type="text/event-stream")
+        return {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": await full_text(behaviour.text(draw["tokens"]))}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": prompt, "output_tokens": draw["tokens"]},
+        }
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        body = await request.json()
+        options = body.get("options") or {}
+        draw, error = await begin(int(options.get("num_predict") or 1000))
+        if error:
+            return error
+        prompt = prompt_tokens(body.get("prompt", ""))
+        done = {"model": body.get("model"), "done": True, "done_reason": "stop", "prompt_eval_count": prompt, "eval_count": draw["tokens"]}
+        # Ollama streams unless told otherwise
+        if body.get("stream", True):
+            pieces = behaviour.text(draw["tokens"])
+
+            async def lines():
+                async for piece in stream_pieces(pieces):
+                    yield json.dumps({"model": body.get("model"), "response": piece, "done": False}) + "\n"
+                yield json.dumps({**done, "response": ""}) + "\n"
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+        return {**done, "response": await full_text(behaviour.text(draw["tokens"]))}
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": "stub-llama", "model": "stub-llama", "size": 0}]}
+
+    @app.post("/completion")
+    async def llama_cpp_completion(request: Request):
+        body = await request.json()
+        draw, error = await begin(int(body.get("n_predict") or body.get("max_tokens") or 1000))
+        if error:
+            return error
+        prompt = prompt_tokens(body.get("prompt", ""))
+        if body.get("stream"):
+            pieces = behaviour.text(draw["tokens"])
+
+            async def events():
+                async for piece in stream_pieces(pieces):
+                    yield sse({"content": piece, "stop": False})
+                yield sse({"content": "", "stop": True, "tokens_evaluated": prompt, "tokens_predicted": draw["tokens"]})
+            return StreamingResponse(events(), media_type="text/event-stream")
+        return {
+            "content": await full_text(behaviour.text(draw["tokens"])),
+            "stop": True,
+            "tokens_evaluated": prompt,
+            "tokens_predicted": draw["tokens"],
+        }
+
+    return app
+
+
+def parse_errors(spec: str) -> Dict[int, float]:
+    errors = {}
+    for entry in spec.split(","):
+        code, _, probability = entry.partition("=")
+        if code.strip():
+            errors[int(code)] = float(probability)
+    return errors
+
+
+async def self_test(base_url: str, calls: int) -> int:
+    """Run `calls` requests through each real provider against the stub."""
+    from app.llm_providers.anthropic_provider import AnthropicProvider
+    from app.llm_providers.llama_cpp_provider import LlamaCppProvider
+    from app.llm_providers.ollama_provider import OllamaProvider
+    from app.llm_providers.openai_provider import OpenAIProvider
+    from app.llm_providers.openrouter_provider import OpenRouterProvider
+
+    providers = [
+        (OpenAIProvider("stub-key", f"{base_url}/v1"), "gpt-4o"),
+        (OpenRouterProvider("stub-key", f"{base_url}/v1"), "openai/gpt-oss-20b:free"),
+        (AnthropicProvider("stub-key", f"{base_url}/v1"), "claude-4"),
+        (OllamaProvider(None, base_url), "stub-llama"),
+        (LlamaCppProvider(None, base_url), "stub-llama"),
+    ]
+    failures = 0
+    for provider, model in providers:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            provider.generate_response("Explain top-p sampling.", temperature=0.7, top_p=0.9, max_tokens=200, model=model)
+            for _ in range(calls)
+        ))
+        elapsed = time.perf_counter() - start
+        ok = [r for r in results if r["success"] and r["response"] and r["tokens_used"]]
+        errors = sorted({r["error"].split(" - ")[0] for r in results if not r["success"]})
+        failures += calls - len(ok)
+        print(f"  {provider.name:<11} {len(ok):>5}/{calls} ok  {calls / elapsed:8.1f} calls/s  {', '.join(errors)}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local stub server for the LLM provider APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="fixed:0.1", help="time to first byte distribution")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="output tokens per second (0 = instant)")
+    parser.add_argument("--errors", default="", help='error statuses and probabilities, e.g. "429=0.02,500=0.01"')
+    parser.add_argument("--script", help="JSON file with a list of {latency, status, tokens} steps")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--self-test", type=int, metavar="N", help="run N calls per provider against the stub and exit")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+    behaviour = StubBehaviour(args.latency, args.token_rate, parse_errors(args.errors), script, args.seed)
+    app = create_app(behaviour)
+
+    if not args.self_test:
+        print(f"Provider stub on http://{args.host}:{args.port} (OpenAI/Anthropic base URL: http://{args.host}:{args.port}/v1)")
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+        return 0
+
+    server = uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        print(f"{args.self_test} calls per provider against the stub:")
+        failures = asyncio.run(self_test(f"http://{args.host}:{args.port}", args.self_test))
+    finally:
+        server.should_exit = True
+        thread.join()
+    expected_errors = bool(behaviour.errors) or any(step.get("status", 200) != 200 for step in script or [])
+    return 1 if failures and not expected_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())